@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark of the build throughput, without Docker.
+
+A synthetic test suite is preprocessed and built by ParsersManager, whose
+compiler is replaced by a stand-in: either a fake one, sleeping for a given
+latency for each command, or the toolchain of the host. The build is run for
+each given number of jobs, in a fresh working directory, and the throughput,
+the scheduling overhead and the cost of the index writes are printed as
+JSON.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import click
+
+import synthetic_suites
+
+GENERATORS = {
+    "TOY_TEST_SUITE": synthetic_suites.generate_toy_suite,
+    "JULIET": synthetic_suites.generate_juliet_suite,
+}
+MILLISECONDS_IN_SECOND = 1000
+
+
+def run_build(
+    testsuite: str, count: int, jobs: int, compiler, single_pass: bool
+) -> dict:
+    from dataset.parsers_manager import AvailableTestSuites, ParsersManager
+    from dataset.profiler import Profiler
+
+    with tempfile.TemporaryDirectory() as working_directory:
+        initial_directory = os.getcwd()
+        os.chdir(working_directory)
+        try:
+            synthetic_suites.prepare_working_directory(working_directory)
+            GENERATORS[testsuite](working_directory, count)
+
+            profiler = Profiler.get_shared()
+            profiler.enable()
+
+            manager = ParsersManager(jobs, compiler)
+            manager.add_testsuite(AvailableTestSuites[testsuite])
+
+            start = time.monotonic()
+            executables_count = manager.preprocess_and_build(
+                single_pass=single_pass
+            )
+            wall_time = time.monotonic() - start
+
+            report = profiler.get_report()
+        finally:
+            os.chdir(initial_directory)
+
+    phases = report["phases"]
+
+    def get_total(name: str) -> float:
+        return phases.get(name, {}).get("total", 0)
+
+    # With a perfect scheduler, the build commands would keep all the jobs
+    # busy, so the build would last their total duration divided by the
+    # number of jobs. The rest is the time spent orchestrating them, or
+    # waiting for the preprocessing stage of the pipeline.
+    build_time = get_total("build")
+    ideal_build_time = get_total("gcc_build") / jobs
+    scheduling_overhead = max(build_time - ideal_build_time, 0)
+
+    return {
+        "executables": executables_count,
+        "wall_time_s": round(wall_time, 4),
+        "executables_per_second": round(
+            executables_count / wall_time if wall_time else 0, 2
+        ),
+        "preprocess_commands_s": round(get_total("gcc_preprocess"), 4),
+        "build_time_s": round(build_time, 4),
+        "ideal_build_time_s": round(ideal_build_time, 4),
+        "scheduling_overhead_s": round(scheduling_overhead, 4),
+        "scheduling_overhead_per_executable_ms": round(
+            scheduling_overhead
+            * MILLISECONDS_IN_SECOND
+            / max(executables_count, 1),
+            4,
+        ),
+        "index_write_s": round(get_total("index_write"), 4),
+        "index_writes": phases.get("index_write", {}).get("count", 0),
+    }
+
+
+@click.command()
+@click.option(
+    "--testsuite",
+    type=click.Choice(list(GENERATORS), case_sensitive=True),
+    default="TOY_TEST_SUITE",
+)
+@click.option("--count", type=click.IntRange(min=1), default=1000)
+@click.option(
+    "--jobs",
+    type=str,
+    default="1,2,4,8",
+    help="Comma-separated numbers of jobs, each one being benchmarked.",
+)
+@click.option(
+    "--compiler",
+    type=click.Choice(["sleep", "host"], case_sensitive=True),
+    default="sleep",
+    help="Fake compiler sleeping for each command, or the host toolchain.",
+)
+@click.option(
+    "--latency-ms",
+    type=float,
+    default=5,
+    help="Duration of each command of the fake compiler.",
+)
+@click.option(
+    "--single-pass",
+    is_flag=True,
+    default=False,
+    help="Preprocesses and compiles each testcase with a single command.",
+)
+@click.option("--output", type=str, help="File in which the JSON is saved.")
+def main(
+    testsuite: str,
+    count: int,
+    jobs: str,
+    compiler: str,
+    latency_ms: float,
+    single_pass: bool = False,
+    output: str = None,
+) -> None:
+    repository_root = os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__))
+    )
+    sys.path.insert(0, repository_root)
+
+    import compiler_stand_ins
+
+    results = {}
+    for jobs_count in [int(value) for value in jobs.split(",")]:
+        stand_in = compiler_stand_ins.create_stand_in(
+            compiler, latency_ms / MILLISECONDS_IN_SECOND
+        )
+        results[str(jobs_count)] = run_build(
+            testsuite, count, jobs_count, stand_in, single_pass
+        )
+
+    report = json.dumps(
+        {
+            "testsuite": testsuite,
+            "count": count,
+            "compiler": compiler,
+            "latency_ms": latency_ms if compiler == "sleep" else None,
+            "single_pass": single_pass,
+            "results_by_jobs": results,
+        },
+        indent=4,
+    )
+    click.echo(report)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            output_file.write(report)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
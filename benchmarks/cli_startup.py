@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark of the CLI's cold start.
+
+Each scenario is run in fresh interpreters, whose wall time is measured. The
+modules loaded by each scenario are checked too, because the read-only
+commands must not load the compiler stack or pandas. The results are printed
+as JSON and the exit code is nonzero if a budget is exceeded.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import click
+
+HEAVY_MODULES = ["docker", "pandas", "numpy"]
+SCENARIOS = {
+    "import": "import dataset.cli",
+    "help": (
+        "import sys\n"
+        "from dataset.cli import cli\n"
+        "sys.argv = ['dataset', '--help']\n"
+        "try:\n"
+        "    cli(prog_name='dataset')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+    "get": (
+        "import sys\n"
+        "from dataset.cli import cli\n"
+        "sys.argv = ['dataset', 'get']\n"
+        "try:\n"
+        "    cli(prog_name='dataset')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+}
+LOADED_MODULES_REPORT = (
+    "\nimport json\n"
+    "print(json.dumps([name for name in {heavy_modules!r}"
+    " if name in sys.modules]), file=sys.stderr)\n"
+)
+EMPTY_INDEX = "name,cwes,parent_dataset,is_built\n"
+
+
+def run_scenario(
+    code: str, working_directory: str, repetitions: int
+) -> typing.Tuple[typing.List[float], typing.List[str]]:
+    code = (
+        "import sys\n"
+        + code
+        + LOADED_MODULES_REPORT.format(heavy_modules=HEAVY_MODULES)
+    )
+
+    durations = []
+    loaded_modules = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=working_directory,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True,
+            text=True,
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+
+        loaded_modules = json.loads(process.stderr.strip().splitlines()[-1])
+
+    return durations, loaded_modules
+
+
+@click.command()
+@click.option("--repetitions", type=click.IntRange(min=1), default=10)
+@click.option(
+    "--max-milliseconds",
+    type=float,
+    default=None,
+    help="Budget for the median cold start of each scenario.",
+)
+def main(repetitions: int, max_milliseconds: float = None) -> None:
+    repository_root = os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__))
+    )
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        [repository_root] + os.environ.get("PYTHONPATH", "").split(os.pathsep)
+    )
+
+    results = {}
+    is_failed = False
+    with tempfile.TemporaryDirectory() as working_directory:
+        # The read-only commands are run against an empty index.
+        with open(
+            os.path.join(working_directory, "vulnerables.csv"),
+            "w",
+            encoding="utf-8",
+        ) as index:
+            index.write(EMPTY_INDEX)
+
+        for name, code in SCENARIOS.items():
+            durations, loaded_modules = run_scenario(
+                code, working_directory, repetitions
+            )
+            median = statistics.median(durations)
+
+            results[name] = {
+                "median_ms": round(median, 2),
+                "min_ms": round(min(durations), 2),
+                "max_ms": round(max(durations), 2),
+                "heavy_modules": loaded_modules,
+            }
+
+            if loaded_modules or (
+                max_milliseconds is not None and median > max_milliseconds
+            ):
+                is_failed = True
+
+    click.echo(json.dumps(results, indent=4))
+
+    if is_failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
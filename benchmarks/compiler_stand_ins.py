@@ -0,0 +1,107 @@
+"""Stand-ins for the containerized compiler, running on the local machine.
+
+They implement the compiler interface, so they can be passed to
+ParsersManager to measure the orchestration layer without Docker.
+"""
+
+import os
+import shlex
+import subprocess
+import time
+import typing
+
+from dataset.compilers import BaseCompiler, CommandResult
+
+STAND_IN_IMAGE_DIGEST = "sha256:" + "0" * 64
+FAKE_OUTPUT = b"\x7fELF"
+UNSUPPORTED_HOST_FLAGS = ["-m32"]
+
+
+class SleepingCompiler(BaseCompiler):
+    """Compiler whose commands only sleep and then create their outputs.
+
+    The outputs named by the -o options are created, relative to the
+    folders entered by the cd commands, so the parsers find the
+    preprocessed sources and the executables they expect.
+    """
+
+    image_digest = STAND_IN_IMAGE_DIGEST
+    latency: float
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def run_compiler_command(self, command: str) -> CommandResult:
+        start = time.monotonic()
+        time.sleep(self.latency)
+
+        folder = ""
+        tokens = shlex.split(command)
+        for index, token in enumerate(tokens[:-1]):
+            # The single-pass commands run in a subshell entering the folder
+            # of the testcase.
+            if token.lstrip("(") == "cd":
+                folder = os.path.join(folder, tokens[index + 1])
+            elif token == "-o":
+                output_filename = os.path.join(folder, tokens[index + 1])
+                with open(output_filename, "wb") as output_file:
+                    output_file.write(FAKE_OUTPUT)
+
+        return CommandResult(command, 0, "", time.monotonic() - start, start)
+
+    def exec_compiler_commands(
+        self, commands: typing.List[str], capture_output: bool = False
+    ) -> typing.List[CommandResult]:
+        return [self.run_compiler_command(command) for command in commands]
+
+
+class UncheckedHostCompiler(BaseCompiler):
+    """Compiler running the commands with the toolchain of the host.
+
+    Unlike dataset.compilers.HostCompiler, the toolchain is not checked
+    against the one of the compiler image. The flags that the host
+    toolchain may not support, namely -m32 on hosts without the 32-bit
+    libraries, are removed on request.
+    """
+
+    image_digest = STAND_IN_IMAGE_DIGEST
+    remove_unsupported_flags: bool
+
+    def __init__(self, remove_unsupported_flags: bool = True) -> None:
+        self.remove_unsupported_flags = remove_unsupported_flags
+
+    def run_compiler_command(self, command: str) -> CommandResult:
+        if self.remove_unsupported_flags:
+            command = " ".join(
+                token
+                for token in command.split(" ")
+                if token not in UNSUPPORTED_HOST_FLAGS
+            )
+
+        start = time.monotonic()
+        process = subprocess.run(
+            ["sh", "-c", command],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+
+        return CommandResult(
+            command,
+            process.returncode,
+            process.stderr.decode("utf-8", errors="replace"),
+            time.monotonic() - start,
+            start,
+        )
+
+    def exec_compiler_commands(
+        self, commands: typing.List[str], capture_output: bool = False
+    ) -> typing.List[CommandResult]:
+        return [self.run_compiler_command(command) for command in commands]
+
+
+def create_stand_in(name: str, latency: float) -> BaseCompiler:
+    if name == "host":
+        return UncheckedHostCompiler()
+
+    return SleepingCompiler(latency)
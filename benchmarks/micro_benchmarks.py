@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks of the index and of the parsers.
+
+Synthetic test suites are generated at several scales in a temporary working
+directory. The index storages, the manifest parsing, the discovery of the
+sources and the generation of the build commands are then measured, without
+needing Docker. The results are printed as JSON, so they can be compared
+between commits.
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import typing
+
+import click
+
+import synthetic_suites
+
+DEFAULT_SCALES = "1000,10000"
+QUERIED_CWE = 121
+
+
+def measure(
+    function: typing.Callable[[], typing.Any],
+    repetitions: int,
+    items_count: int,
+    setup: typing.Callable[[], typing.Any] = None,
+) -> dict:
+    durations = []
+    for _ in range(repetitions):
+        if setup:
+            setup()
+
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(durations)
+
+    return {
+        "median_ms": round(median, 3),
+        "min_ms": round(min(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "per_item_us": round(median * 1000 / max(items_count, 1), 3),
+    }
+
+
+def get_index_benchmarks(
+    extension: str, count: int
+) -> typing.Dict[str, tuple]:
+    from dataset.vulnerable_executables_index import (
+        VulnerableExecutablesIndex,
+    )
+
+    filename = "benchmark_index" + extension
+    names = [f"nist_juliet_{index}" for index in range(count)]
+    cwes = [[synthetic_suites.CWES[index % 8][0]] for index in range(count)]
+
+    def create_empty_index() -> None:
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(filename + suffix):
+                os.remove(filename + suffix)
+
+        if extension == ".csv":
+            synthetic_suites.write_file(
+                os.path.join(os.getcwd(), filename),
+                synthetic_suites.INDEX_HEADER,
+            )
+
+    def append() -> None:
+        index = VulnerableExecutablesIndex(filename)
+        for name, entry_cwes in zip(names, cwes):
+            index.add_new_source(name, entry_cwes, "nist_juliet")
+        index.dump_to_file()
+
+    def create_index() -> None:
+        create_empty_index()
+        append()
+
+    def ensure_index() -> None:
+        if not os.path.exists(filename):
+            create_index()
+
+    def mark() -> None:
+        index = VulnerableExecutablesIndex(filename)
+        for name in names:
+            index.mark_source_as_built(name)
+        index.dump_to_file()
+
+    def load() -> None:
+        VulnerableExecutablesIndex(filename)
+
+    def query(read_only: bool) -> typing.Callable[[], None]:
+        index = {}
+
+        def setup() -> None:
+            ensure_index()
+            index["value"] = VulnerableExecutablesIndex(
+                filename, read_only=read_only
+            )
+
+        def run() -> None:
+            list(
+                index["value"].get_entries_ids(
+                    "nist_juliet", [QUERIED_CWE], True
+                )
+            )
+
+        return setup, run
+
+    query_setup, query_run = query(False)
+    reader_query_setup, reader_query_run = query(True)
+
+    return {
+        "append": (append, create_empty_index),
+        "mark_as_built": (mark, create_index),
+        "load": (load, ensure_index),
+        "query": (query_run, query_setup),
+        "read_only_query": (reader_query_run, reader_query_setup),
+    }
+
+
+def get_parsers_benchmarks(count: int) -> typing.Dict[str, tuple]:
+    import compiler_stand_ins
+    from dataset.filename_index import FilenameIndex
+    from dataset.manifest_reader import ManifestReader
+    from dataset.parsers import juliet, toy_test_suite
+
+    # Only the image digest of the compiler is used, as no command is run.
+    juliet_parser = juliet.CNistJulietParser()
+    juliet_parser.compiler = compiler_stand_ins.SleepingCompiler(0)
+    toy_parser = toy_test_suite.ToyTestSuiteParser()
+    toy_parser.compiler = compiler_stand_ins.SleepingCompiler(0)
+
+    def remove_caches() -> None:
+        for filename in [juliet.MANIFEST_CACHE, juliet.SOURCES_INDEX]:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def parse_manifest() -> None:
+        reader = ManifestReader(juliet.DATASET_MANIFEST, juliet.MANIFEST_CACHE)
+        for _ in reader.get_testcases():
+            pass
+
+    def index_filenames() -> None:
+        FilenameIndex(juliet.DATASET_SOURCES_FOLDER, juliet.SOURCES_INDEX)
+
+    def discover(parser) -> typing.Callable[[], None]:
+        def run() -> None:
+            for _ in parser._get_all_sources():
+                pass
+
+        return run
+
+    def create_preprocessed_sources() -> typing.Dict[str, list]:
+        identifiers = {"juliet": [], "toy": []}
+        for source in juliet_parser._get_all_sources():
+            identifier = juliet.DATASET_NAME + "_" + str(source.identifier)
+            for filename in source.additional_files:
+                shutil.copy(
+                    filename, get_preprocessed_path(identifier, filename)
+                )
+            identifiers["juliet"].append(identifier)
+
+        for source in toy_parser._get_all_sources():
+            identifier = toy_test_suite.DATASET_NAME + "_" + source.identifier
+            shutil.copy(
+                source.full_filename,
+                get_preprocessed_path(identifier, source.full_filename),
+            )
+            identifiers["toy"].append(identifier)
+
+        return identifiers
+
+    def generate_commands(parser, name: str) -> typing.Callable[[], None]:
+        def run() -> None:
+            for identifier in identifiers[name]:
+                parser._generate_gcc_command(identifier)
+
+        return run
+
+    identifiers = {}
+
+    def setup_commands() -> None:
+        if not identifiers:
+            identifiers.update(create_preprocessed_sources())
+
+    return {
+        "manifest_parsing_cold": (parse_manifest, remove_caches),
+        "manifest_parsing_cached": (parse_manifest, None),
+        "filename_index_cold": (index_filenames, remove_caches),
+        "filename_index_cached": (index_filenames, None),
+        "juliet_discovery_cold": (discover(juliet_parser), remove_caches),
+        "juliet_discovery_cached": (discover(juliet_parser), None),
+        "toy_discovery": (discover(toy_parser), None),
+        "juliet_command_generation": (
+            generate_commands(juliet_parser, "juliet"),
+            setup_commands,
+        ),
+        "toy_command_generation": (
+            generate_commands(toy_parser, "toy"),
+            setup_commands,
+        ),
+    }
+
+
+def get_preprocessed_path(identifier: str, filename: str) -> str:
+    folder = os.path.join("sources", identifier)
+    os.makedirs(folder, exist_ok=True)
+
+    return os.path.join(folder, os.path.basename(filename))
+
+
+def run_benchmarks(
+    benchmarks: typing.Dict[str, tuple],
+    count: int,
+    repetitions: int,
+    selected_names: typing.Optional[typing.List[str]],
+) -> dict:
+    results = {}
+    for name, (function, setup) in benchmarks.items():
+        if selected_names is not None and name not in selected_names:
+            continue
+
+        results[name] = measure(function, repetitions, count, setup)
+
+    return results
+
+
+@click.command()
+@click.option(
+    "--scales",
+    type=str,
+    default=DEFAULT_SCALES,
+    help="Comma-separated numbers of testcases of the synthetic suites.",
+)
+@click.option("--repetitions", type=click.IntRange(min=1), default=3)
+@click.option(
+    "--benchmark",
+    "selected_names",
+    multiple=True,
+    help="Runs only the given benchmarks, for example index_csv.append.",
+)
+@click.option("--output", type=str, help="File in which the JSON is saved.")
+def main(
+    scales: str,
+    repetitions: int,
+    selected_names: typing.List[str],
+    output: str = None,
+) -> None:
+    repository_root = os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__))
+    )
+    sys.path.insert(0, repository_root)
+
+    results = {}
+    initial_directory = os.getcwd()
+    for count in [int(scale) for scale in scales.split(",")]:
+        with tempfile.TemporaryDirectory() as working_directory:
+            os.chdir(working_directory)
+            try:
+                synthetic_suites.prepare_working_directory(working_directory)
+                synthetic_suites.generate_juliet_suite(
+                    working_directory, count
+                )
+                synthetic_suites.generate_toy_suite(working_directory, count)
+
+                scale_results = {}
+                for group, benchmarks in [
+                    ("index_csv", get_index_benchmarks(".csv", count)),
+                    ("index_sqlite", get_index_benchmarks(".db", count)),
+                    ("parsers", get_parsers_benchmarks(count)),
+                ]:
+                    group_results = run_benchmarks(
+                        benchmarks,
+                        count,
+                        repetitions,
+                        [
+                            name.partition(".")[2]
+                            for name in selected_names
+                            if name.partition(".")[0] == group
+                        ]
+                        if selected_names
+                        else None,
+                    )
+                    for name, result in group_results.items():
+                        scale_results[f"{group}.{name}"] = result
+            finally:
+                os.chdir(initial_directory)
+
+        results[str(count)] = scale_results
+
+    report = json.dumps(
+        {
+            "python": platform.python_version(),
+            "repetitions": repetitions,
+            "results": results,
+        },
+        indent=4,
+    )
+    click.echo(report)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            output_file.write(report)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,181 @@
+"""Generators of synthetic test suites, shaped like the real ones.
+
+The suites are written into the given working directory, at the paths where
+the parsers look for them, so the parsers can be run against them without
+the real test suites.
+"""
+
+import os
+
+JULIET_FOLDER = "raw_testsuites/nist_juliet/"
+JULIET_TESTCASES_FOLDER = JULIET_FOLDER + "testcases/"
+JULIET_SUPPORT_FOLDER = JULIET_FOLDER + "testcasesupport/"
+TOY_FOLDER = "raw_testsuites/toy_test_suite/"
+INDEX_HEADER = "name,cwes,parent_dataset,is_built\n"
+
+CWES = [
+    (121, "Stack-based Buffer Overflow"),
+    (122, "Heap-based Buffer Overflow"),
+    (190, "Integer Overflow or Wraparound"),
+    (401, "Missing Release of Memory after Effective Lifetime"),
+    (415, "Double Free"),
+    (416, "Use After Free"),
+    (476, "NULL Pointer Dereference"),
+    (590, "Free of Memory not on the Heap"),
+]
+TESTCASES_PER_FOLDER = 500
+MULTIPLE_FILES_PERIOD = 5
+W32_PERIOD = 50
+
+SUPPORT_HEADER = """#include <stdio.h>
+#include <stdlib.h>
+
+void printLine(const char *line);
+"""
+SUPPORT_SOURCE = """#include "std_testcase.h"
+
+void printLine(const char *line)
+{
+    if (line != NULL)
+    {
+        printf("%s\\n", line);
+    }
+}
+"""
+THREAD_SOURCE = """int stdThreadDummy(void)
+{
+    return 0;
+}
+"""
+TESTCASE_SOURCE = """#include "std_testcase.h"
+
+void {function}(void)
+{{
+    char buffer[10];
+    buffer[0] = '\\0';
+    printLine(buffer);
+}}
+"""
+TESTCASE_MAIN = """
+#ifdef INCLUDEMAIN
+int main(int argc, char *argv[])
+{{
+    {function}();
+    return 0;
+}}
+#endif
+"""
+TOY_SOURCE = """#include <stdio.h>
+
+int main(void)
+{{
+    char buffer[{size}];
+    fgets(buffer, 1024, stdin);
+    puts(buffer);
+    return 0;
+}}
+"""
+
+
+def write_file(filename: str, content: str) -> None:
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+def prepare_working_directory(folder: str) -> None:
+    """Creates the folders and the empty index expected by the parsers.
+
+    Args:
+        folder (str): Working directory
+    """
+    for subfolder in ["sources", "executables", "cache"]:
+        os.makedirs(os.path.join(folder, subfolder), exist_ok=True)
+
+    write_file(os.path.join(folder, "vulnerables.csv"), INDEX_HEADER)
+
+
+def generate_juliet_suite(folder: str, count: int) -> None:
+    """Generates a suite with the layout and the manifest of Juliet.
+
+    Every fifth testcase is made of two files and every fiftieth one is a
+    Windows testcase, which the parser skips.
+
+    Args:
+        folder (str): Working directory
+        count (int): Number of testcases
+    """
+    write_file(
+        os.path.join(folder, JULIET_SUPPORT_FOLDER, "std_testcase.h"),
+        SUPPORT_HEADER,
+    )
+    write_file(
+        os.path.join(folder, JULIET_SUPPORT_FOLDER, "io.c"), SUPPORT_SOURCE
+    )
+    write_file(
+        os.path.join(folder, JULIET_SUPPORT_FOLDER, "std_thread.c"),
+        THREAD_SOURCE,
+    )
+
+    manifest_path = os.path.join(folder, JULIET_FOLDER, "manifest.xml")
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as manifest:
+        manifest.write('<?xml version="1.0" encoding="utf-8"?>\n<container>\n')
+
+        for index in range(count):
+            cwe, cwe_name = CWES[index % len(CWES)]
+            cwe_folder = f"CWE{cwe}_{cwe_name.replace(' ', '_')}"
+            subfolder = f"s{index // TESTCASES_PER_FOLDER + 1:02d}"
+            platform = "w32_" if index % W32_PERIOD == W32_PERIOD - 1 else ""
+            stem = f"{cwe_folder}__{platform}case_{index:06d}"
+
+            filenames = [stem + ".c"]
+            if index % MULTIPLE_FILES_PERIOD == MULTIPLE_FILES_PERIOD - 1:
+                filenames = [stem + "a.c", stem + "b.c"]
+
+            manifest.write('  <testcase type="Source Code">\n')
+            for file_index, filename in enumerate(filenames):
+                function = os.path.splitext(filename)[0].replace("-", "_")
+                content = TESTCASE_SOURCE.format(function=function)
+                # As in Juliet, only the first file has the main function.
+                if file_index == 0:
+                    content += TESTCASE_MAIN.format(function=function)
+
+                write_file(
+                    os.path.join(
+                        folder,
+                        JULIET_TESTCASES_FOLDER,
+                        cwe_folder,
+                        subfolder,
+                        filename,
+                    ),
+                    content,
+                )
+
+                manifest.write(
+                    f'    <file path="{filename}" language="C">\n'
+                    f'      <flaw line="5" name="CWE-{cwe}: {cwe_name}"/>\n'
+                    "    </file>\n"
+                )
+            manifest.write("  </testcase>\n")
+
+        manifest.write("</container>\n")
+
+
+def generate_toy_suite(folder: str, count: int) -> None:
+    """Generates a suite with the layout of the toy test suite.
+
+    Args:
+        folder (str): Working directory
+        count (int): Number of testcases
+    """
+    for index in range(count):
+        cwe, _ = CWES[index % len(CWES)]
+        testcase_folder = os.path.join(folder, TOY_FOLDER, f"case_{index:06d}")
+
+        write_file(
+            os.path.join(testcase_folder, "source.c"),
+            TOY_SOURCE.format(size=8 + index % 64),
+        )
+        write_file(os.path.join(testcase_folder, "cwe.txt"), f"{cwe}\n")
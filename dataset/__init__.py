@@ -6,9 +6,18 @@ from dataset.vulnerable_executables_index import VulnerableExecutablesIndex
 
 
 class Dataset:
-    def get_available_executables(self) -> typing.List[Executable]:
+    def get_available_executables(
+        self,
+        dataset: str = None,
+        cwes: typing.List[int] = None,
+        limit: int = None,
+        offset: int = 0,
+        variant: str = None,
+    ) -> typing.List[Executable]:
         worker = VulnerableExecutablesIndex(
-            Configuration.DatasetCreation.DATASET_NAME
+            Configuration.DatasetCreation.DATASET_NAME, read_only=True
         )
 
-        return worker.get_available_executables()
+        return worker.get_available_executables(
+            dataset, cwes, limit, offset, variant
+        )
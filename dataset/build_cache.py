@@ -0,0 +1,170 @@
+import hashlib
+import os
+import shlex
+import shutil
+import tempfile
+import threading
+
+from dataset.configuration import Configuration
+
+CACHE_ENTRY_EXTENSION = Configuration.Assets.ELF_EXTENSION
+HASHING_CHUNK_SIZE = 1 << 20
+EVICTION_TARGET_RATIO = 0.9
+
+
+class BuildCache:
+    """Content-addressed cache of the built executables.
+
+    The key of an executable is computed from the compiler image, the whole
+    compilation command (hence the compile and link flags) and the content of
+    all the input files mentioned in the command. The least recently used
+    entries are evicted when the size of the cache exceeds its cap.
+    """
+
+    hits: int
+    misses: int
+    _folder: str
+    _max_size: int
+    _current_size: int
+
+    def __init__(
+        self,
+        folder: str = Configuration.BuildCache.FOLDER,
+        max_size: int = Configuration.BuildCache.MAX_SIZE,
+    ) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._folder = folder
+        self._max_size = max_size
+        self._current_size = None
+        self._lock = threading.Lock()
+
+    def compute_key(self, command: str, image_digest: str) -> str:
+        """Computes the key of the executable produced by a command.
+
+        Args:
+            command (str): Compilation command
+            image_digest (str): Digest of the image in which the command runs
+
+        Returns:
+            str: Hexadecimal key
+        """
+        hasher = hashlib.sha256()
+        hasher.update(image_digest.encode("utf-8"))
+        hasher.update(command.encode("utf-8"))
+
+        tokens = shlex.split(command)
+        for index, token in enumerate(tokens):
+            is_output = index > 0 and tokens[index - 1] == "-o"
+            if is_output or not os.path.isfile(token):
+                continue
+
+            hasher.update(token.encode("utf-8"))
+            with open(token, "rb") as input_file:
+                while chunk := input_file.read(HASHING_CHUNK_SIZE):
+                    hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    def restore(self, key: str, destination: str) -> bool:
+        """Copies a cached executable to its destination.
+
+        Args:
+            key (str): Key of the executable
+            destination (str): Path where the executable is copied
+
+        Returns:
+            bool: Boolean indicating if the cache had the executable
+        """
+        entry = self.__get_entry_path(key)
+
+        try:
+            shutil.copyfile(entry, destination)
+            shutil.copymode(entry, destination)
+            os.utime(entry)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+
+            return False
+
+        with self._lock:
+            self.hits += 1
+
+        return True
+
+    def store(self, key: str, executable: str) -> None:
+        """Adds a newly built executable to the cache.
+
+        Args:
+            key (str): Key of the executable
+            executable (str): Path to the executable
+        """
+        if not os.path.isfile(executable):
+            return
+
+        entry = self.__get_entry_path(key)
+        if os.path.isfile(entry):
+            os.utime(entry)
+
+            return
+
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+
+        # The copy is atomically moved in place, so that concurrent builds
+        # never restore a partially written entry.
+        file_descriptor, temporary_entry = tempfile.mkstemp(
+            dir=os.path.dirname(entry)
+        )
+        os.close(file_descriptor)
+        shutil.copyfile(executable, temporary_entry)
+        shutil.copymode(executable, temporary_entry)
+        os.replace(temporary_entry, entry)
+
+        with self._lock:
+            # The first store walks the cache, which already counts the entry.
+            if self._current_size is None:
+                self.__compute_size()
+            else:
+                self._current_size += os.path.getsize(entry)
+
+            if self._current_size > self._max_size:
+                self.__evict()
+
+    def __get_entry_path(self, key: str) -> str:
+        return os.path.join(self._folder, key[:2], key + CACHE_ENTRY_EXTENSION)
+
+    def __list_entries(self) -> list:
+        entries = []
+        for root, _, filenames in os.walk(self._folder):
+            for filename in filenames:
+                if not filename.endswith(CACHE_ENTRY_EXTENSION):
+                    continue
+
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+    def __compute_size(self) -> None:
+        self._current_size = sum(size for _, size, _ in self.__list_entries())
+
+    def __evict(self) -> None:
+        # The entries are touched when restored, so the modification time is
+        # the time of the last use. The cache is shrunk below its cap to avoid
+        # walking it again on each of the next stores.
+        entries = sorted(self.__list_entries())
+        target_size = self._max_size * EVICTION_TARGET_RATIO
+
+        self._current_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._current_size <= target_size:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            self._current_size -= size
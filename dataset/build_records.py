@@ -0,0 +1,229 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import typing
+
+from dataset.configuration import Configuration
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS build_records (
+    name TEXT PRIMARY KEY,
+    parent_dataset TEXT NOT NULL,
+    exit_code INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    command_hash TEXT NOT NULL,
+    output TEXT NOT NULL,
+    built_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS build_records_exit_code
+    ON build_records (parent_dataset, exit_code);
+"""
+UPSERT_QUERY = (
+    "INSERT OR REPLACE INTO build_records VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SELECT_QUERY = """
+SELECT name, parent_dataset, exit_code, duration, command_hash, output,
+    built_at
+FROM build_records
+WHERE {conditions}
+ORDER BY name
+LIMIT ?
+"""
+COLUMNS_QUERY = "PRAGMA table_info(build_records)"
+# The output column was named stderr, although it also holds the standard
+# output of the commands.
+LEGACY_OUTPUT_COLUMN = "stderr"
+RENAME_OUTPUT_COLUMN_QUERY = (
+    "ALTER TABLE build_records RENAME COLUMN stderr TO output"
+)
+
+
+class BuildRecord:
+    name: str
+    parent_dataset: str
+    exit_code: int
+    duration: float
+    command_hash: str
+    output: str
+    built_at: float
+
+    def __init__(
+        self,
+        name: str,
+        parent_dataset: str,
+        exit_code: int,
+        duration: float,
+        command_hash: str,
+        output: str,
+        built_at: float,
+    ) -> None:
+        self.name = name
+        self.parent_dataset = parent_dataset
+        self.exit_code = exit_code
+        self.duration = duration
+        self.command_hash = command_hash
+        self.output = output
+        self.built_at = built_at
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "parent_dataset": self.parent_dataset,
+            "exit_code": self.exit_code,
+            "duration": self.duration,
+            "command_hash": self.command_hash,
+            "output": self.output,
+            "built_at": self.built_at,
+        }
+
+
+class BuildRecordsStore:
+    """SQLite store of the outcome of the last build of each executable.
+
+    The records are buffered and written in a single transaction on each
+    flush, so that the failures can be queried without reading the logs. The
+    buffer is also flushed whenever it is full, so an interrupted build only
+    loses its last records.
+    """
+
+    _connection: sqlite3.Connection
+    _pending_records: typing.List[tuple]
+
+    def __init__(
+        self, filename: str = Configuration.BuildRecords.FILENAME
+    ) -> None:
+        self._connection = sqlite3.connect(
+            filename,
+            timeout=Configuration.DatasetCreation.SQLITE_BUSY_TIMEOUT,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self.__migrate()
+
+        self._pending_records = []
+        self._lock = threading.Lock()
+
+    def __migrate(self) -> None:
+        if not self.__has_legacy_output_column():
+            return
+
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated the table in the meantime.
+            if self.__has_legacy_output_column():
+                self._connection.execute(RENAME_OUTPUT_COLUMN_QUERY)
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+
+            raise
+
+        self._connection.execute("COMMIT")
+
+    def __has_legacy_output_column(self) -> bool:
+        return any(
+            column[1] == LEGACY_OUTPUT_COLUMN
+            for column in self._connection.execute(COLUMNS_QUERY)
+        )
+
+    def add_record(
+        self,
+        name: str,
+        parent_dataset: str,
+        command: str,
+        exit_code: int,
+        duration: float,
+        output: typing.Optional[str],
+    ) -> None:
+        """Records the outcome of the compilation of an executable.
+
+        Args:
+            name (str): Name of the executable
+            parent_dataset (str): Name of the dataset of the executable
+            command (str): Compilation command
+            exit_code (int): Exit code of the command
+            duration (float): Duration of the command, in seconds
+            output (typing.Optional[str]): Diagnostics printed by the
+                command on its standard output and error, which are truncated
+        """
+        output = (output or "")[: Configuration.BuildRecords.MAX_OUTPUT_SIZE]
+        command_hash = hashlib.sha256(command.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            self._pending_records.append(
+                (
+                    name,
+                    parent_dataset,
+                    exit_code,
+                    duration,
+                    command_hash,
+                    output,
+                    time.time(),
+                )
+            )
+            is_full = (
+                len(self._pending_records)
+                >= Configuration.BuildRecords.MAX_PENDING_RECORDS
+            )
+
+        if is_full:
+            self.flush()
+
+    def get_records(
+        self,
+        dataset: str = None,
+        failed_only: bool = False,
+        limit: int = None,
+    ) -> typing.List[BuildRecord]:
+        """Gets the records of the last builds.
+
+        Args:
+            dataset (str, optional): Name of the dataset of the executables.
+                Defaults to None.
+            failed_only (bool, optional): Boolean indicating if only the
+                failed builds are returned. Defaults to False.
+            limit (int, optional): Maximum number of records. Defaults to
+                None.
+
+        Returns:
+            typing.List[BuildRecord]: Records, sorted by name
+        """
+        self.flush()
+
+        conditions = ["1"]
+        parameters = []
+        if dataset:
+            conditions.append("parent_dataset = ?")
+            parameters.append(dataset)
+        if failed_only:
+            conditions.append("exit_code != 0")
+        # A negative limit means no limit in SQLite.
+        parameters.append(limit if limit is not None else -1)
+
+        rows = self._connection.execute(
+            SELECT_QUERY.format(conditions=" AND ".join(conditions)),
+            parameters,
+        ).fetchall()
+
+        return [BuildRecord(*row) for row in rows]
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending_records:
+                return
+
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    UPSERT_QUERY, self._pending_records
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+
+                raise
+
+            self._connection.execute("COMMIT")
+
+            self._pending_records = []
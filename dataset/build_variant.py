@@ -0,0 +1,62 @@
+import os
+import re
+import typing
+
+from dataset.configuration import Configuration
+
+# The names start with an alphanumeric character, so that they are never
+# relative paths such as "." or "..".
+VARIANT_REGEX = r"^\s*([A-Za-z0-9][A-Za-z0-9_.+-]*)\s*=(.*)$"
+
+
+class BuildVariant:
+    """Named set of compile flags with which the executables are also built.
+
+    The executables of a variant are stored in their own folder, next to the
+    ones built with the default flags, and the variants in which each
+    executable was built are recorded in the index.
+    """
+
+    name: str
+    compile_flags: typing.List[str]
+
+    def __init__(self, name: str, compile_flags: typing.List[str]) -> None:
+        self.name = name
+        self.compile_flags = compile_flags
+
+    @classmethod
+    def from_string(cls, text: str) -> "BuildVariant":
+        """Parses a variant in the format "NAME=FLAGS".
+
+        Args:
+            text (str): Variant in the format "NAME=FLAGS", the flags being
+                separated by spaces
+
+        Raises:
+            ValueError: The text is not a valid variant
+
+        Returns:
+            BuildVariant: Parsed variant
+        """
+        if not (groups := re.match(VARIANT_REGEX, text)):
+            raise ValueError(
+                f'The variant "{text}" is not in the format NAME=FLAGS, with'
+                " a name starting with a letter or a digit, followed by"
+                " letters, digits and the characters _.+-."
+            )
+
+        return cls(groups.group(1), groups.group(2).split())
+
+    @property
+    def executables_folder(self) -> str:
+        return os.path.join(
+            Configuration.Assets.MAIN_DATASET_EXECUTABLES, self.name
+        )
+
+    def get_build_name(self, identifier: str) -> str:
+        return identifier + "@" + self.name
+
+    def extend_compile_flags(
+        self, compile_flags: typing.List[str] = None
+    ) -> typing.List[str]:
+        return (compile_flags if compile_flags else []) + self.compile_flags
@@ -1,18 +1,38 @@
 #!/usr/bin/env python3
 
+import csv
+import json
 import logging
+import sys
 import typing
 
 import click
-import cwe as cwelib
-from rich import print  # pylint: disable=redefined-builtin
-from rich.table import Table
 
 from dataset import Dataset
+from dataset.build_records import BuildRecordsStore
+from dataset.build_variant import BuildVariant
+from dataset.compilers import (
+    AvailableCompilers,
+    ToolchainError,
+    create_compiler,
+)
+from dataset.configuration import Configuration
+from dataset.cwe_catalogue import CweCatalogue
 from dataset.executable import Executable
 from dataset.parsers_manager import AvailableTestSuites, ParsersManager
+from dataset.profiler import Profiler
+from dataset.sharding import IndexFragment, Shard
+from dataset.vulnerable_executables_index import VulnerableExecutablesIndex
+
+if typing.TYPE_CHECKING:
+    from rich.table import Table
+
+# The heavy modules (namely the Docker SDK, pandas and rich) are imported only
+# by the commands using them, because the CLI is invoked very often by the CRS
+# scripts.
 
 TESTSUITES_NAMES = [element.name for element in list(AvailableTestSuites)]
+COMPILERS_NAMES = [element.name for element in list(AvailableCompilers)]
 
 # Make some loggers less verbose
 logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
@@ -34,6 +54,71 @@ def cli() -> None:
 @click.option("--link-flags", type=str)
 @click.option("--rebuild", is_flag=True, default=False)
 @click.option("--cwe", multiple=True, type=int)
+@click.option(
+    "--exact-cwes",
+    is_flag=True,
+    default=False,
+    help="Don't match the descendants of the CWEs from --cwe.",
+)
+@click.option(
+    "--id",
+    "identifiers",
+    multiple=True,
+    type=str,
+    help="Builds only the testcase with the given ID, for example"
+    " nist_juliet_12.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=Configuration.DatasetCreation.DEFAULT_JOBS,
+    help="Number of compiler commands executed in parallel.",
+)
+@click.option(
+    "--compiler",
+    type=click.Choice(COMPILERS_NAMES, case_sensitive=True),
+    default=Configuration.DatasetCreation.DEFAULT_COMPILER,
+    help="Backend running the compiler commands, either in a container or"
+    " with a compatible 32-bit toolchain of the host.",
+)
+@click.option(
+    "--single-pass",
+    is_flag=True,
+    default=False,
+    help="Preprocesses and compiles each testcase with a single compiler"
+    " invocation, without caching the executables.",
+)
+@click.option(
+    "--variant",
+    "variants",
+    multiple=True,
+    type=str,
+    help="Builds the executables in a variant, in the format NAME=FLAGS,"
+    " with the flags added to the compile ones. The variants share the"
+    " preprocessing and are stored in executables/NAME/.",
+)
+@click.option(
+    "--shard",
+    type=str,
+    help="Builds only the i-th of N stable subsets of the executables, in "
+    "the format i/N, and exports them into an index fragment.",
+)
+@click.option(
+    "--fragment-folder",
+    type=str,
+    help="Folder of the index fragment exported by a sharded build.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Prints the time spent in each phase of the build.",
+)
+@click.option(
+    "--profile-trace",
+    type=str,
+    help="File in which a Chrome trace of the build is written.",
+)
 @click.option("--verbose", is_flag=True, default=False)
 @click.option("--log-filename", type=str)
 def build(  # pylint: disable=dangerous-default-value
@@ -42,9 +127,41 @@ def build(  # pylint: disable=dangerous-default-value
     link_flags: str = None,
     rebuild: str = False,
     cwe: typing.List[str] = [],
+    exact_cwes: bool = False,
+    identifiers: typing.List[str] = [],
+    jobs: int = Configuration.DatasetCreation.DEFAULT_JOBS,
+    compiler: str = Configuration.DatasetCreation.DEFAULT_COMPILER,
+    single_pass: bool = False,
+    variants: typing.List[str] = [],
+    shard: str = None,
+    fragment_folder: str = None,
+    profile: bool = False,
+    profile_trace: str = None,
     verbose: bool = False,
     log_filename: str = None,
 ) -> None:
+    if shard:
+        try:
+            shard = Shard.from_string(shard)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--shard")
+
+    try:
+        variants = [BuildVariant.from_string(variant) for variant in variants]
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--variant")
+    if len({variant.name for variant in variants}) != len(variants):
+        raise click.BadParameter(
+            "The variants must have distinct names.", param_hint="--variant"
+        )
+    if variants and (single_pass or shard):
+        # The fragments only contain the executables built with the default
+        # flags.
+        raise click.BadParameter(
+            "The variants can't be built in a single pass or in a shard.",
+            param_hint="--variant",
+        )
+
     if verbose and log_filename is not None:
         logging.basicConfig(
             filename=log_filename,
@@ -57,16 +174,89 @@ def build(  # pylint: disable=dangerous-default-value
     elif not verbose:
         logging.getLogger().setLevel(logging.WARNING)
 
-    manager = ParsersManager()
+    profiler = Profiler.get_shared()
+    if profile or profile_trace:
+        profiler.enable()
+
+    try:
+        compiler = create_compiler(AvailableCompilers[compiler], jobs)
+    except ToolchainError as error:
+        raise click.ClickException(str(error))
+
+    manager = ParsersManager(jobs, compiler)
     manager.add_testsuite(AvailableTestSuites[testsuite])
 
     compile_flags = split_flags(compile_flags)
     link_flags = split_flags(link_flags)
+    cwe = expand_cwes(cwe, exact_cwes)
     count = manager.preprocess_and_build(
-        compile_flags, link_flags, rebuild, cwe
+        compile_flags,
+        link_flags,
+        rebuild,
+        cwe,
+        shard,
+        single_pass,
+        list(identifiers),
+        variants,
+    )
+
+    click.echo(f"Successfully built {count} executables.")
+
+    hits, misses = manager.get_build_cache_statistics()
+    click.echo(f"The build cache had {hits} hits and {misses} misses.")
+
+    if shard:
+        fragment = IndexFragment(
+            fragment_folder or IndexFragment.get_default_folder(shard)
+        )
+        count = manager.export_fragment(shard, fragment)
+
+        click.echo(
+            f"Successfully exported {count} executables into the fragment"
+            f" {fragment.folder}."
+        )
+
+    if profile:
+        print_profile_report(profiler.get_report())
+    if profile_trace:
+        profiler.dump_chrome_trace(profile_trace)
+
+        click.echo(f"Successfully written the trace into {profile_trace}.")
+
+
+def print_profile_report(report: dict) -> None:
+    click.echo(
+        f"\nThe build took {report['wall_time']:.2f}s, executing"
+        f" {report['commands_per_second']:.2f} compiler commands per second."
+    )
+
+    click.echo(
+        f"\n{'Phase':<20} {'Count':>8} {'Total':>10} {'p50':>9} {'p90':>9}"
+        f" {'p99':>9} {'Max':>9}"
     )
+    for name, statistics in sorted(
+        report["phases"].items(), key=lambda item: -item[1]["total"]
+    ):
+        click.echo(
+            f"{name:<20} {statistics['count']:>8}"
+            f" {statistics['total']:>9.3f}s"
+            + "".join(
+                f" {statistics[key]:>8.3f}s"
+                for key in ["p50", "p90", "p99", "max"]
+            )
+        )
+
+    if report["slowest_testcases"]:
+        click.echo("\nThe slowest testcases are:")
+        for testcase in report["slowest_testcases"]:
+            click.echo(f"  {testcase['id']}: {testcase['duration']:.3f}s")
+
+
+def expand_cwes(cwes: typing.List[int], exact_cwes: bool) -> typing.List[int]:
+    if not cwes or exact_cwes:
+        return list(cwes)
 
-    print(f"Successfully built {count} executables.")
+    return CweCatalogue.get_shared().expand(cwes)
 
 
 def split_flags(flags: str) -> typing.List[str]:
@@ -76,34 +266,148 @@ def split_flags(flags: str) -> typing.List[str]:
         return None
 
 
+OUTPUT_FORMATS = ["table", "jsonl", "csv"]
+OUTPUT_COLUMNS = ["id", "cwes", "parent_dataset", "full_path"]
+
+
 @cli.command("get", help="Gets the executables in the whole dataset.")
-def show() -> None:
-    print("The available executables are:\n")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=True),
+    default="table",
+    help="Format of the output. The JSONL and CSV rows are streamed.",
+)
+@click.option(
+    "--testsuite",
+    type=click.Choice(TESTSUITES_NAMES, case_sensitive=True),
+)
+@click.option("--cwe", multiple=True, type=int)
+@click.option(
+    "--exact-cwes",
+    is_flag=True,
+    default=False,
+    help="Don't match the descendants of the CWEs from --cwe.",
+)
+@click.option(
+    "--variant",
+    type=str,
+    help="Gets the executables built in the given variant, instead of the"
+    " ones built with the default flags.",
+)
+@click.option("--limit", type=click.IntRange(min=0))
+@click.option("--offset", type=click.IntRange(min=0), default=0)
+@click.option(
+    "--columns",
+    type=str,
+    help="Comma-separated columns to output, out of "
+    + ", ".join(OUTPUT_COLUMNS)
+    + ".",
+)
+def show(  # pylint: disable=dangerous-default-value
+    output_format: str = "table",
+    testsuite: str = None,
+    cwe: typing.List[int] = [],
+    exact_cwes: bool = False,
+    variant: str = None,
+    limit: int = None,
+    offset: int = 0,
+    columns: str = None,
+) -> None:
+    columns = parse_columns(columns)
+
+    dataset = None
+    if testsuite:
+        dataset = AvailableTestSuites[testsuite].value.test_case_name
+    cwe = expand_cwes(cwe, exact_cwes)
+
+    sources = Dataset().get_available_executables(
+        dataset, cwe, limit, offset, variant
+    )
+
+    if output_format == "jsonl":
+        print_sources_as_jsonl(sources, columns)
+    elif output_format == "csv":
+        print_sources_as_csv(sources, columns)
+    else:
+        from rich import print  # pylint: disable=redefined-builtin
+
+        print("The available executables are:\n")
+
+        sources_table = build_sources_table(sources, columns)
+
+        print(sources_table)
+
+
+def parse_columns(columns: str) -> typing.List[str]:
+    if not columns:
+        return OUTPUT_COLUMNS
+
+    columns = [column.strip() for column in columns.split(",")]
+    for column in columns:
+        if column not in OUTPUT_COLUMNS:
+            raise click.BadParameter(
+                f"Unknown column {column}", param_hint="--columns"
+            )
+
+    return columns
+
+
+def get_source_fields(source: Executable) -> dict:
+    return {
+        "id": str(source.identifier),
+        "cwes": source.cwes,
+        "parent_dataset": source.parent_dataset,
+        "full_path": source.full_path,
+    }
 
-    sources = Dataset().get_available_executables()
-    sources_table = build_sources_table(sources)
 
-    print(sources_table)
+def print_sources_as_jsonl(
+    sources: typing.Iterable[Executable], columns: typing.List[str]
+) -> None:
+    for source in sources:
+        fields = get_source_fields(source)
+
+        click.echo(json.dumps({column: fields[column] for column in columns}))
+
 
+def print_sources_as_csv(
+    sources: typing.Iterable[Executable], columns: typing.List[str]
+) -> None:
+    writer = csv.writer(sys.stdout)
+    writer.writerow(columns)
+
+    for source in sources:
+        fields = get_source_fields(source)
+        fields["cwes"] = Configuration.DatasetCreation.CWES_SEPARATOR.join(
+            str(cwe) for cwe in fields["cwes"]
+        )
+
+        writer.writerow([fields[column] for column in columns])
+
+
+def build_sources_table(
+    sources: typing.Iterable[Executable],
+    columns: typing.List[str] = OUTPUT_COLUMNS,
+) -> "Table":
+    from rich.table import Table
 
-def build_sources_table(sources: typing.List[Executable]) -> Table:
     table = Table()
 
-    table.add_column("ID")
-    table.add_column("CWEs")
-    table.add_column("Parent Database")
-    table.add_column("Full Path")
+    headers = {
+        "id": "ID",
+        "cwes": "CWEs",
+        "parent_dataset": "Parent Database",
+        "full_path": "Full Path",
+    }
+    for column in columns:
+        table.add_column(headers[column])
 
     for source in sources:
-        cwes = stringifies_cwes(source.cwes)
+        fields = get_source_fields(source)
+        fields["cwes"] = stringifies_cwes(source.cwes)
 
-        table_row = [
-            str(source.identifier),
-            cwes,
-            source.parent_dataset,
-            source.full_path,
-        ]
-        table.add_row(*table_row)
+        table.add_row(*[fields[column] for column in columns])
 
     return table
 
@@ -115,15 +419,106 @@ def stringifies_cwes(cwes: typing.List[int]) -> str:
 
 
 def translate_cwes_to_descriptions(cwes: typing.List[int]) -> typing.List[str]:
-    cwe_database = cwelib.Database()
+    cwe_catalogue = CweCatalogue.get_shared()
 
     for current_cwe in cwes:
-        if cwe_object := cwe_database.get(current_cwe):
-            yield cwe_object.name
+        if cwe_name := cwe_catalogue.get_name(current_cwe):
+            yield cwe_name
         else:
             continue
 
 
+@cli.command("records", help="Gets the records of the last builds.")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "jsonl"], case_sensitive=True),
+    default="table",
+)
+@click.option(
+    "--testsuite",
+    type=click.Choice(TESTSUITES_NAMES, case_sensitive=True),
+)
+@click.option(
+    "--failed",
+    is_flag=True,
+    default=False,
+    help="Gets only the records of the failed builds.",
+)
+@click.option("--limit", type=click.IntRange(min=0))
+def records(
+    output_format: str = "table",
+    testsuite: str = None,
+    failed: bool = False,
+    limit: int = None,
+) -> None:
+    dataset = None
+    if testsuite:
+        dataset = AvailableTestSuites[testsuite].value.test_case_name
+
+    build_records = BuildRecordsStore().get_records(dataset, failed, limit)
+
+    if output_format == "jsonl":
+        for record in build_records:
+            click.echo(json.dumps(record.to_dict()))
+
+        return
+
+    from rich import print  # pylint: disable=redefined-builtin
+    from rich.table import Table
+
+    table = Table()
+    for header in ["ID", "Exit Code", "Duration", "Diagnostics"]:
+        table.add_column(header)
+
+    for record in build_records:
+        table.add_row(
+            record.name,
+            str(record.exit_code),
+            f"{record.duration:.2f}s",
+            record.output.partition("\n")[0],
+        )
+
+    print(table)
+
+
+@cli.command("export", help="Exports the index of executables as CSV.")
+@click.option("--output", type=str, required=True)
+def export(output: str) -> None:
+    index = VulnerableExecutablesIndex(
+        Configuration.DatasetCreation.DATASET_NAME, read_only=True
+    )
+    index.export_to_csv(output)
+
+    click.echo(f"Successfully exported the index into {output}.")
+
+
+@cli.command("merge", help="Merges index fragments into the dataset.")
+@click.argument("fragment_folders", nargs=-1, required=True)
+def merge(fragment_folders: typing.List[str]) -> None:
+    index = VulnerableExecutablesIndex(
+        Configuration.DatasetCreation.DATASET_NAME
+    )
+
+    count = 0
+    for folder in fragment_folders:
+        count += IndexFragment(folder).merge_into(index)
+
+    click.echo(
+        f"Successfully merged {count} executables from"
+        f" {len(fragment_folders)} fragments."
+    )
+
+
+@cli.command("stop-containers", help="Removes the warm compiler containers.")
+def stop_containers() -> None:
+    from dataset.container_pool import ContainerPool
+
+    count = ContainerPool(size=0).stop_all()
+
+    click.echo(f"Successfully removed {count} compiler containers.")
+
+
 def main() -> None:
     cli(prog_name="dataset")
 
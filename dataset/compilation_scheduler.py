@@ -0,0 +1,65 @@
+import concurrent.futures
+import typing
+
+CommandExecutor = typing.Callable[[str], typing.Any]
+
+
+class CompilationScheduler:
+    """Keeps a bounded number of compiler commands in flight.
+
+    The commands are consumed lazily from the given iterable, so at most
+    `jobs` of them are submitted at any time. The results are yielded in the
+    order of completion, in the caller's thread.
+    """
+
+    jobs: int
+    _executor_function: CommandExecutor
+
+    def __init__(self, executor_function: CommandExecutor, jobs: int = 1):
+        if jobs < 1:
+            raise ValueError("The number of jobs must be a positive integer.")
+
+        self.jobs = jobs
+        self._executor_function = executor_function
+
+    def run(
+        self, commands: typing.Iterable[typing.Tuple[str, str]]
+    ) -> typing.Generator[typing.Tuple[str, typing.Any], None, None]:
+        """Executes (identifier, command) pairs.
+
+        Args:
+            commands (typing.Iterable[typing.Tuple[str, str]]): Pairs of
+                identifiers and commands to execute
+
+        Yields:
+            typing.Tuple[str, typing.Any]: Pairs of identifiers and results
+                returned by the executor function
+        """
+        if self.jobs == 1:
+            for identifier, command in commands:
+                yield identifier, self._executor_function(command)
+
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(self.jobs) as executor:
+            in_flight = {}
+            commands = iter(commands)
+
+            while True:
+                for identifier, command in commands:
+                    future = executor.submit(self._executor_function, command)
+                    in_flight[future] = identifier
+
+                    if len(in_flight) == self.jobs:
+                        break
+
+                if not in_flight:
+                    return
+
+                done, _ = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    identifier = in_flight.pop(future)
+
+                    yield identifier, future.result()
@@ -0,0 +1,46 @@
+import importlib
+from enum import Enum
+
+from dataset.compilers.base import (
+    BaseCompiler,
+    BoundedOutput,
+    CommandResult,
+    ToolchainError,
+)
+
+
+class AvailableCompilers(Enum):
+    """Compiler backends, referred by their modules and classes.
+
+    The backends are imported only when created, because the container one
+    depends on the Docker SDK, which the host one doesn't need.
+    """
+
+    CONTAINER = (
+        "dataset.compilers.containerized_compiler",
+        "ContainerizedCompiler",
+    )
+    HOST = ("dataset.compilers.host_compiler", "HostCompiler")
+
+
+def create_compiler(
+    backend: AvailableCompilers, jobs: int = 1
+) -> BaseCompiler:
+    """Creates a compiler backend.
+
+    Args:
+        backend (AvailableCompilers): Backend to create
+        jobs (int, optional): Number of commands executed in parallel.
+            Defaults to 1.
+
+    Raises:
+        ToolchainError: The toolchain of the backend doesn't match the one of
+            the dataset
+
+    Returns:
+        BaseCompiler: Compiler
+    """
+    module_name, class_name = backend.value
+    compiler_class = getattr(importlib.import_module(module_name), class_name)
+
+    return compiler_class(jobs)
@@ -0,0 +1,115 @@
+import abc
+import typing
+
+from dataset.configuration import Configuration
+
+TRUNCATION_NOTICE = "\n[{size} bytes truncated]"
+
+
+class ToolchainError(Exception):
+    """The toolchain of a compiler doesn't match the one of the dataset."""
+
+
+class CommandResult:
+    command: str
+    exit_code: int
+    output: typing.Optional[str]
+    start: typing.Optional[float]
+    duration: float
+
+    def __init__(
+        self,
+        command: str,
+        exit_code: int,
+        output: str = None,
+        duration: float = 0,
+        start: float = None,
+    ) -> None:
+        self.command = command
+        self.exit_code = exit_code
+        self.output = output
+        self.duration = duration
+        self.start = start
+
+
+class BoundedOutput:
+    """Output of a command, of which only the beginning is kept.
+
+    The output is fed in chunks, as it is streamed from the compiler, and
+    the bytes exceeding the cap are only counted.
+    """
+
+    _max_size: int
+    _chunks: typing.List[bytes]
+    _size: int
+    _truncated_size: int
+
+    def __init__(
+        self,
+        max_size: int = Configuration.ContainerizedCompiler.MAX_OUTPUT_SIZE,
+    ) -> None:
+        self._max_size = max_size
+        self._chunks = []
+        self._size = 0
+        self._truncated_size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        kept_size = max(0, min(len(chunk), self._max_size - self._size))
+        if kept_size:
+            self._chunks.append(chunk[:kept_size])
+            self._size += kept_size
+
+        self._truncated_size += len(chunk) - kept_size
+
+    def getvalue(self) -> str:
+        output = b"".join(self._chunks).decode("utf-8", errors="replace")
+        if self._truncated_size:
+            output += TRUNCATION_NOTICE.format(size=self._truncated_size)
+
+        return output
+
+
+class BaseCompiler(abc.ABC):
+    """Backend executing the compiler commands generated by the parsers.
+
+    The commands are shell commands invoking gcc and g++, with paths
+    relative to the working directory of the dataset.
+    """
+
+    @property
+    @abc.abstractmethod
+    def image_digest(self) -> str:
+        """Digest identifying the toolchain, used in the cache keys."""
+        raise NotImplementedError()
+
+    def exec_compiler_command(self, command: str) -> int:
+        return self.run_compiler_command(command).exit_code
+
+    @abc.abstractmethod
+    def run_compiler_command(self, command: str) -> CommandResult:
+        """Executes a command, capturing the beginning of its output.
+
+        Args:
+            command (str): Command to execute
+
+        Returns:
+            CommandResult: Result, along with the bounded output and the
+                duration of the command
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def exec_compiler_commands(
+        self, commands: typing.List[str], capture_output: bool = False
+    ) -> typing.List[CommandResult]:
+        """Executes multiple commands.
+
+        Args:
+            commands (typing.List[str]): Commands to execute
+            capture_output (bool, optional): Boolean indicating if the output
+                of each command is returned. Defaults to False.
+
+        Returns:
+            typing.List[CommandResult]: Results, in the order of the commands
+        """
+        raise NotImplementedError()
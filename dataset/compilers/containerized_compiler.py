@@ -0,0 +1,253 @@
+import logging
+import re
+import shlex
+import time
+import typing
+import uuid
+
+import docker
+
+from dataset.compilers.base import BaseCompiler, BoundedOutput, CommandResult
+from dataset.configuration import Configuration
+from dataset.container_pool import ContainerPool
+from dataset.profiler import Profiler
+
+BATCH_BEGIN_MARKER = "{marker}:begin:{index}"
+BATCH_END_MARKER = "{marker}:end:{index}:$?"
+BATCH_BEGIN_REGEX = r"^{marker}:begin:([0-9]+)$"
+BATCH_END_REGEX = r"^{marker}:end:([0-9]+):([0-9]+)$"
+BATCH_FAILED_EXIT_CODE = -1
+
+OutputConsumer = typing.Union[BoundedOutput, "BatchOutputParser"]
+
+
+class BatchOutputParser:
+    """Splits the streamed output of a batch script by command.
+
+    The output of each command, delimited by the markers printed by the
+    script, is kept in a bounded buffer, and the command's duration is
+    measured between the arrivals of its markers.
+    """
+
+    results: typing.Dict[int, typing.Tuple[int, str, float, float]]
+    _begin_regex: typing.Pattern[bytes]
+    _end_regex: typing.Pattern[bytes]
+    _partial_line: bytes
+    _current_output: typing.Optional[BoundedOutput]
+    _current_start: float
+
+    def __init__(self, marker: str) -> None:
+        self.results = {}
+        self._begin_regex = re.compile(
+            BATCH_BEGIN_REGEX.format(marker=marker).encode("utf-8")
+        )
+        self._end_regex = re.compile(
+            BATCH_END_REGEX.format(marker=marker).encode("utf-8")
+        )
+        self._partial_line = b""
+        self._current_output = None
+        self._current_start = 0
+
+    def feed(self, chunk: bytes) -> None:
+        lines = (self._partial_line + chunk).split(b"\n")
+        self._partial_line = lines.pop()
+
+        for line in lines:
+            self.__parse_line(line)
+
+    def __parse_line(self, line: bytes) -> None:
+        if self._begin_regex.match(line):
+            self._current_output = BoundedOutput()
+            self._current_start = time.monotonic()
+        elif groups := self._end_regex.match(line):
+            if self._current_output is not None:
+                self.results[int(groups.group(1))] = (
+                    int(groups.group(2)),
+                    # The script prints a new line before each marker.
+                    self._current_output.getvalue().rstrip("\n"),
+                    time.monotonic() - self._current_start,
+                    self._current_start,
+                )
+            self._current_output = None
+        elif self._current_output is not None:
+            self._current_output.feed(line + b"\n")
+
+
+class ContainerizedCompiler(BaseCompiler):
+    _pool: ContainerPool
+    _profiler: Profiler
+
+    def __init__(self, jobs: int = 1) -> None:
+        self._pool = ContainerPool.get_shared(jobs)
+        self._profiler = Profiler.get_shared()
+
+    @property
+    def image_digest(self) -> str:
+        return self._pool.image_id
+
+    def run_compiler_command(self, command: str) -> CommandResult:
+        """Executes a command, capturing the beginning of its output.
+
+        Args:
+            command (str): Command to execute
+
+        Returns:
+            CommandResult: Result, along with the bounded output and the
+                duration of the command
+        """
+        start = time.monotonic()
+        # Docker runs the commands given as strings without a shell, so the
+        # compound ones, like the single-pass commands, are run by one.
+        exit_code, output = self.__run(["sh", "-c", command], BoundedOutput)
+        result = CommandResult(
+            command,
+            exit_code,
+            output.getvalue(),
+            time.monotonic() - start,
+            start,
+        )
+
+        self.__log_result(command, result.exit_code, result.output)
+
+        return result
+
+    def exec_compiler_commands(
+        self, commands: typing.List[str], capture_output: bool = False
+    ) -> typing.List[CommandResult]:
+        """Executes multiple commands, with a single exec for each batch.
+
+        The commands are run sequentially by a generated shell script, which
+        delimits the output and the exit code of each one of them. The
+        output of each command is bounded, its standard output being dropped
+        unless it is captured.
+
+        Args:
+            commands (typing.List[str]): Commands to execute
+            capture_output (bool, optional): Boolean indicating if the output
+                of each command is returned. Defaults to False.
+
+        Returns:
+            typing.List[CommandResult]: Results, in the order of the commands
+        """
+        batch_size = Configuration.ContainerizedCompiler.MAX_BATCH_SIZE
+
+        results = []
+        for start in range(0, len(commands), batch_size):
+            results.extend(
+                self.__exec_batch(
+                    commands[start : start + batch_size], capture_output
+                )
+            )
+
+        return results
+
+    def __exec_batch(
+        self, commands: typing.List[str], capture_output: bool
+    ) -> typing.List[CommandResult]:
+        marker = uuid.uuid4().hex
+        script = self.__generate_batch_script(commands, marker, capture_output)
+
+        _, parser = self.__run(
+            ["sh", "-c", script], lambda: BatchOutputParser(marker)
+        )
+
+        results = []
+        for index, command in enumerate(commands):
+            # The commands without an end marker were not run at all, because
+            # the script was interrupted.
+            exit_code, command_output, duration, start = parser.results.get(
+                index, (BATCH_FAILED_EXIT_CODE, "", 0, None)
+            )
+            self.__log_result(command, exit_code, command_output)
+
+            results.append(
+                CommandResult(
+                    command,
+                    exit_code,
+                    command_output if capture_output else None,
+                    duration,
+                    start,
+                )
+            )
+
+        return results
+
+    def __generate_batch_script(
+        self, commands: typing.List[str], marker: str, capture_output: bool
+    ) -> str:
+        redirection = "2>&1" if capture_output else "2>&1 >/dev/null"
+
+        lines = []
+        for index, command in enumerate(commands):
+            begin_marker = BATCH_BEGIN_MARKER.format(
+                marker=marker, index=index
+            )
+            end_marker = BATCH_END_MARKER.format(marker=marker, index=index)
+
+            lines.append(f"printf '\\n%s\\n' {shlex.quote(begin_marker)}")
+            lines.append(f"{{ {command} ; }} {redirection}")
+            lines.append(f"printf '\\n%s\\n' \"{end_marker}\"")
+
+        return "\n".join(lines)
+
+    def __run(
+        self,
+        command: typing.List[str],
+        create_consumer: typing.Callable[[], OutputConsumer],
+    ) -> typing.Tuple[int, OutputConsumer]:
+        with self._pool.container() as container:
+            try:
+                consumer = create_consumer()
+
+                return (
+                    self.__exec_in_container(container, command, consumer),
+                    consumer,
+                )
+            except docker.errors.APIError:
+                # The container was stopped by someone else, so the command
+                # is retried once into a fresh one.
+                self._pool.replace(container)
+
+        with self._pool.container() as container:
+            consumer = create_consumer()
+
+            return (
+                self.__exec_in_container(container, command, consumer),
+                consumer,
+            )
+
+    def __exec_in_container(
+        self,
+        container,
+        command: typing.List[str],
+        consumer: OutputConsumer,
+    ) -> int:
+        # The low-level API is used to stream the output into the consumer,
+        # instead of holding all of it in memory.
+        api = container.client.api
+        with self._profiler.phase("docker_exec"):
+            with self._profiler.phase("docker_exec_setup"):
+                exec_id = api.exec_create(
+                    container.id,
+                    command,
+                    workdir=Configuration.ContainerizedCompiler.CONTAINER_WORKING_DIRECTORY,
+                )["Id"]
+
+            for chunk in api.exec_start(exec_id, stream=True):
+                consumer.feed(chunk)
+
+            with self._profiler.phase("docker_exec_setup"):
+                return api.exec_inspect(exec_id)["ExitCode"]
+
+    def __log_result(
+        self, command: str, exit_code: int, output: typing.Optional[str]
+    ) -> None:
+        logging.log(
+            logging.INFO,
+            (
+                f'The command "{command}" was executed in container, having'
+                f" the exit code {exit_code}."
+            ),
+        )
+        if output:
+            logging.log(logging.INFO, f"The output is:\n\n{output}")
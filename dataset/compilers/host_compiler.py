@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import os
+import re
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+import typing
+
+from dataset.compilation_scheduler import CompilationScheduler
+from dataset.compilers.base import (
+    BaseCompiler,
+    BoundedOutput,
+    CommandResult,
+    ToolchainError,
+)
+from dataset.configuration import Configuration
+
+CHUNK_SIZE = 64 * 1024
+# The compilers invoked at the start of the command or after a shell operator
+COMPILER_INVOCATION_REGEX = r"(^\s*|[;&|(]\s*)(gcc|g\+\+)(?=\s)"
+ELF_MAGIC = b"\x7fELF"
+ELF_CLASS_32 = 1
+ELF_MACHINE_386 = 3
+CHECK_PROGRAM = """#include <stdio.h>
+
+int main(void)
+{
+    puts("");
+    return 0;
+}
+"""
+CHECK_LINK_FLAGS = "-lpthread -lm"
+
+
+class HostCompiler(BaseCompiler):
+    """Compiler running the commands with the toolchain of the host.
+
+    The commands are run by the host's shell, in the current working
+    directory, with the 32-bit architecture flags added to each compiler
+    invocation. As the executables must be identical to the ones built in
+    the container, the toolchain is checked when the compiler is created.
+
+    At most `jobs` compiler processes run at once, whether they are started
+    by single commands or by batches, as the pool of containers bounds the
+    containerized compiler.
+    """
+
+    _jobs: int
+    _process_slots: threading.BoundedSemaphore
+    _compilers: typing.Dict[str, str]
+    _image_digest: str
+
+    def __init__(self, jobs: int = 1) -> None:
+        self._jobs = jobs
+        self._process_slots = threading.BoundedSemaphore(jobs)
+        self._compilers = {
+            "gcc": Configuration.HostCompiler.GCC,
+            "g++": Configuration.HostCompiler.GPP,
+        }
+        self._image_digest = self.__check_toolchain()
+
+    @property
+    def image_digest(self) -> str:
+        return self._image_digest
+
+    def run_compiler_command(self, command: str) -> CommandResult:
+        return self.__run(command, capture_output=True)
+
+    def exec_compiler_commands(
+        self, commands: typing.List[str], capture_output: bool = False
+    ) -> typing.List[CommandResult]:
+        """Executes multiple commands, in parallel.
+
+        Args:
+            commands (typing.List[str]): Commands to execute
+            capture_output (bool, optional): Boolean indicating if the output
+                of each command is returned. Defaults to False.
+
+        Returns:
+            typing.List[CommandResult]: Results, in the order of the commands
+        """
+        scheduler = CompilationScheduler(
+            lambda command: self.__run(command, capture_output), self._jobs
+        )
+
+        results = dict(scheduler.run(enumerate(commands)))
+
+        return [results[index] for index in range(len(commands))]
+
+    def __run(self, command: str, capture_output: bool) -> CommandResult:
+        host_command = self.__adapt_command(command)
+
+        with self._process_slots:
+            start = time.monotonic()
+            output = BoundedOutput()
+            # The standard output is dropped unless it is captured, as in the
+            # batches executed in the container.
+            with subprocess.Popen(
+                ["sh", "-c", host_command],
+                stdout=(
+                    subprocess.PIPE if capture_output else subprocess.DEVNULL
+                ),
+                stderr=(
+                    subprocess.STDOUT if capture_output else subprocess.PIPE
+                ),
+            ) as process:
+                stream = process.stdout if capture_output else process.stderr
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    output.feed(chunk)
+
+        result = CommandResult(
+            command,
+            process.returncode,
+            output.getvalue() if capture_output else None,
+            time.monotonic() - start,
+            start,
+        )
+
+        logging.log(
+            logging.INFO,
+            (
+                f'The command "{host_command}" was executed on the host,'
+                f" having the exit code {result.exit_code}."
+            ),
+        )
+        if output.getvalue():
+            logging.log(logging.INFO, f"The output is:\n\n{output.getvalue()}")
+
+        return result
+
+    def __adapt_command(self, command: str) -> str:
+        def replace_invocation(match: typing.Match) -> str:
+            return (
+                match.group(1)
+                + shlex.quote(self._compilers[match.group(2)])
+                + " "
+                + Configuration.HostCompiler.ARCHITECTURE_FLAGS
+            )
+
+        return re.sub(COMPILER_INVOCATION_REGEX, replace_invocation, command)
+
+    def __check_toolchain(self) -> str:
+        versions = []
+        for name, executable in self._compilers.items():
+            version = self.__get_output([executable, "-dumpversion"])
+            major_version = version.strip().split(".")[0]
+            if major_version != Configuration.HostCompiler.EXPECTED_VERSION:
+                raise ToolchainError(
+                    f'The host compiler "{executable}" has the version'
+                    f" {version.strip()}, but the dataset is built with"
+                    f" {name} {Configuration.HostCompiler.EXPECTED_VERSION}."
+                )
+
+            versions.append(self.__get_output([executable, "-v"]))
+
+        with tempfile.TemporaryDirectory() as folder:
+            source_file = os.path.join(folder, "check.c")
+            with open(source_file, "w", encoding="utf-8") as source:
+                source.write(CHECK_PROGRAM)
+
+            for name, language in [("gcc", "c"), ("g++", "c++")]:
+                executable_file = os.path.join(folder, name + ".elf")
+                result = self.__run(
+                    f"{name} -x {language} {shlex.quote(source_file)} -x none"
+                    f" -o {shlex.quote(executable_file)} {CHECK_LINK_FLAGS}",
+                    capture_output=True,
+                )
+                if result.exit_code != 0:
+                    raise ToolchainError(
+                        f'The host compiler "{self._compilers[name]}" can\'t'
+                        " build 32-bit executables:\n\n" + result.output
+                    )
+
+                self.__check_executable(executable_file)
+
+        digest = hashlib.sha256()
+        digest.update(Configuration.HostCompiler.ARCHITECTURE_FLAGS.encode())
+        for version in versions:
+            digest.update(version.encode("utf-8"))
+
+        return "sha256:" + digest.hexdigest()
+
+    def __check_executable(self, filename: str) -> None:
+        with open(filename, "rb") as executable:
+            header = executable.read(20)
+
+        if (
+            header[:4] != ELF_MAGIC
+            or header[4] != ELF_CLASS_32
+            or int.from_bytes(header[18:20], "little") != ELF_MACHINE_386
+        ):
+            raise ToolchainError(
+                f'The host compiler built "{filename}", which is not a'
+                " 32-bit x86 executable."
+            )
+
+    def __get_output(self, command: typing.List[str]) -> str:
+        try:
+            process = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                check=False,
+            )
+        except OSError as error:
+            raise ToolchainError(
+                f'The host compiler "{command[0]}" can\'t be run: {error}'
+            ) from error
+
+        if process.returncode != 0:
+            raise ToolchainError(
+                f'The command "{" ".join(command)}" failed with the exit code'
+                f" {process.returncode}."
+            )
+
+        return process.stdout.decode("utf-8", errors="replace")
@@ -5,11 +5,52 @@ class Configuration:
         MAIN_DATASET_SOURCES = "sources/"
         ELF_EXTENSION = ".elf"
         MAIN_DATASET_EXECUTABLES = "executables/"
+        CACHE = "cache/"
 
     class DatasetCreation:
         CWES_SEPARATOR = ","
+        VARIANTS_SEPARATOR = ","
         DATASET_NAME = "vulnerables.csv"
+        DEFAULT_JOBS = 1
+        SQLITE_BUSY_TIMEOUT = 60
+        DEFAULT_COMPILER = "CONTAINER"
 
     class ContainerizedCompiler:
         IMAGE_TAG = "ubuntu_32bit_compilator"
         CONTAINER_WORKING_DIRECTORY = "/home/docker"
+        CONTAINER_LABEL = "opencrs.dataset.compiler"
+        JOBS_PER_CONTAINER = 8
+        MAX_BATCH_SIZE = 256
+        MAX_OUTPUT_SIZE = 64 * 1024
+
+    class HostCompiler:
+        GCC = "gcc"
+        GPP = "g++"
+        ARCHITECTURE_FLAGS = "-m32"
+        # Major version of the compilers of the container's image, which is
+        # based on Ubuntu 18.04
+        EXPECTED_VERSION = "7"
+
+    class BuildPipeline:
+        QUEUE_SIZE = 1024
+        PREPROCESSING_BATCH_SIZE = 64
+
+    class BuildCache:
+        FOLDER = "cache/builds/"
+        MAX_SIZE = 10 * 1024**3
+
+    class BuildRecords:
+        FILENAME = "build_records.db"
+        MAX_OUTPUT_SIZE = 4 * 1024
+        MAX_PENDING_RECORDS = 64
+
+    class CweCatalogue:
+        FILENAME = "cache/cwe_catalogue.json"
+        HIERARCHY_VIEW = 1000
+
+    class PreprocessingManifest:
+        FOLDER = "cache/preprocessing/"
+        DEPENDENCIES_FOLDER = "cache/dependencies/"
+
+    class Sharding:
+        FRAGMENTS_FOLDER = "fragments/"
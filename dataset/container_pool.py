@@ -0,0 +1,261 @@
+import contextlib
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import typing
+
+import docker
+from docker.models.containers import Container
+
+from dataset.configuration import Configuration
+
+
+class ContainerPool:
+    """Pool of warm compiler containers.
+
+    The containers are labelled with a fingerprint of the image and of the
+    mounted volumes. Running containers with the same fingerprint are reused
+    across processes, while the labelled ones that are stopped or have a stale
+    fingerprint are reaped. The containers are not removed when the process
+    exits, so the next invocation finds them already running.
+    """
+
+    _shared_pool: "ContainerPool" = None
+    _shared_pool_lock = threading.Lock()
+
+    size: int
+    image_id: str
+    _containers: typing.List[Container]
+    _in_flight: typing.Dict[str, int]
+    _lock: threading.Lock
+
+    def __init__(self, size: int = 1, max_connections: int = None) -> None:
+        self.__docker_client = docker.from_env(
+            max_pool_size=max(
+                max_connections or 0, docker.constants.DEFAULT_MAX_POOL_SIZE
+            )
+        )
+        self.__volumes = self.__get_volumes()
+        self.__fingerprint = self.__compute_fingerprint()
+
+        self.size = 0
+        self._containers = []
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.reap_orphans()
+        self.resize(size)
+
+    @classmethod
+    def get_shared(cls, jobs: int = 1) -> "ContainerPool":
+        """Gets the pool shared by all the compilers of the process.
+
+        Args:
+            jobs (int): Number of commands that will be executed in parallel
+
+        Returns:
+            ContainerPool: Pool sized to the given parallelism
+        """
+        size = math.ceil(
+            jobs / Configuration.ContainerizedCompiler.JOBS_PER_CONTAINER
+        )
+
+        with cls._shared_pool_lock:
+            if cls._shared_pool is None:
+                cls._shared_pool = cls(size, jobs)
+            else:
+                cls._shared_pool.resize(size)
+
+        return cls._shared_pool
+
+    @staticmethod
+    def __get_volumes() -> dict:
+        volumes = {}
+        for folder in [
+            Configuration.Assets.MAIN_DATASET_SOURCES,
+            Configuration.Assets.MAIN_DATASET_EXECUTABLES,
+            Configuration.Assets.RAW_TESTSUITES,
+            Configuration.Assets.CACHE,
+        ]:
+            host_folder = os.path.join(
+                Configuration.Assets.HOST_WORKING_DIRECTORY,
+                folder,
+            )
+            container_folder = os.path.join(
+                Configuration.ContainerizedCompiler.CONTAINER_WORKING_DIRECTORY,
+                folder,
+            )
+
+            volumes[host_folder] = {
+                "bind": container_folder,
+                "mode": "rw",
+            }
+
+        return volumes
+
+    def __compute_fingerprint(self) -> str:
+        self.image_id = self.__docker_client.images.get(
+            Configuration.ContainerizedCompiler.IMAGE_TAG
+        ).id
+        content = json.dumps([self.image_id, self.__volumes], sort_keys=True)
+
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def __list_labelled_containers(self) -> typing.List[Container]:
+        return self.__docker_client.containers.list(
+            all=True,
+            filters={
+                "label": Configuration.ContainerizedCompiler.CONTAINER_LABEL
+            },
+        )
+
+    def __is_reusable(self, container: Container) -> bool:
+        fingerprint = container.labels.get(
+            Configuration.ContainerizedCompiler.CONTAINER_LABEL
+        )
+
+        return (
+            container.status == "running" and fingerprint == self.__fingerprint
+        )
+
+    def __is_healthy(self, container: Container) -> bool:
+        try:
+            exit_code, _ = container.exec_run("true")
+        except docker.errors.APIError:
+            return False
+
+        return exit_code == 0
+
+    def __create_container(self) -> Container:
+        return self.__docker_client.containers.run(
+            Configuration.ContainerizedCompiler.IMAGE_TAG,
+            command="tail -f /dev/null",
+            detach=True,
+            tty=True,
+            volumes=self.__volumes,
+            labels={
+                Configuration.ContainerizedCompiler.CONTAINER_LABEL: (
+                    self.__fingerprint
+                )
+            },
+        )
+
+    def __add_container(self, container: Container) -> None:
+        self._containers.append(container)
+        self._in_flight[container.id] = 0
+
+    def __remove_container(self, container: Container) -> None:
+        try:
+            container.remove(force=True)
+        except docker.errors.NotFound:
+            pass
+
+    def reap_orphans(self) -> int:
+        """Removes the labelled containers that can't be reused.
+
+        Returns:
+            int: Number of removed containers
+        """
+        reaped_count = 0
+        for container in self.__list_labelled_containers():
+            if self.__is_reusable(container):
+                continue
+
+            logging.log(
+                logging.INFO,
+                f"Reaping the orphan compiler container {container.short_id}.",
+            )
+            self.__remove_container(container)
+            reaped_count += 1
+
+        return reaped_count
+
+    def resize(self, size: int) -> None:
+        """Grows the pool to the given size.
+
+        The running containers left by previous invocations are reused
+        before new ones are started.
+
+        Args:
+            size (int): Wanted number of containers
+        """
+        with self._lock:
+            if size <= len(self._containers):
+                return
+
+            used_ids = {container.id for container in self._containers}
+            for container in self.__list_labelled_containers():
+                if len(self._containers) == size:
+                    break
+
+                if container.id in used_ids or not self.__is_reusable(
+                    container
+                ):
+                    continue
+
+                if self.__is_healthy(container):
+                    self.__add_container(container)
+                else:
+                    self.__remove_container(container)
+
+            while len(self._containers) < size:
+                self.__add_container(self.__create_container())
+
+            self.size = size
+
+    def replace(self, container: Container) -> None:
+        """Replaces an unhealthy container with a new one.
+
+        Args:
+            container (Container): Container to replace
+        """
+        with self._lock:
+            if container not in self._containers:
+                return
+
+            self._containers.remove(container)
+            del self._in_flight[container.id]
+            self.__remove_container(container)
+
+            self.__add_container(self.__create_container())
+
+    @contextlib.contextmanager
+    def container(self) -> typing.Generator[Container, None, None]:
+        """Borrows the least busy container of the pool.
+
+        Yields:
+            Container: Container in which commands can be executed
+        """
+        with self._lock:
+            container = min(
+                self._containers,
+                key=lambda element: self._in_flight[element.id],
+            )
+            self._in_flight[container.id] += 1
+
+        try:
+            yield container
+        finally:
+            with self._lock:
+                if container.id in self._in_flight:
+                    self._in_flight[container.id] -= 1
+
+    def stop_all(self) -> int:
+        """Removes all the labelled containers, including the reusable ones.
+
+        Returns:
+            int: Number of removed containers
+        """
+        with self._lock:
+            containers = self.__list_labelled_containers()
+            for container in containers:
+                self.__remove_container(container)
+
+            self._containers = []
+            self._in_flight = {}
+            self.size = 0
+
+        return len(containers)
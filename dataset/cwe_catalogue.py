@@ -0,0 +1,173 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import typing
+
+from dataset.configuration import Configuration
+
+CHILD_OF_REGEX = r"::NATURE:ChildOf:CWE ID:([0-9]+):VIEW ID:{view}\b"
+
+
+class CweCatalogue:
+    """Catalogue of the CWE names and hierarchy.
+
+    The catalogue is generated once from the CWE database and stored in a
+    compact file, together with the precomputed closures of the hierarchy.
+    Each process loads it at most once.
+    """
+
+    _shared_catalogue: "CweCatalogue" = None
+    _shared_catalogue_lock = threading.Lock()
+
+    _names: typing.Dict[int, str]
+    _descendants: typing.Dict[int, typing.List[int]]
+    _ancestors: typing.Dict[int, typing.List[int]]
+
+    def __init__(
+        self, filename: str = Configuration.CweCatalogue.FILENAME
+    ) -> None:
+        try:
+            with open(filename, "r", encoding="utf-8") as catalogue_file:
+                content = json.load(catalogue_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            content = self.__generate()
+            self.__dump(filename, content)
+
+        self._names = self.__parse_keys(content["names"])
+        self._descendants = self.__parse_keys(content["descendants"])
+        self._ancestors = self.__parse_keys(content["ancestors"])
+
+    @classmethod
+    def get_shared(cls) -> "CweCatalogue":
+        """Gets the catalogue loaded by the current process.
+
+        Returns:
+            CweCatalogue: Shared catalogue
+        """
+        with cls._shared_catalogue_lock:
+            if cls._shared_catalogue is None:
+                cls._shared_catalogue = cls()
+
+        return cls._shared_catalogue
+
+    def get_name(self, cwe: int) -> typing.Optional[str]:
+        return self._names.get(cwe)
+
+    def get_descendants(self, cwe: int) -> typing.List[int]:
+        """Gets the CWEs that are children of a CWE, directly or not.
+
+        Args:
+            cwe (int): CWE ID
+
+        Returns:
+            typing.List[int]: Descendants, including the CWE itself
+        """
+        return self._descendants.get(cwe, [cwe])
+
+    def get_ancestors(self, cwe: int) -> typing.List[int]:
+        """Gets the CWEs that are parents of a CWE, directly or not.
+
+        Args:
+            cwe (int): CWE ID
+
+        Returns:
+            typing.List[int]: Ancestors, including the CWE itself
+        """
+        return self._ancestors.get(cwe, [cwe])
+
+    def expand(self, cwes: typing.Iterable[int]) -> typing.List[int]:
+        """Expands a CWE filter with the descendants of its CWEs.
+
+        Args:
+            cwes (typing.Iterable[int]): CWE IDs
+
+        Returns:
+            typing.List[int]: Sorted CWE IDs, along with their descendants
+        """
+        expanded_cwes = set()
+        for cwe in cwes:
+            expanded_cwes.update(self.get_descendants(cwe))
+
+        return sorted(expanded_cwes)
+
+    def __parse_keys(self, mapping: dict) -> dict:
+        return {int(key): value for key, value in mapping.items()}
+
+    def __generate(self) -> dict:
+        # The CWE database is imported only when the catalogue is generated,
+        # because its loading is slow.
+        import cwe as cwelib
+
+        child_of_regex = CHILD_OF_REGEX.format(
+            view=Configuration.CweCatalogue.HIERARCHY_VIEW
+        )
+
+        names = {}
+        parents = {}
+        for weakness in cwelib.Database().get_all():
+            cwe = int(weakness.cwe_id)
+            names[cwe] = weakness.name
+            parents[cwe] = {
+                int(parent)
+                for parent in re.findall(
+                    child_of_regex, weakness.related_weaknesses or ""
+                )
+            }
+
+        ancestors = {}
+        for cwe in names:
+            self.__compute_ancestors(cwe, parents, ancestors)
+
+        descendants = {cwe: {cwe} for cwe in names}
+        for cwe, cwe_ancestors in ancestors.items():
+            for ancestor in cwe_ancestors:
+                descendants.setdefault(ancestor, {ancestor}).add(cwe)
+
+        return {
+            "names": names,
+            "descendants": {
+                cwe: sorted(elements) for cwe, elements in descendants.items()
+            },
+            "ancestors": {
+                cwe: sorted(elements) for cwe, elements in ancestors.items()
+            },
+        }
+
+    def __compute_ancestors(
+        self,
+        cwe: int,
+        parents: typing.Dict[int, typing.Set[int]],
+        ancestors: typing.Dict[int, typing.Set[int]],
+    ) -> typing.Set[int]:
+        if cwe in ancestors:
+            return ancestors[cwe]
+
+        # The placeholder stops the recursion on cycles.
+        ancestors[cwe] = {cwe}
+        for parent in parents.get(cwe, []):
+            ancestors[cwe] |= self.__compute_ancestors(
+                parent, parents, ancestors
+            )
+
+        return ancestors[cwe]
+
+    def __dump(self, filename: str, content: dict) -> None:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        # Each process writes its own temporary file, so the catalogue can be
+        # generated by several processes at once.
+        file_descriptor, temporary_filename = tempfile.mkstemp(
+            dir=os.path.dirname(filename)
+        )
+        try:
+            with os.fdopen(
+                file_descriptor, "w", encoding="utf-8"
+            ) as catalogue_file:
+                json.dump(content, catalogue_file, separators=(",", ":"))
+            os.replace(temporary_filename, filename)
+        except BaseException:
+            os.remove(temporary_filename)
+
+            raise
@@ -7,6 +7,7 @@ from dataset.configuration import Configuration
 
 class Executable(IExecutable):
     parent_dataset: str
+    variant: typing.Optional[str]
     is_built: bool
 
     def __init__(
@@ -14,9 +15,11 @@ class Executable(IExecutable):
         identifier: str,
         cwes: typing.List[int],
         parent_dataset: str,
+        variant: str = None,
     ) -> None:
         self.identifier = identifier
         self.parent_dataset = parent_dataset
+        self.variant = variant
         self.full_path = self.__get_full_path()
 
         if isinstance(cwes, int):
@@ -29,6 +32,9 @@ class Executable(IExecutable):
             self.identifier + Configuration.Assets.ELF_EXTENSION
         )
 
+        # The executables built in a variant are stored in its own folder.
         return os.path.join(
-            Configuration.Assets.MAIN_DATASET_EXECUTABLES, filename_with_ext
+            Configuration.Assets.MAIN_DATASET_EXECUTABLES,
+            self.variant or "",
+            filename_with_ext,
         )
@@ -0,0 +1,51 @@
+import fcntl
+import os
+import threading
+import typing
+
+LOCK_EXTENSION = ".lock"
+
+
+class FileLock:
+    """Exclusive lock on a file, shared by the processes and threads.
+
+    The lock is taken on a companion file, which is never removed, because
+    removing it would let two processes hold locks on different files.
+    """
+
+    _lock_filename: str
+    _thread_lock: threading.Lock
+    _file_descriptor: typing.Optional[int]
+
+    def __init__(self, filename: str) -> None:
+        self._lock_filename = filename + LOCK_EXTENSION
+        self._thread_lock = threading.Lock()
+        self._file_descriptor = None
+
+    def __enter__(self) -> "FileLock":
+        self._thread_lock.acquire()
+
+        try:
+            self._file_descriptor = os.open(
+                self._lock_filename, os.O_RDWR | os.O_CREAT, 0o644
+            )
+            fcntl.flock(self._file_descriptor, fcntl.LOCK_EX)
+        except OSError:
+            self.__close()
+            self._thread_lock.release()
+
+            raise
+
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        try:
+            fcntl.flock(self._file_descriptor, fcntl.LOCK_UN)
+        finally:
+            self.__close()
+            self._thread_lock.release()
+
+    def __close(self) -> None:
+        if self._file_descriptor is not None:
+            os.close(self._file_descriptor)
+            self._file_descriptor = None
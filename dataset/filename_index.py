@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import typing
+
+
+class FilenameIndex:
+    """Index mapping the basenames of the files inside a folder to their paths.
+
+    The folder is walked once and the index is persisted, so the next runs
+    only walk it again if a lookup finds a missing or stale path.
+    """
+
+    _root_folder: str
+    _cache_filename: str
+    _paths: typing.Dict[str, typing.List[str]]
+    _is_fresh: bool
+
+    def __init__(self, root_folder: str, cache_filename: str) -> None:
+        self._root_folder = root_folder
+        self._cache_filename = cache_filename
+        self._is_fresh = False
+
+        try:
+            with open(self._cache_filename, "r", encoding="utf-8") as cache:
+                self._paths = json.load(cache)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.__rebuild()
+
+    def resolve(self, path: str) -> typing.Optional[str]:
+        """Finds a file inside the indexed folder.
+
+        Args:
+            path (str): Basename of the file, optionally prefixed by some of
+                its parent folders
+
+        Returns:
+            typing.Optional[str]: Full path to the file, if it exists
+        """
+        full_path = self.__lookup(path)
+
+        if (full_path is None or not os.path.isfile(full_path)) and (
+            not self._is_fresh
+        ):
+            self.__rebuild()
+            full_path = self.__lookup(path)
+
+        return full_path
+
+    def __lookup(self, path: str) -> typing.Optional[str]:
+        for candidate in self._paths.get(os.path.basename(path), []):
+            if candidate.endswith(os.sep + path):
+                return candidate
+
+        return None
+
+    def __rebuild(self) -> None:
+        self._paths = {}
+        for root, folders, filenames in os.walk(self._root_folder):
+            # The walk is sorted to resolve duplicate basenames in the same
+            # way on every run.
+            folders.sort()
+
+            for filename in sorted(filenames):
+                self._paths.setdefault(filename, []).append(
+                    os.path.join(root, filename)
+                )
+
+        self._is_fresh = True
+
+        # Each process writes its own temporary file, which is then moved in
+        # place atomically, so concurrent rebuilds don't clash.
+        os.makedirs(os.path.dirname(self._cache_filename), exist_ok=True)
+        file_descriptor, temporary_filename = tempfile.mkstemp(
+            dir=os.path.dirname(self._cache_filename)
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as cache:
+                json.dump(self._paths, cache)
+            os.replace(temporary_filename, self._cache_filename)
+        except BaseException:
+            os.remove(temporary_filename)
+
+            raise
@@ -0,0 +1,61 @@
+import importlib
+import os
+from enum import Enum
+
+from dataset.index_storages.base import BaseIndexStorage, IndexEntry
+
+
+class AvailableIndexStorages(Enum):
+    """Storages of the index, referred by their modules and classes.
+
+    The storages are imported only when created, because some of them
+    depend on heavy modules (for example, pandas) that the read-only
+    commands don't need.
+    """
+
+    CSV = ("dataset.index_storages.csv_storage", "CsvIndexStorage")
+    CSV_READER = (
+        "dataset.index_storages.csv_reader_storage",
+        "CsvReaderIndexStorage",
+    )
+    SQLITE = ("dataset.index_storages.sqlite_storage", "SqliteIndexStorage")
+
+
+STORAGES_BY_EXTENSION = {
+    ".csv": AvailableIndexStorages.CSV,
+    ".db": AvailableIndexStorages.SQLITE,
+    ".sqlite": AvailableIndexStorages.SQLITE,
+    ".sqlite3": AvailableIndexStorages.SQLITE,
+}
+READ_ONLY_STORAGES = {
+    AvailableIndexStorages.CSV: AvailableIndexStorages.CSV_READER,
+}
+
+
+def create_storage(filename: str, read_only: bool = False) -> BaseIndexStorage:
+    """Creates the storage matching the extension of an index file.
+
+    Args:
+        filename (str): Name of the index file
+        read_only (bool, optional): Boolean indicating if the index is only
+            queried, case in which a lighter storage may be used. Defaults to
+            False.
+
+    Raises:
+        ValueError: The extension is not supported by any storage
+
+    Returns:
+        BaseIndexStorage: Storage of the index
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in STORAGES_BY_EXTENSION:
+        raise ValueError(f'No index storage supports the file "{filename}".')
+
+    storage = STORAGES_BY_EXTENSION[extension]
+    if read_only:
+        storage = READ_ONLY_STORAGES.get(storage, storage)
+
+    module_name, class_name = storage.value
+    storage_class = getattr(importlib.import_module(module_name), class_name)
+
+    return storage_class(filename)
@@ -0,0 +1,51 @@
+import abc
+import typing
+
+IndexEntry = typing.Tuple[str, typing.List[int], str, bool]
+
+
+class BaseIndexStorage(abc.ABC):
+    """Storage of the entries of a vulnerable executables index.
+
+    Each entry is a tuple made of the name of the executable, its CWEs, the
+    name of its parent dataset and a boolean indicating if it was built.
+
+    An executable may also be built in several variants, each of them
+    having its own build status. When a variant is queried, the status in
+    the returned entries is the one of that variant.
+    """
+
+    filename: str
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+
+    @abc.abstractmethod
+    def add_entry(
+        self, name: str, cwes: typing.List[int], parent_dataset: str
+    ) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def mark_as_built(self, name: str, variant: str = None) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def query(
+        self,
+        dataset: str = None,
+        cwes: typing.List[int] = None,
+        is_built: bool = None,
+        limit: int = None,
+        offset: int = 0,
+        variant: str = None,
+    ) -> typing.Generator[IndexEntry, None, None]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def flush(self) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def export_to_csv(self, filename: str) -> None:
+        raise NotImplementedError()
@@ -0,0 +1,92 @@
+import csv
+import os
+import shutil
+import typing
+
+from dataset.configuration import Configuration
+from dataset.index_storages.base import BaseIndexStorage, IndexEntry
+
+
+class CsvReaderIndexStorage(BaseIndexStorage):
+    """Read-only storage streaming the entries of a CSV index.
+
+    It only depends on the standard library and reads the rows one at a time,
+    so querying the index is fast to start and uses constant memory.
+    """
+
+    def add_entry(
+        self, name: str, cwes: typing.List[int], parent_dataset: str
+    ) -> None:
+        raise RuntimeError("The index was opened as read-only.")
+
+    def mark_as_built(self, name: str, variant: str = None) -> None:
+        raise RuntimeError("The index was opened as read-only.")
+
+    def query(
+        self,
+        dataset: str = None,
+        cwes: typing.List[int] = None,
+        is_built: bool = None,
+        limit: int = None,
+        offset: int = 0,
+        variant: str = None,
+    ) -> typing.Generator[IndexEntry, None, None]:
+        wanted_cwes = set(cwes) if cwes else None
+        matches_count = 0
+
+        with open(self.filename, "r", encoding="utf-8", newline="") as index:
+            for row in csv.DictReader(index):
+                if dataset and row["parent_dataset"] != dataset:
+                    continue
+
+                if variant:
+                    # The indexes written before the variants were
+                    # introduced don't have their column.
+                    row_is_built = variant in self.__parse_variants(
+                        row.get("variants")
+                    )
+                else:
+                    row_is_built = row["is_built"] == "True"
+                if is_built is not None and row_is_built != is_built:
+                    continue
+
+                row_cwes = self.__parse_cwes(row["cwes"])
+                if wanted_cwes and wanted_cwes.isdisjoint(row_cwes):
+                    continue
+
+                matches_count += 1
+                if matches_count <= offset:
+                    continue
+                if limit is not None and matches_count > offset + limit:
+                    return
+
+                yield (
+                    row["name"],
+                    row_cwes,
+                    row["parent_dataset"],
+                    row_is_built,
+                )
+
+    def __parse_cwes(self, cwes: str) -> typing.List[int]:
+        if not cwes:
+            return []
+
+        return [
+            int(cwe)
+            for cwe in cwes.split(Configuration.DatasetCreation.CWES_SEPARATOR)
+        ]
+
+    def __parse_variants(
+        self, variants: typing.Optional[str]
+    ) -> typing.List[str]:
+        if not variants:
+            return []
+
+        return variants.split(Configuration.DatasetCreation.VARIANTS_SEPARATOR)
+
+    def flush(self) -> None:
+        pass
+
+    def export_to_csv(self, filename: str) -> None:
+        if os.path.abspath(filename) != os.path.abspath(self.filename):
+            shutil.copyfile(self.filename, filename)
@@ -0,0 +1,300 @@
+import os
+import typing
+
+import numpy
+import pandas
+
+from dataset.configuration import Configuration
+from dataset.file_lock import FileLock
+from dataset.index_storages.base import BaseIndexStorage, IndexEntry
+
+COLUMNS = ["name", "cwes", "parent_dataset", "is_built", "variants"]
+COLUMNS_TYPES = {
+    "name": str,
+    "cwes": str,
+    "parent_dataset": str,
+    "variants": str,
+}
+IS_BUILT_POSITION = COLUMNS.index("is_built")
+VARIANTS_POSITION = COLUMNS.index("variants")
+TEMPORARY_EXTENSION = ".tmp"
+
+
+class CsvIndexStorage(BaseIndexStorage):
+    """Storage keeping the whole index in memory and dumping it as CSV.
+
+    The variants in which an executable was built are stored in a column of
+    its row, as a list of names. The new entries and the status updates are
+    buffered and applied in bulk to the frame before it is read, while a
+    lookup from names to row positions makes each update constant-time. The
+    queries are answered with column masks and with inverted indexes from
+    CWEs and variants to row positions, which are extended as new rows are
+    added and as the rows are built in new variants.
+
+    The changes made since the last flush are also journaled. On flush, the
+    file is locked and, if another process replaced it in the meantime, it is
+    loaded again and the journal is replayed on top of it, before the merged
+    index is atomically moved in place.
+    """
+
+    _dataset: pandas.DataFrame
+    _pending_rows: typing.List[list]
+    _pending_built_positions: typing.Set[int]
+    _pending_variants: typing.Dict[int, typing.Set[str]]
+    _positions_by_name: typing.Dict[str, typing.List[int]]
+    _cwes_by_position: typing.List[typing.List[int]]
+    _positions_by_cwe: typing.Dict[int, typing.List[int]]
+    _positions_by_variant: typing.Dict[str, typing.List[int]]
+    _unflushed_entries: typing.List[typing.Tuple[str, str, str]]
+    _unflushed_builds: typing.Set[typing.Tuple[str, typing.Optional[str]]]
+    _file_state: typing.Optional[tuple]
+    _file_lock: FileLock
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename)
+
+        self._unflushed_entries = []
+        self._unflushed_builds = set()
+        self._file_lock = FileLock(self.filename)
+
+        self.__load()
+
+    def __load(self) -> None:
+        self._file_state = self.__get_file_state()
+        # The indexes written before the variants were introduced don't have
+        # their column, which is then added empty.
+        self._dataset = pandas.read_csv(
+            self.filename, dtype=COLUMNS_TYPES, keep_default_na=False
+        ).reindex(columns=COLUMNS, fill_value="")
+        self._pending_rows = []
+        self._pending_built_positions = set()
+        self._pending_variants = {}
+        self._cwes_by_position = []
+        self._positions_by_cwe = {}
+        self._positions_by_variant = {}
+
+        self._positions_by_name = {}
+        for position, name in enumerate(self._dataset["name"]):
+            self._positions_by_name.setdefault(name, []).append(position)
+
+    def __get_file_state(self) -> typing.Optional[tuple]:
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def add_entry(
+        self, name: str, cwes: typing.List[int], parent_dataset: str
+    ) -> None:
+        cwes = self.__stringifies_cwes(cwes)
+
+        self._unflushed_entries.append((name, cwes, parent_dataset))
+        self.__append_row(name, cwes, parent_dataset)
+
+    def __append_row(self, name: str, cwes: str, parent_dataset: str) -> None:
+        position = len(self._dataset.index) + len(self._pending_rows)
+        self._positions_by_name.setdefault(name, []).append(position)
+        self._pending_rows.append([name, cwes, parent_dataset, False, ""])
+
+    def __stringifies_cwes(self, cwes: typing.List[int]) -> str:
+        return Configuration.DatasetCreation.CWES_SEPARATOR.join(
+            [str(cwe) for cwe in cwes]
+        )
+
+    def __parse_cwes(self, cwes: str) -> typing.List[int]:
+        if not cwes:
+            return []
+
+        return [
+            int(cwe)
+            for cwe in cwes.split(Configuration.DatasetCreation.CWES_SEPARATOR)
+        ]
+
+    def __parse_variants(self, variants: str) -> typing.List[str]:
+        if not variants:
+            return []
+
+        return variants.split(Configuration.DatasetCreation.VARIANTS_SEPARATOR)
+
+    def __add_variant(self, variants: str, variant: str) -> str:
+        variants = set(self.__parse_variants(variants))
+        variants.add(variant)
+
+        return Configuration.DatasetCreation.VARIANTS_SEPARATOR.join(
+            sorted(variants)
+        )
+
+    def mark_as_built(self, name: str, variant: str = None) -> None:
+        self._unflushed_builds.add((name, variant))
+        self.__mark_rows_as_built(name, variant)
+
+    def __mark_rows_as_built(self, name: str, variant: str = None) -> None:
+        frame_length = len(self._dataset.index)
+
+        for position in self._positions_by_name.get(name, []):
+            if position < frame_length:
+                if variant:
+                    self._pending_variants.setdefault(position, set()).add(
+                        variant
+                    )
+                else:
+                    self._pending_built_positions.add(position)
+            else:
+                row = self._pending_rows[position - frame_length]
+                if variant:
+                    row[VARIANTS_POSITION] = self.__add_variant(
+                        row[VARIANTS_POSITION], variant
+                    )
+                else:
+                    row[IS_BUILT_POSITION] = True
+
+    def __apply_pending_changes(self) -> None:
+        if self._pending_rows:
+            new_rows = pandas.DataFrame(
+                self._pending_rows, columns=self._dataset.columns
+            )
+            self._dataset = pandas.concat(
+                [self._dataset, new_rows], ignore_index=True
+            )
+            self._pending_rows = []
+
+        if self._pending_built_positions:
+            self._dataset.iloc[
+                sorted(self._pending_built_positions),
+                self._dataset.columns.get_loc("is_built"),
+            ] = True
+            self._pending_built_positions = set()
+
+        indexed_rows_count = len(self._cwes_by_position)
+        for position, variants in self._pending_variants.items():
+            row_variants = set(
+                self.__parse_variants(
+                    self._dataset.iat[position, VARIANTS_POSITION]
+                )
+            )
+            new_variants = variants - row_variants
+            if not new_variants:
+                continue
+
+            self._dataset.iat[
+                position, VARIANTS_POSITION
+            ] = Configuration.DatasetCreation.VARIANTS_SEPARATOR.join(
+                sorted(row_variants | new_variants)
+            )
+
+            # The rows not indexed yet are indexed from their updated column.
+            if position < indexed_rows_count:
+                for variant in new_variants:
+                    self._positions_by_variant.setdefault(variant, []).append(
+                        position
+                    )
+        self._pending_variants = {}
+
+    def query(
+        self,
+        dataset: str = None,
+        cwes: typing.List[int] = None,
+        is_built: bool = None,
+        limit: int = None,
+        offset: int = 0,
+        variant: str = None,
+    ) -> typing.Generator[IndexEntry, None, None]:
+        self.__apply_pending_changes()
+        self.__update_indexes()
+
+        if variant:
+            built_statuses = numpy.zeros(len(self._dataset.index), dtype=bool)
+            built_statuses[self._positions_by_variant.get(variant, [])] = True
+        else:
+            built_statuses = self._dataset["is_built"].to_numpy()
+
+        mask = numpy.ones(len(self._dataset.index), dtype=bool)
+        if dataset:
+            mask &= self._dataset["parent_dataset"].to_numpy() == dataset
+        if is_built is not None:
+            mask &= built_statuses == is_built
+        if cwes:
+            mask &= self.__get_cwes_mask(cwes)
+
+        names = self._dataset["name"].to_numpy()
+        parent_datasets = self._dataset["parent_dataset"].to_numpy()
+        positions = numpy.flatnonzero(mask)[offset:]
+        if limit is not None:
+            positions = positions[:limit]
+
+        for position in positions:
+            yield (
+                names[position],
+                list(self._cwes_by_position[position]),
+                parent_datasets[position],
+                bool(built_statuses[position]),
+            )
+
+    def __update_indexes(self) -> None:
+        start = len(self._cwes_by_position)
+
+        for position, (cwes, variants) in enumerate(
+            zip(
+                self._dataset["cwes"].iloc[start:],
+                self._dataset["variants"].iloc[start:],
+            ),
+            start,
+        ):
+            cwes = self.__parse_cwes(cwes)
+            self._cwes_by_position.append(cwes)
+
+            for cwe in cwes:
+                self._positions_by_cwe.setdefault(cwe, []).append(position)
+            for variant in self.__parse_variants(variants):
+                self._positions_by_variant.setdefault(variant, []).append(
+                    position
+                )
+
+    def __get_cwes_mask(self, cwes: typing.List[int]) -> numpy.ndarray:
+        mask = numpy.zeros(len(self._dataset.index), dtype=bool)
+        for cwe in cwes:
+            mask[self._positions_by_cwe.get(cwe, [])] = True
+
+        return mask
+
+    def flush(self) -> None:
+        if not self._unflushed_entries and not self._unflushed_builds:
+            return
+
+        with self._file_lock:
+            if self.__get_file_state() != self._file_state:
+                self.__load()
+                self.__replay_unflushed_changes()
+
+            self.__apply_pending_changes()
+
+            # The index is written next to its final location and then
+            # atomically moved, so that the readers never see a partial file.
+            temporary_filename = self.filename + TEMPORARY_EXTENSION
+            self._dataset.to_csv(temporary_filename, index=False)
+            os.replace(temporary_filename, self.filename)
+
+            self._file_state = self.__get_file_state()
+            self._unflushed_entries = []
+            self._unflushed_builds = set()
+
+    def __replay_unflushed_changes(self) -> None:
+        for name, cwes, parent_dataset in self._unflushed_entries:
+            # Another process may have added the same executable.
+            if name not in self._positions_by_name:
+                self.__append_row(name, cwes, parent_dataset)
+
+        for name, variant in self._unflushed_builds:
+            self.__mark_rows_as_built(name, variant)
+
+    def export_to_csv(self, filename: str) -> None:
+        if os.path.abspath(filename) == os.path.abspath(self.filename):
+            self.flush()
+
+            return
+
+        self.__apply_pending_changes()
+
+        self._dataset.to_csv(filename, index=False)
@@ -0,0 +1,254 @@
+import csv
+import sqlite3
+import threading
+import typing
+
+from dataset.configuration import Configuration
+from dataset.index_storages.base import BaseIndexStorage, IndexEntry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executables (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    parent_dataset TEXT NOT NULL,
+    is_built INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS executables_parent_dataset
+    ON executables (parent_dataset, is_built);
+CREATE TABLE IF NOT EXISTS executables_cwes (
+    executable_id INTEGER NOT NULL REFERENCES executables (id),
+    cwe INTEGER NOT NULL,
+    PRIMARY KEY (executable_id, cwe)
+);
+CREATE INDEX IF NOT EXISTS executables_cwes_cwe
+    ON executables_cwes (cwe, executable_id);
+CREATE TABLE IF NOT EXISTS executables_variants (
+    executable_id INTEGER NOT NULL REFERENCES executables (id),
+    variant TEXT NOT NULL,
+    PRIMARY KEY (executable_id, variant)
+);
+CREATE INDEX IF NOT EXISTS executables_variants_variant
+    ON executables_variants (variant, executable_id);
+"""
+INSERT_EXECUTABLE_QUERY = (
+    "INSERT OR IGNORE INTO executables (name, parent_dataset) VALUES (?, ?)"
+)
+INSERT_CWE_QUERY = (
+    "INSERT OR IGNORE INTO executables_cwes (executable_id, cwe)"
+    " SELECT id, ? FROM executables WHERE name = ?"
+)
+MARK_AS_BUILT_QUERY = "UPDATE executables SET is_built = 1 WHERE name = ?"
+INSERT_VARIANT_QUERY = (
+    "INSERT OR IGNORE INTO executables_variants (executable_id, variant)"
+    " SELECT id, ? FROM executables WHERE name = ?"
+)
+SELECT_QUERY = """
+SELECT name, parent_dataset, {is_built}, (
+    SELECT group_concat(cwe) FROM executables_cwes
+    WHERE executable_id = executables.id
+)
+FROM executables
+WHERE {conditions}
+ORDER BY id
+LIMIT ? OFFSET ?
+"""
+CWES_CONDITION = (
+    "id IN (SELECT executable_id FROM executables_cwes WHERE cwe IN ({}))"
+)
+VARIANT_IS_BUILT_EXPRESSION = (
+    "EXISTS (SELECT 1 FROM executables_variants"
+    " WHERE executable_id = executables.id AND variant = ?)"
+)
+SELECT_VARIANTS_QUERY = """
+SELECT name, group_concat(variant)
+FROM executables JOIN executables_variants ON id = executable_id
+GROUP BY id
+"""
+CSV_HEADER = ["name", "cwes", "parent_dataset", "is_built", "variants"]
+
+
+class SqliteIndexStorage(BaseIndexStorage):
+    """Storage backed by a SQLite database.
+
+    The executables, their CWEs and the variants in which they were built
+    are stored in separate, indexed tables.
+    The changes are buffered and written on each flush, or before a query,
+    in a single immediate transaction. The database is kept in WAL mode, so
+    several processes can build into the same index, the writers waiting for
+    each other only during these short transactions and never blocking the
+    readers.
+    """
+
+    _connection: sqlite3.Connection
+    _pending_entries: typing.List[typing.Tuple[str, typing.List[int], str]]
+    _pending_built_names: typing.List[str]
+    _pending_built_variants: typing.List[typing.Tuple[str, str]]
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename)
+
+        self._connection = sqlite3.connect(
+            self.filename,
+            timeout=Configuration.DatasetCreation.SQLITE_BUSY_TIMEOUT,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+        self._pending_entries = []
+        self._pending_built_names = []
+        self._pending_built_variants = []
+        self._lock = threading.Lock()
+
+    def add_entry(
+        self, name: str, cwes: typing.List[int], parent_dataset: str
+    ) -> None:
+        with self._lock:
+            self._pending_entries.append((name, list(cwes), parent_dataset))
+
+    def mark_as_built(self, name: str, variant: str = None) -> None:
+        with self._lock:
+            if variant:
+                self._pending_built_variants.append((variant, name))
+            else:
+                self._pending_built_names.append(name)
+
+    def query(
+        self,
+        dataset: str = None,
+        cwes: typing.List[int] = None,
+        is_built: bool = None,
+        limit: int = None,
+        offset: int = 0,
+        variant: str = None,
+    ) -> typing.Generator[IndexEntry, None, None]:
+        self.flush()
+
+        # The parameters of the build status expression come first, as it is
+        # also selected.
+        is_built_expression = "is_built"
+        parameters = []
+        if variant:
+            is_built_expression = VARIANT_IS_BUILT_EXPRESSION
+            parameters.append(variant)
+
+        conditions = ["1"]
+        if dataset:
+            conditions.append("parent_dataset = ?")
+            parameters.append(dataset)
+        if is_built is not None:
+            conditions.append(f"{is_built_expression} = ?")
+            if variant:
+                parameters.append(variant)
+            parameters.append(int(is_built))
+        if cwes:
+            conditions.append(
+                CWES_CONDITION.format(", ".join("?" for _ in cwes))
+            )
+            parameters.extend(cwes)
+        # A negative limit means no limit in SQLite.
+        parameters.extend([limit if limit is not None else -1, offset])
+
+        # The rows are fetched before being yielded, so that the caller is
+        # free to update the index while iterating.
+        rows = self._connection.execute(
+            SELECT_QUERY.format(
+                is_built=is_built_expression,
+                conditions=" AND ".join(conditions),
+            ),
+            parameters,
+        ).fetchall()
+        for name, parent_dataset, row_is_built, row_cwes in rows:
+            yield (
+                name,
+                self.__parse_cwes(row_cwes),
+                parent_dataset,
+                bool(row_is_built),
+            )
+
+    def __parse_cwes(self, cwes: typing.Optional[str]) -> typing.List[int]:
+        if not cwes:
+            return []
+
+        return sorted(int(cwe) for cwe in cwes.split(","))
+
+    def flush(self) -> None:
+        with self._lock:
+            if (
+                not self._pending_entries
+                and not self._pending_built_names
+                and not self._pending_built_variants
+            ):
+                return
+
+            # The write lock is taken when the transaction begins, instead
+            # of on its first write, so that concurrent writers wait for
+            # each other instead of failing to upgrade their locks.
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    INSERT_EXECUTABLE_QUERY,
+                    [
+                        (name, parent_dataset)
+                        for name, _, parent_dataset in self._pending_entries
+                    ],
+                )
+                self._connection.executemany(
+                    INSERT_CWE_QUERY,
+                    [
+                        (cwe, name)
+                        for name, cwes, _ in self._pending_entries
+                        for cwe in cwes
+                    ],
+                )
+                self._connection.executemany(
+                    MARK_AS_BUILT_QUERY,
+                    [(name,) for name in self._pending_built_names],
+                )
+                self._connection.executemany(
+                    INSERT_VARIANT_QUERY, self._pending_built_variants
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+
+                raise
+
+            self._connection.execute("COMMIT")
+
+            self._pending_entries = []
+            self._pending_built_names = []
+            self._pending_built_variants = []
+
+    def export_to_csv(self, filename: str) -> None:
+        self.flush()
+        variants_by_name = dict(
+            self._connection.execute(SELECT_VARIANTS_QUERY).fetchall()
+        )
+
+        with open(filename, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(CSV_HEADER)
+
+            for name, cwes, parent_dataset, is_built in self.query():
+                writer.writerow(
+                    [
+                        name,
+                        Configuration.DatasetCreation.CWES_SEPARATOR.join(
+                            str(cwe) for cwe in cwes
+                        ),
+                        parent_dataset,
+                        is_built,
+                        self.__stringifies_variants(
+                            variants_by_name.get(name)
+                        ),
+                    ]
+                )
+
+    def __stringifies_variants(self, variants: typing.Optional[str]) -> str:
+        if not variants:
+            return ""
+
+        return Configuration.DatasetCreation.VARIANTS_SEPARATOR.join(
+            sorted(variants.split(","))
+        )
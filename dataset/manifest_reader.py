@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import typing
+import xml.etree.ElementTree as ET
+
+from dataset.profiler import Profiler
+
+CWE_REGEX = r"CWE-([0-9]+)"
+HASHING_CHUNK_SIZE = 1 << 20
+
+
+class ManifestFile:
+    path: str
+    language: typing.Optional[str]
+    cwes: typing.List[int]
+
+    def __init__(
+        self, path: str, language: typing.Optional[str], cwes: typing.List[int]
+    ) -> None:
+        self.path = path
+        self.language = language
+        self.cwes = cwes
+
+
+class ManifestReader:
+    """Streaming reader of the SARD manifests of the NIST test suites.
+
+    The manifest is parsed incrementally, the processed elements being cleared
+    as soon as their testcase is read. The parsed testcases are also written
+    into a cache with one testcase per line, which is used instead of the
+    manifest by the next runs, as long as the manifest's hash is the same.
+    """
+
+    _manifest_filename: str
+    _cache_filename: str
+
+    def __init__(self, manifest_filename: str, cache_filename: str) -> None:
+        self._manifest_filename = manifest_filename
+        self._cache_filename = cache_filename
+
+    def get_testcases(
+        self,
+    ) -> typing.Generator[typing.List[ManifestFile], None, None]:
+        """Gets the testcases from the manifest.
+
+        Yields:
+            typing.List[ManifestFile]: Files of a testcase
+        """
+        profiler = Profiler.get_shared()
+
+        with profiler.phase("manifest_hashing"):
+            manifest_hash = self.__compute_manifest_hash()
+
+        if self.__is_cache_valid(manifest_hash):
+            testcases = self.__read_cache()
+        else:
+            testcases = self.__parse_manifest_into_cache(manifest_hash)
+
+        yield from profiler.profile_iterator("manifest_parsing", testcases)
+
+    def __compute_manifest_hash(self) -> str:
+        hasher = hashlib.sha256()
+        with open(self._manifest_filename, "rb") as manifest:
+            while chunk := manifest.read(HASHING_CHUNK_SIZE):
+                hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    def __is_cache_valid(self, manifest_hash: str) -> bool:
+        try:
+            with open(self._cache_filename, "r", encoding="utf-8") as cache:
+                header = json.loads(cache.readline())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        return header.get("manifest_hash") == manifest_hash
+
+    def __read_cache(
+        self,
+    ) -> typing.Generator[typing.List[ManifestFile], None, None]:
+        with open(self._cache_filename, "r", encoding="utf-8") as cache:
+            # Skip the header
+            cache.readline()
+
+            for line in cache:
+                yield [ManifestFile(*file) for file in json.loads(line)]
+
+    def __parse_manifest_into_cache(
+        self, manifest_hash: str
+    ) -> typing.Generator[typing.List[ManifestFile], None, None]:
+        os.makedirs(os.path.dirname(self._cache_filename), exist_ok=True)
+
+        # The cache is moved in place only if the whole manifest was parsed.
+        # Each process writes its own temporary file, so concurrent parsings
+        # never write into or remove the file of another one.
+        file_descriptor, temporary_filename = tempfile.mkstemp(
+            dir=os.path.dirname(self._cache_filename)
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as cache:
+                cache.write(json.dumps({"manifest_hash": manifest_hash}))
+                cache.write("\n")
+
+                for testcase in self.__parse_manifest():
+                    cache.write(
+                        json.dumps(
+                            [
+                                [file.path, file.language, file.cwes]
+                                for file in testcase
+                            ]
+                        )
+                    )
+                    cache.write("\n")
+
+                    yield testcase
+
+            os.replace(temporary_filename, self._cache_filename)
+        except BaseException:
+            # Also reached when the caller stops iterating early.
+            os.remove(temporary_filename)
+
+            raise
+
+    def __parse_manifest(
+        self,
+    ) -> typing.Generator[typing.List[ManifestFile], None, None]:
+        root = None
+        for event, element in ET.iterparse(
+            self._manifest_filename, events=("start", "end")
+        ):
+            if event == "start":
+                if root is None:
+                    root = element
+
+                continue
+
+            if element.tag != "testcase":
+                continue
+
+            yield [
+                ManifestFile(
+                    file.attrib["path"],
+                    file.attrib.get("language"),
+                    self.__get_cwes_from_file(file),
+                )
+                for file in element.findall("./file")
+            ]
+
+            # The testcases that were already read are dropped from the tree.
+            root.clear()
+
+    def __get_cwes_from_file(self, file: ET.Element) -> typing.List[int]:
+        cwes = []
+        for child in file:
+            if groups := re.search(CWE_REGEX, child.attrib.get("name", "")):
+                cwes.append(int(groups.group(1)))
+
+        return cwes
@@ -1,37 +1,157 @@
 import abc
+import functools
+import os
+import queue
+import shlex
+import threading
 import typing
 
+from dataset.build_cache import BuildCache
+from dataset.build_records import BuildRecordsStore
+from dataset.build_variant import BuildVariant
+from dataset.compilation_scheduler import CompilationScheduler
+from dataset.compilers import (
+    AvailableCompilers,
+    BaseCompiler,
+    CommandResult,
+    create_compiler,
+)
 from dataset.configuration import Configuration
-from dataset.containerized_compiler import ContainerizedCompiler
+from dataset.preprocessing_manifest import PreprocessingManifest
+from dataset.preprocessing_task import PreprocessingTask
+from dataset.profiler import Profiler
+from dataset.sharding import Shard
 from dataset.source import Source
+from dataset.source_filter import SourceFilter
 from dataset.vulnerable_executables_index import VulnerableExecutablesIndex
 
 COMMAND_SUPRESS_OUTPUT = " >/dev/null 2>&1"
 GCC_PREPROCESS_COMMAND = "gcc -E {} -I {} -o {}"
 GCC_BUILD_COMMAND = "gcc {} {} {} -o {}"
+GCC_DEPENDENCIES_FLAGS = " -MD -MF {}"
+# The command runs in a subshell, so the directory change doesn't leak into
+# the batches executed by the same shell. The temporary files are kept in the
+# current directory and named after the sources, the empty dump base making
+# gcc 11 and later stop prefixing them with the name of the executable.
+SINGLE_PASS_COMMAND = (
+    "(cd {folder} && {gcc_command} -save-temps=cwd -dumpbase ''"
+    " && {archive_commands})"
+)
+SINGLE_PASS_ARCHIVE_COMMAND = (
+    "mv -f {preprocessed_file} {archived_file}"
+    " && rm -f {assembly_file} {object_file}"
+)
+SINGLE_PASS_PREPROCESSED_EXTENSIONS = {".c": ".i"}
+CPP_PREPROCESSED_EXTENSION = ".ii"
+PIPELINE_DRAIN_TIMEOUT = 0.1
 DATASET_NAME = Configuration.DatasetCreation.DATASET_NAME
 
+# Executable of a testcase, built with the default flags or in a variant
+Build = typing.Tuple[str, typing.Optional[BuildVariant]]
+
 
 class BaseParser(abc.ABC):
     test_case_name: str
     compile_flags: typing.List[str]
     link_flags: typing.List[str]
+    jobs: int
     dataset_worker: VulnerableExecutablesIndex
+    build_cache: BuildCache
+    build_records: BuildRecordsStore
+    profiler: Profiler
+    _compiler: typing.Optional[BaseCompiler]
+    _preprocessing_manifest: typing.Optional[PreprocessingManifest]
 
     def __init__(
         self,
         test_case_name: str,
         compile_flags: typing.List[str] = None,
         link_flags: typing.List[str] = None,
+        jobs: int = Configuration.DatasetCreation.DEFAULT_JOBS,
     ) -> None:
         self.test_case_name = test_case_name
         self.compile_flags = compile_flags if compile_flags else []
         self.link_flags = link_flags if link_flags else []
+        self.jobs = jobs
         self.dataset_worker = VulnerableExecutablesIndex(DATASET_NAME)
-        self.compiler = ContainerizedCompiler()
+        self.build_cache = BuildCache()
+        self.build_records = BuildRecordsStore()
+        self.profiler = Profiler.get_shared()
+        self._compiler = None
+        self._preprocessing_manifest = None
+
+    @property
+    def compiler(self) -> BaseCompiler:
+        # The compiler stack, which depends on the Docker SDK, is only loaded
+        # when the first command needs to be executed.
+        if self._compiler is None:
+            self._compiler = create_compiler(
+                AvailableCompilers.CONTAINER, self.jobs
+            )
+
+        return self._compiler
+
+    @compiler.setter
+    def compiler(self, compiler: BaseCompiler) -> None:
+        self._compiler = compiler
+
+    @property
+    def preprocessing_manifest(self) -> PreprocessingManifest:
+        if self._preprocessing_manifest is None:
+            self._preprocessing_manifest = PreprocessingManifest(
+                self.test_case_name, self.compiler.image_digest
+            )
+
+        return self._preprocessing_manifest
+
+    @abc.abstractmethod
+    def _get_all_sources(
+        self, source_filter: SourceFilter = None
+    ) -> typing.List[Source]:
+        """Gets the sources of the testcases of the test suite.
+
+        Args:
+            source_filter (SourceFilter, optional): Filter of the testcases,
+                whose not matching ones are skipped as early as possible.
+                Defaults to None.
+
+        Returns:
+            typing.List[Source]: Sources
+        """
+        raise NotImplementedError()
+
+    def _get_full_identifier(self, identifier: typing.Any) -> str:
+        return self.test_case_name + "_" + str(identifier)
+
+    @abc.abstractmethod
+    def _create_preprocessing_task(self, source: Source) -> PreprocessingTask:
+        raise NotImplementedError()
 
     @abc.abstractmethod
-    def _get_all_sources(self) -> typing.List[Source]:
+    def _generate_single_pass_gcc_command(
+        self,
+        task: PreprocessingTask,
+        folder: str,
+        additonal_compile_flags: typing.List[str] = None,
+        additional_link_flags: typing.List[str] = None,
+    ) -> str:
+        """Generates the command compiling the raw sources of a testcase.
+
+        The command is run from the folder of the preprocessed sources, in
+        which the temporary files of the compiler are kept, so all its paths
+        are relative to it.
+
+        Args:
+            task (PreprocessingTask): Preprocessing of the testcase
+            folder (str): Folder of the preprocessed sources
+            additonal_compile_flags (typing.List[str], optional): User-provided
+                compile flags. Defaults to None.
+            additional_link_flags (typing.List[str], optional): User-provided
+                link flags. Defaults to None.
+
+        Returns:
+            str: Compilation command
+        """
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -40,53 +160,604 @@ class BaseParser(abc.ABC):
         identifier: str,
         additonal_compile_flags: typing.List[str] = None,
         additional_link_flags: typing.List[str] = None,
+        variant: BuildVariant = None,
     ) -> str:
-        raise NotImplementedError()
+        """Generates the command building a preprocessed testcase.
 
-    def _execute_command(self, command: str) -> int:
-        return self.compiler.exec_compiler_command(command)
+        Args:
+            identifier (str): Full ID of the testcase
+            additonal_compile_flags (typing.List[str], optional): User-provided
+                compile flags, including the ones of the variant. Defaults to
+                None.
+            additional_link_flags (typing.List[str], optional): User-provided
+                link flags. Defaults to None.
+            variant (BuildVariant, optional): Variant in which the executable
+                is built, which selects its path. Defaults to None.
 
-    @abc.abstractmethod
-    def preprocess(self) -> None:
+        Returns:
+            str: Compilation command
+        """
         raise NotImplementedError()
 
+    def _execute_command(self, command: str) -> CommandResult:
+        return self.compiler.run_compiler_command(command)
+
+    def _execute_commands(
+        self,
+        commands: typing.List[str],
+        phase: str,
+        identifiers: typing.List[str] = None,
+    ) -> typing.List[int]:
+        """Executes multiple commands, measuring each one of them.
+
+        Args:
+            commands (typing.List[str]): Commands to execute
+            phase (str): Name of the phase in which the commands are profiled
+            identifiers (typing.List[str], optional): Testcases or files to
+                which the commands belong. Defaults to the commands.
+
+        Returns:
+            typing.List[int]: Exit codes, in the order of the commands
+        """
+        results = self.compiler.exec_compiler_commands(commands)
+
+        for identifier, result in zip(identifiers or commands, results):
+            if result.start is not None:
+                self.profiler.record(
+                    phase, result.start, result.duration, identifier
+                )
+
+        return [result.exit_code for result in results]
+
+    def _discover_sources(
+        self, source_filter: SourceFilter = None
+    ) -> typing.Iterable[Source]:
+        return self.profiler.profile_iterator(
+            "discovery", self._get_all_sources(source_filter)
+        )
+
+    def _execute_preprocessing_commands(
+        self, commands: typing.List[typing.Tuple[str, str]]
+    ) -> typing.Set[str]:
+        """Executes the preprocessing commands whose inputs have changed.
+
+        Args:
+            commands (typing.List[typing.Tuple[str, str]]): Pairs of output
+                files and commands creating them
+
+        Returns:
+            typing.Set[str]: Output files whose commands failed
+        """
+        manifest = self.preprocessing_manifest
+        outdated_commands = [
+            (output_file, command)
+            for output_file, command in commands
+            if not manifest.is_up_to_date(output_file, command)
+        ]
+        if not outdated_commands:
+            return set()
+
+        os.makedirs(
+            Configuration.PreprocessingManifest.DEPENDENCIES_FOLDER,
+            exist_ok=True,
+        )
+        exit_codes = self._execute_commands(
+            [
+                command
+                + GCC_DEPENDENCIES_FLAGS.format(
+                    manifest.get_dependencies_filename(output_file)
+                )
+                for output_file, command in outdated_commands
+            ],
+            "gcc_preprocess",
+            [output_file for output_file, _ in outdated_commands],
+        )
+
+        failed_output_files = set()
+        for (output_file, command), exit_code in zip(
+            outdated_commands, exit_codes
+        ):
+            if exit_code == 0:
+                manifest.record(output_file, command)
+            else:
+                failed_output_files.add(output_file)
+
+        return failed_output_files
+
+    def _prepare_preprocessing(self) -> None:
+        """Creates the preprocessed artifacts shared by all the testcases."""
+
+    def preprocess(self, source_filter: SourceFilter = None) -> None:
+        """Preprocesses the sources of the test suite.
+
+        The new testcases are added to the index.
+
+        Args:
+            source_filter (SourceFilter, optional): Filter of the preprocessed
+                testcases. Defaults to None, meaning all of them.
+        """
+        self._prepare_preprocessing()
+
+        gcc_commands = []
+        for source in self._discover_sources(source_filter):
+            task = self._create_preprocessing_task(source)
+            if task.is_new:
+                self.dataset_worker.add_new_source(
+                    task.identifier, task.source.cwes, self.test_case_name
+                )
+
+            gcc_commands.extend(task.commands)
+
+        self._execute_preprocessing_commands(gcc_commands)
+
+        self.preprocessing_manifest.dump_to_file()
+        self.dataset_worker.dump_to_file()
+
     def build(
         self,
         additonal_compile_flags: typing.List[str] = None,
         additional_link_flags: typing.List[str] = None,
         rebuild: bool = False,
         cwes: typing.List[int] = None,
+        shard: Shard = None,
+        identifiers: typing.List[str] = None,
     ) -> int:
         sources_ids = self.dataset_worker.get_entries_ids(
             self.test_case_name, cwes, rebuild
         )
+        if shard or identifiers:
+            source_filter = SourceFilter(identifiers=identifiers, shard=shard)
+            sources_ids = (
+                identifier
+                for identifier in sources_ids
+                if source_filter.matches_identifier(identifier)
+            )
+
+        with self.profiler.phase("prepare_build", self.test_case_name):
+            self._prepare_build(additonal_compile_flags, additional_link_flags)
+
+        cache_keys = {}
+        gcc_commands = self.__get_uncached_gcc_commands(
+            ((identifier, None) for identifier in sources_ids),
+            additonal_compile_flags,
+            additional_link_flags,
+            cache_keys,
+        )
+
+        return self.__build_sources(gcc_commands, cache_keys)
+
+    def __build_sources(
+        self,
+        gcc_commands: typing.Iterable[typing.Tuple[Build, str]],
+        cache_keys: typing.Dict[Build, str],
+    ) -> int:
+        scheduler = CompilationScheduler(self._execute_command, self.jobs)
 
+        initial_hits = self.build_cache.hits
         built_count = 0
-        for identifier in sources_ids:
-            gcc_command = self._generate_gcc_command(
-                identifier, additonal_compile_flags, additional_link_flags
-            )
+        # The records of the compiled executables are kept even if the build
+        # is interrupted.
+        try:
+            for build, result in scheduler.run(gcc_commands):
+                identifier, variant = build
+                build_name = self.__get_build_name(identifier, variant)
+                # The executables built in a single pass are not cached.
+                cache_key = cache_keys.pop(build, None)
+
+                self.profiler.record(
+                    "gcc_build", result.start, result.duration, build_name
+                )
+                self.build_records.add_record(
+                    build_name,
+                    self.test_case_name,
+                    result.command,
+                    result.exit_code,
+                    result.duration,
+                    result.output,
+                )
 
-            ret_val = self._execute_command(gcc_command)
+                if result.exit_code == 0:
+                    if cache_key:
+                        self.build_cache.store(
+                            cache_key,
+                            self._get_executable_path(identifier, variant),
+                        )
+                    self.__mark_as_built(identifier, variant)
 
-            if ret_val == 0:
-                self.dataset_worker.mark_source_as_built(identifier)
+                    built_count += 1
+        finally:
+            self.build_records.flush()
 
-                built_count += 1
+        built_count += self.build_cache.hits - initial_hits
 
         self.dataset_worker.dump_to_file()
 
         return built_count
 
+    def _prepare_build(
+        self,
+        additonal_compile_flags: typing.List[str] = None,
+        additional_link_flags: typing.List[str] = None,
+    ) -> None:
+        """Creates the artifacts shared by all the executables of the suite.
+
+        Args:
+            additonal_compile_flags (typing.List[str], optional): User-provided
+                compile flags. Defaults to None.
+            additional_link_flags (typing.List[str], optional): User-provided
+                link flags. Defaults to None.
+        """
+
+    def __get_uncached_gcc_commands(
+        self,
+        builds: typing.Iterable[Build],
+        additonal_compile_flags: typing.List[str],
+        additional_link_flags: typing.List[str],
+        cache_keys: typing.Dict[Build, str],
+    ) -> typing.Generator[typing.Tuple[Build, str], None, None]:
+        for identifier, variant in builds:
+            build_name = self.__get_build_name(identifier, variant)
+            compile_flags = additonal_compile_flags
+            if variant:
+                compile_flags = variant.extend_compile_flags(compile_flags)
+
+            with self.profiler.phase("command_generation", build_name):
+                gcc_command = self._generate_gcc_command(
+                    identifier, compile_flags, additional_link_flags, variant
+                )
+
+            with self.profiler.phase("cache_lookup", build_name):
+                cache_key = self.build_cache.compute_key(
+                    gcc_command, self.compiler.image_digest
+                )
+                is_cached = self.build_cache.restore(
+                    cache_key, self._get_executable_path(identifier, variant)
+                )
+            if is_cached:
+                self.__mark_as_built(identifier, variant)
+
+                continue
+
+            cache_keys[(identifier, variant)] = cache_key
+
+            yield (identifier, variant), gcc_command
+
+    def __get_build_name(
+        self, identifier: str, variant: typing.Optional[BuildVariant]
+    ) -> str:
+        return variant.get_build_name(identifier) if variant else identifier
+
+    def __mark_as_built(
+        self, identifier: str, variant: typing.Optional[BuildVariant]
+    ) -> None:
+        self.dataset_worker.mark_source_as_built(
+            identifier, variant.name if variant else None
+        )
+
+    def _get_executable_path(
+        self, identifier: str, variant: BuildVariant = None
+    ) -> str:
+        folder = Configuration.Assets.MAIN_DATASET_EXECUTABLES
+        if variant:
+            folder = variant.executables_folder
+
+        return os.path.join(
+            folder, identifier + Configuration.Assets.ELF_EXTENSION
+        )
+
     def preprocess_and_build(
         self,
         additonal_compile_flags: typing.List[str] = None,
         additional_link_flag: typing.List[str] = None,
         rebuild: bool = False,
         cwes: typing.List[int] = None,
+        shard: Shard = None,
+        single_pass: bool = False,
+        identifiers: typing.List[str] = None,
+        variants: typing.List[BuildVariant] = None,
     ) -> int:
-        self.preprocess()
+        """Preprocesses and builds the test suite as a streaming pipeline.
+
+        The discovery, the preprocessing and the compilation are stages
+        connected by bounded queues, so each testcase is compiled as soon as
+        it is preprocessed, while the next ones are still being preprocessed.
+        The first two stages run in their own threads and the compilation
+        runs in the caller's one, which is the only one using the index.
+
+        In the single-pass mode, there is no preprocessing stage: a single
+        compiler invocation per testcase keeps its temporary files and both
+        the preprocessed sources and the executable are obtained from it.
+        These executables are not cached, because the cache keys depend on
+        the preprocessed sources.
+
+        In the matrix mode, each preprocessed testcase is compiled once for
+        each of the given variants, the commands of all the variants being
+        executed in parallel. The executables are stored in the folders of
+        the variants instead of the default one.
+
+        Args:
+            additonal_compile_flags (typing.List[str], optional): User-provided
+                compile flags. Defaults to None.
+            additional_link_flag (typing.List[str], optional): User-provided
+                link flags. Defaults to None.
+            rebuild (bool, optional): Boolean indicating if the already built
+                executables are built again. Defaults to False.
+            cwes (typing.List[int], optional): CWEs of the built executables.
+                Defaults to None, meaning all of them.
+            shard (Shard, optional): Shard of the built executables. Defaults
+                to None.
+            single_pass (bool, optional): Boolean indicating if each testcase
+                is preprocessed and compiled by the same command. Defaults to
+                False.
+            identifiers (typing.List[str], optional): Full IDs of the built
+                executables. Defaults to None, meaning all of them.
+            variants (typing.List[BuildVariant], optional): Variants in which
+                the testcases are built. Defaults to None, meaning that they
+                are built only with the default flags.
+
+        Raises:
+            ValueError: The variants are built in the single-pass mode
+
+        Returns:
+            int: Number of built executables
+        """
+        if single_pass and variants:
+            raise ValueError("The variants can't be built in a single pass.")
+
+        variants = variants if variants else [None]
+
+        with self.profiler.phase("prepare_build", self.test_case_name):
+            self._prepare_preprocessing()
+            for variant in variants:
+                if variant:
+                    os.makedirs(variant.executables_folder, exist_ok=True)
+
+                    self._prepare_build(
+                        variant.extend_compile_flags(additonal_compile_flags),
+                        additional_link_flag,
+                    )
+                else:
+                    self._prepare_build(
+                        additonal_compile_flags, additional_link_flag
+                    )
+
+        built_ids = {
+            variant: set(
+                self.dataset_worker.get_entries_ids(
+                    self.test_case_name,
+                    None,
+                    True,
+                    variant.name if variant else None,
+                )
+            )
+            for variant in variants
+        }
+
+        # The compiler and the manifest, which are created on first use, are
+        # shared with the threads of the stages.
+        _ = self.compiler, self.preprocessing_manifest
+
+        queue_size = Configuration.BuildPipeline.QUEUE_SIZE
+        tasks = queue.Queue(queue_size)
+        preprocessed_tasks = queue.Queue(queue_size)
+        stop_event = threading.Event()
+        errors = []
+        stages = [
+            threading.Thread(
+                target=self.__run_pipeline_stage,
+                args=(
+                    functools.partial(
+                        self.__discover_tasks,
+                        SourceFilter(cwes, identifiers, shard),
+                        stop_event,
+                    ),
+                    None,
+                    tasks,
+                    errors,
+                ),
+                daemon=True,
+            )
+        ]
+        if not single_pass:
+            stages.append(
+                threading.Thread(
+                    target=self.__run_pipeline_stage,
+                    args=(
+                        functools.partial(self.__preprocess_tasks, stop_event),
+                        tasks,
+                        preprocessed_tasks,
+                        errors,
+                    ),
+                    daemon=True,
+                )
+            )
+        for stage in stages:
+            stage.start()
+
+        cache_keys = {}
+        if single_pass:
+            gcc_commands = (
+                (
+                    (task.identifier, None),
+                    self.__generate_single_pass_command(
+                        task, additonal_compile_flags, additional_link_flag
+                    ),
+                )
+                for task, _ in self.__get_pipelined_builds(
+                    tasks, built_ids, rebuild, False
+                )
+            )
+        else:
+            gcc_commands = self.__get_uncached_gcc_commands(
+                (
+                    (task.identifier, variant)
+                    for task, variant in self.__get_pipelined_builds(
+                        preprocessed_tasks, built_ids, rebuild
+                    )
+                ),
+                additonal_compile_flags,
+                additional_link_flag,
+                cache_keys,
+            )
+
+        try:
+            with self.profiler.phase("build", self.test_case_name):
+                built_count = self.__build_sources(gcc_commands, cache_keys)
+        finally:
+            self.__stop_pipeline(
+                stages,
+                stop_event,
+                tasks if single_pass else preprocessed_tasks,
+            )
+        if errors:
+            raise errors[0]
+
+        self.preprocessing_manifest.dump_to_file()
+
+        return built_count
+
+    def __run_pipeline_stage(
+        self,
+        stage: typing.Callable[[queue.Queue, queue.Queue], None],
+        input_queue: typing.Optional[queue.Queue],
+        output_queue: queue.Queue,
+        errors: typing.List[Exception],
+    ) -> None:
+        try:
+            stage(input_queue, output_queue)
+        except Exception as error:  # pylint: disable=broad-except
+            # The error is raised again by the caller's thread, once the
+            # pipeline is drained.
+            errors.append(error)
+        finally:
+            output_queue.put(None)
+
+    def __stop_pipeline(
+        self,
+        stages: typing.List[threading.Thread],
+        stop_event: threading.Event,
+        output_queue: queue.Queue,
+    ) -> None:
+        # If the compilation stopped early, the stages may be blocked on the
+        # full queues, so the last one is drained until they finish.
+        stop_event.set()
+        while any(stage.is_alive() for stage in stages):
+            try:
+                output_queue.get(timeout=PIPELINE_DRAIN_TIMEOUT)
+            except queue.Empty:
+                pass
+
+        for stage in stages:
+            stage.join()
+
+    def __discover_tasks(
+        self,
+        source_filter: SourceFilter,
+        stop_event: threading.Event,
+        _: None,
+        output_queue: queue.Queue,
+    ) -> None:
+        for source in self._discover_sources(source_filter):
+            if stop_event.is_set():
+                return
+
+            output_queue.put(self._create_preprocessing_task(source))
+
+    def __preprocess_tasks(
+        self,
+        stop_event: threading.Event,
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+    ) -> None:
+        batch_size = Configuration.BuildPipeline.PREPROCESSING_BATCH_SIZE
+
+        is_finished = False
+        try:
+            while not is_finished and not stop_event.is_set():
+                # The tasks already waiting are preprocessed together, so
+                # their commands are executed in a single batch.
+                batch = [input_queue.get()]
+                while len(batch) < batch_size and not input_queue.empty():
+                    batch.append(input_queue.get_nowait())
+
+                if batch[-1] is None:
+                    batch.pop()
+                    is_finished = True
+
+                failed_output_files = self._execute_preprocessing_commands(
+                    [command for task in batch for command in task.commands]
+                )
+                for task in batch:
+                    task.is_preprocessed = all(
+                        output_file not in failed_output_files
+                        for output_file, _ in task.commands
+                    )
+                    output_queue.put(task)
+        finally:
+            # The remaining tasks are consumed, so the discovery stage is not
+            # blocked on the full queue.
+            while not is_finished:
+                is_finished = input_queue.get() is None
+
+    def __get_pipelined_builds(
+        self,
+        tasks: queue.Queue,
+        built_ids: typing.Dict[typing.Optional[BuildVariant], typing.Set[str]],
+        rebuild: bool,
+        is_preprocessing_required: bool = True,
+    ) -> typing.Generator[
+        typing.Tuple[PreprocessingTask, typing.Optional[BuildVariant]],
+        None,
+        None,
+    ]:
+        while (task := tasks.get()) is not None:
+            if task.is_new:
+                self.dataset_worker.add_new_source(
+                    task.identifier, task.source.cwes, self.test_case_name
+                )
+
+            if is_preprocessing_required and not task.is_preprocessed:
+                continue
+
+            for variant, variant_built_ids in built_ids.items():
+                if task.identifier not in variant_built_ids or rebuild:
+                    yield task, variant
+
+    def __generate_single_pass_command(
+        self,
+        task: PreprocessingTask,
+        additonal_compile_flags: typing.List[str],
+        additional_link_flags: typing.List[str],
+    ) -> str:
+        folder = os.path.join(
+            Configuration.Assets.MAIN_DATASET_SOURCES, task.identifier
+        )
+        gcc_command = self._generate_single_pass_gcc_command(
+            task, folder, additonal_compile_flags, additional_link_flags
+        )
+
+        # The temporary files are named after the raw sources, so the
+        # preprocessed ones are renamed as in the preprocessing stage.
+        archive_commands = []
+        for output_file, _ in task.commands:
+            filename = os.path.basename(output_file)
+            stem, extension = os.path.splitext(filename)
+            preprocessed_extension = SINGLE_PASS_PREPROCESSED_EXTENSIONS.get(
+                extension, CPP_PREPROCESSED_EXTENSION
+            )
+            archive_commands.append(
+                SINGLE_PASS_ARCHIVE_COMMAND.format(
+                    preprocessed_file=shlex.quote(
+                        stem + preprocessed_extension
+                    ),
+                    archived_file=shlex.quote(filename),
+                    assembly_file=shlex.quote(stem + ".s"),
+                    object_file=shlex.quote(stem + ".o"),
+                )
+            )
 
-        return self.build(
-            additonal_compile_flags, additional_link_flag, rebuild, cwes
+        return SINGLE_PASS_COMMAND.format(
+            folder=shlex.quote(folder),
+            gcc_command=gcc_command,
+            archive_commands=" && ".join(archive_commands) or "true",
         )
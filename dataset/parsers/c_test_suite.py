@@ -2,19 +2,24 @@ import glob
 import os
 import re
 import typing
-import xml.etree.ElementTree as ET
 
+from dataset.build_variant import BuildVariant
 from dataset.configuration import Configuration
+from dataset.manifest_reader import ManifestReader
 from dataset.parsers.base import BaseParser
+from dataset.preprocessing_task import PreprocessingTask
 from dataset.source import Source
+from dataset.source_filter import SourceFilter
 
 DATASET_NAME = "nist_c_test_suite"
 COMPILE_FLAGS = ["-w", "-O0", "-std=gnu99", "-m32"]
 DATASET_FOLDER = "raw_testsuites/nist_c_test_suite/"
 DATASET_SOURCES_FOLDER = DATASET_FOLDER + "sources/"
 DATASET_MANIFEST = DATASET_FOLDER + "manifest.xml"
+MANIFEST_CACHE = (
+    Configuration.Assets.CACHE + "nist_c_test_suite_manifest.jsonl"
+)
 ID_REGEX = r"000\/149\/([0-9]+)"
-CWE_REGEX = r"CWE-([0-9]+)"
 COMMAND_SUPRESS_OUTPUT = " >/dev/null 2>&1"
 GCC_PREPROCESS_COMMAND = (
     "gcc -E {source_file} -I {include_dir} -o {output_file}"
@@ -25,10 +30,16 @@ GCC_BUILD_COMMAND = (
 
 
 class CTestSuiteParser(BaseParser):
-    def __init__(self) -> str:
-        super().__init__(DATASET_NAME, COMPILE_FLAGS)
+    test_case_name = DATASET_NAME
+
+    def __init__(
+        self, jobs: int = Configuration.DatasetCreation.DEFAULT_JOBS
+    ) -> str:
+        super().__init__(DATASET_NAME, COMPILE_FLAGS, jobs=jobs)
 
-    def _get_all_sources(self) -> typing.List[Source]:
+    def _get_all_sources(
+        self, source_filter: SourceFilter = None
+    ) -> typing.List[Source]:
         cwes = self.__get_cwes_from_manifest()
 
         sources = []
@@ -36,6 +47,10 @@ class CTestSuiteParser(BaseParser):
             DATASET_SOURCES_FOLDER + "**/*.c", recursive=True
         ):
             identifier = int(filename.split("/")[-2])
+            if source_filter and not source_filter.matches(
+                self._get_full_identifier(identifier), cwes[identifier]
+            ):
+                continue
 
             source = Source(identifier, filename, cwes[identifier])
             sources.append(source)
@@ -43,66 +58,88 @@ class CTestSuiteParser(BaseParser):
         return sources
 
     def __get_cwes_from_manifest(self) -> dict:
-        tree = ET.parse(DATASET_MANIFEST)
-        root = tree.getroot()
+        manifest_reader = ManifestReader(DATASET_MANIFEST, MANIFEST_CACHE)
 
         cwes = {}
-        for file in root.findall("./testcase/file"):
-            if "language" in file.attrib:
-                groups = re.search(ID_REGEX, file.attrib["path"])
+        for testcase in manifest_reader.get_testcases():
+            for file in testcase:
+                if file.language is None:
+                    continue
+
+                groups = re.search(ID_REGEX, file.path)
                 identifier = int(groups.group(1))
                 if identifier not in cwes:
                     cwes[identifier] = []
 
-                for child in file:
-                    groups = re.search(CWE_REGEX, child.attrib["name"])
-                    cwes[identifier].append(int(groups.group(1)))
+                cwes[identifier].extend(file.cwes)
 
         return cwes
 
-    def preprocess(self) -> None:
-        sources = self._get_all_sources()
-        for source in sources:
-            full_identifier = (
-                self.test_case_name + "_" + str(source.identifier)
-            )
-
-            destination_path = os.path.join(
-                Configuration.Assets.MAIN_DATASET_SOURCES, full_identifier
-            )
-            if not os.path.isdir(destination_path):
-                os.mkdir(destination_path)
-
-                self.dataset_worker.add_new_source(
-                    full_identifier, source.cwes, self.test_case_name
-                )
-
-            source_filename = os.path.basename(source.full_filename)
-            source_folder = os.path.dirname(source.full_filename)
-            destination_file = os.path.join(destination_path, source_filename)
-            gcc_command = GCC_PREPROCESS_COMMAND.format(
-                source_file=source.full_filename,
-                include_dir=source_folder,
-                output_file=destination_file,
-            )
-            self._execute_command(gcc_command)
-
-        self.dataset_worker.dump_to_file()
+    def _create_preprocessing_task(self, source: Source) -> PreprocessingTask:
+        full_identifier = self.test_case_name + "_" + str(source.identifier)
+
+        destination_path = os.path.join(
+            Configuration.Assets.MAIN_DATASET_SOURCES, full_identifier
+        )
+        is_new = not os.path.isdir(destination_path)
+        if is_new:
+            os.mkdir(destination_path)
+
+        source_filename = os.path.basename(source.full_filename)
+        source_folder = os.path.dirname(source.full_filename)
+        destination_file = os.path.join(destination_path, source_filename)
+        gcc_command = GCC_PREPROCESS_COMMAND.format(
+            source_file=source.full_filename,
+            include_dir=source_folder,
+            output_file=destination_file,
+        )
+
+        return PreprocessingTask(
+            full_identifier,
+            source,
+            is_new,
+            [(destination_file, gcc_command)],
+        )
+
+    def _generate_single_pass_gcc_command(
+        self,
+        task: PreprocessingTask,
+        folder: str,
+        additonal_compile_flags: typing.List[str] = None,
+        additional_link_flags: typing.List[str] = None,
+    ) -> str:
+        source_file = task.source.full_filename
+        compile_flags = self.compile_flags + (
+            additonal_compile_flags if additonal_compile_flags else []
+        )
+        compile_flags.extend(
+            ["-I", os.path.relpath(os.path.dirname(source_file), folder)]
+        )
+        link_flags = self.link_flags + (
+            additional_link_flags if additional_link_flags else []
+        )
+
+        return GCC_BUILD_COMMAND.format(
+            compile_flags=" ".join(compile_flags),
+            source_file=os.path.relpath(source_file, folder),
+            link_flags=" ".join(link_flags),
+            output_file=os.path.relpath(
+                self._get_executable_path(task.identifier), folder
+            ),
+        )
 
     def _generate_gcc_command(
         self,
         identifier: str,
         additonal_compile_flags: typing.List[str] = None,
         additional_link_flags: typing.List[str] = None,
+        variant: BuildVariant = None,
     ) -> str:
         source_path = os.path.join(
             Configuration.Assets.MAIN_DATASET_SOURCES, identifier
         )
-        destination_file = os.path.join(
-            Configuration.Assets.MAIN_DATASET_EXECUTABLES,
-            identifier + Configuration.Assets.ELF_EXTENSION,
-        )
-        sources = " ".join(glob.iglob(source_path + "**/*.c"))
+        destination_file = self._get_executable_path(identifier, variant)
+        sources = " ".join(glob.iglob(os.path.join(source_path, "*.c")))
         compile_flags = self.compile_flags + (
             additonal_compile_flags if additonal_compile_flags else []
         )
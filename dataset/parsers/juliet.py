@@ -1,13 +1,19 @@
 import glob
+import hashlib
+import logging
 import os
 import re
 import shutil
 import typing
-import xml.etree.ElementTree as ET
 
+from dataset.build_variant import BuildVariant
 from dataset.configuration import Configuration
+from dataset.filename_index import FilenameIndex
+from dataset.manifest_reader import ManifestReader
 from dataset.parsers.base import BaseParser
+from dataset.preprocessing_task import PreprocessingTask
 from dataset.source import Source
+from dataset.source_filter import SourceFilter
 
 DATASET_NAME = "nist_juliet"
 DATASET_FOLDER = "raw_testsuites/nist_juliet/"
@@ -15,11 +21,12 @@ DATASET_SOURCES_FOLDER = DATASET_FOLDER + "testcases/"
 DATASET_HEADER_FOLDER = DATASET_FOLDER + "testcasesupport/"
 COMPILE_FLAGS = ["-w", "-O0"]
 
-CWE_REGEX = r"CWE-([0-9]+)"
 W32_REGEX = r"w32"
 MAIN_DATASET_HEADERS = Configuration.Assets.MAIN_DATASET_SOURCES + "nist_lib/"
 
 DATASET_MANIFEST = DATASET_FOLDER + "manifest.xml"
+SOURCES_INDEX = Configuration.Assets.CACHE + "nist_juliet_sources.json"
+MANIFEST_CACHE = Configuration.Assets.CACHE + "nist_juliet_manifest.jsonl"
 
 COMMAND_SUPRESS_OUTPUT = " >/dev/null 2>&1"
 GCC_PREPROCESS_COMMAND = (
@@ -28,23 +35,17 @@ GCC_PREPROCESS_COMMAND = (
 GPP_PREPROCESS_COMMAND = (
     "g++ -E {} -O0 -DOMITGOOD -DINCLUDEMAIN -I{}              -o {}"
 )
-GCC_BUILD_COMMAND = "gcc -x  c  {} {} {} -o {} -lpthread -lm "
-GPP_BUILD_COMMAND = "g++ -x c++ {} {} {} -o {} -lpthread -lm "
-
-ADITIOAL_GCC_SOURCES = (
-    " "
-    + MAIN_DATASET_HEADERS
-    + "io.c "
-    + MAIN_DATASET_HEADERS
-    + "std_thread.c "
-)
-ADITIOAL_GPP_SOURCES = (
-    " "
-    + MAIN_DATASET_HEADERS
-    + "io.cpp "
-    + MAIN_DATASET_HEADERS
-    + "std_thread.cpp "
-)
+SINGLE_PASS_PREPROCESSING_FLAGS = "-DOMITGOOD -DINCLUDEMAIN -I{}"
+GCC_BUILD_COMMAND = "gcc -x  c  {} {} -x none {} {} -o {} -lpthread -lm "
+GPP_BUILD_COMMAND = "g++ -x c++ {} {} -x none {} {} -o {} -lpthread -lm "
+
+# The support library is compiled only once for each set of compile flags,
+# into objects that are then linked into each executable.
+SUPPORT_SOURCES = ["io", "std_thread"]
+SUPPORT_OBJECTS_FOLDER = Configuration.Assets.CACHE + "nist_lib/"
+SUPPORT_OBJECT_EXTENSION = ".o"
+GCC_SUPPORT_OBJECT_COMMAND = "gcc -x  c  {} -c {} -o {}"
+GPP_SUPPORT_OBJECT_COMMAND = "g++ -x c++ {} -c {} -o {}"
 
 
 class DatasetException(Exception):
@@ -61,130 +62,201 @@ class DatasetException(Exception):
 
 
 class CNistJulietParser(BaseParser):
+    test_case_name = DATASET_NAME
     _current_id: int
 
-    def __init__(self) -> str:
-        super().__init__(DATASET_NAME, COMPILE_FLAGS)
+    def __init__(
+        self, jobs: int = Configuration.DatasetCreation.DEFAULT_JOBS
+    ) -> str:
+        super().__init__(DATASET_NAME, COMPILE_FLAGS, jobs=jobs)
 
-    def preprocess(self) -> None:
-        """Preprocess the sources from the current test suite."""
+    def _prepare_preprocessing(self) -> None:
+        """Copies the headers and preprocesses the support library."""
         if not os.path.isdir(MAIN_DATASET_HEADERS):
             os.mkdir(MAIN_DATASET_HEADERS)
         for file in glob.iglob(DATASET_HEADER_FOLDER + "*.h"):
             source_filename = os.path.basename(file)
-            shutil.copy(file, MAIN_DATASET_HEADERS + source_filename)
+            self.__copy_if_changed(
+                file, MAIN_DATASET_HEADERS + source_filename
+            )
 
+        gcc_commands = []
         for file in glob.iglob(DATASET_HEADER_FOLDER + "*.c"):
             source_filename = os.path.basename(file)
-            gcc_command = GCC_PREPROCESS_COMMAND.format(
-                file,
-                MAIN_DATASET_HEADERS,
-                MAIN_DATASET_HEADERS + source_filename,
+            destination_file = MAIN_DATASET_HEADERS + source_filename
+            gcc_commands.append(
+                (
+                    destination_file,
+                    GCC_PREPROCESS_COMMAND.format(
+                        file, MAIN_DATASET_HEADERS, destination_file
+                    ),
+                )
             )
-            self._execute_command(gcc_command)
-            gcc_command = GPP_PREPROCESS_COMMAND.format(
-                file,
-                MAIN_DATASET_HEADERS,
-                MAIN_DATASET_HEADERS + source_filename + "pp",
+            gcc_commands.append(
+                (
+                    destination_file + "pp",
+                    GPP_PREPROCESS_COMMAND.format(
+                        file, MAIN_DATASET_HEADERS, destination_file + "pp"
+                    ),
+                )
             )
-            self._execute_command(gcc_command)
+        self._execute_preprocessing_commands(gcc_commands)
 
-        for source in self._get_all_sources():
-            # Create the source full ID (from the name of the dataset and the
-            # ID of the source)
-            full_identifier = DATASET_NAME + "_" + str(source.identifier)
+    def _create_preprocessing_task(self, source: Source) -> PreprocessingTask:
+        # Create the source full ID (from the name of the dataset and the ID
+        # of the source)
+        full_identifier = DATASET_NAME + "_" + str(source.identifier)
 
-            # Create the destination folder
-            destination_path = os.path.join(
-                Configuration.Assets.MAIN_DATASET_SOURCES, full_identifier
-            )
-            if not os.path.isdir(destination_path):
-                os.mkdir(destination_path)
+        # Create the destination folder
+        destination_path = os.path.join(
+            Configuration.Assets.MAIN_DATASET_SOURCES, full_identifier
+        )
+        is_new = not os.path.isdir(destination_path)
+        if is_new:
+            os.mkdir(destination_path)
 
-            for source_complete_filename in source.additional_files:
-                # Preprocess
+        gcc_commands = []
+        for source_complete_filename in source.additional_files:
+            # Preprocess
 
-                source_filename = os.path.basename(source_complete_filename)
-                source_folder = os.path.dirname(source_filename)
-                destination_file = os.path.join(
-                    destination_path, source_filename
-                )
+            source_filename = os.path.basename(source_complete_filename)
+            destination_file = os.path.join(destination_path, source_filename)
 
-                # If .h just copy else use g++ or gcc
+            # If .h just copy else use g++ or gcc
 
-                file_extension = os.path.splitext(source_complete_filename)[1]
-                gcc_command = ""
-                if file_extension == ".h":
-                    shutil.copy(
+            file_extension = os.path.splitext(source_complete_filename)[1]
+            if file_extension == ".h":
+                self.__copy_if_changed(
+                    source_complete_filename,
+                    MAIN_DATASET_HEADERS + source_filename,
+                )
+            else:
+                if file_extension == ".c":
+                    gcc_command = GCC_PREPROCESS_COMMAND.format(
                         source_complete_filename,
-                        MAIN_DATASET_HEADERS + source_filename,
+                        MAIN_DATASET_HEADERS,
+                        destination_file,
                     )
                 else:
-                    if file_extension == ".c":
-                        gcc_command = GCC_PREPROCESS_COMMAND.format(
-                            source_complete_filename,
-                            MAIN_DATASET_HEADERS,
-                            destination_file,
-                        )
-                    else:
-                        gcc_command = GPP_PREPROCESS_COMMAND.format(
-                            source_complete_filename,
-                            MAIN_DATASET_HEADERS,
-                            destination_file,
-                        )
-
-                    self._execute_command(gcc_command)
-
-            self.dataset_worker.add_new_source(
-                full_identifier, source.cwes, DATASET_NAME
-            )
+                    gcc_command = GPP_PREPROCESS_COMMAND.format(
+                        source_complete_filename,
+                        MAIN_DATASET_HEADERS,
+                        destination_file,
+                    )
 
-        # Dump the dataset
-        self.dataset_worker.dump_to_file()
+                gcc_commands.append((destination_file, gcc_command))
 
-    def _get_all_sources(self) -> typing.Generator[Source, None, None]:
+        return PreprocessingTask(full_identifier, source, is_new, gcc_commands)
+
+    def __copy_if_changed(self, source: str, destination: str) -> None:
+        # The copies keep the modification time of the original files, so the
+        # unchanged headers don't invalidate the preprocessed sources including
+        # them.
+        if os.path.isfile(destination):
+            source_stat = os.stat(source)
+            destination_stat = os.stat(destination)
+
+            if (
+                source_stat.st_size == destination_stat.st_size
+                and source_stat.st_mtime_ns == destination_stat.st_mtime_ns
+            ):
+                return
+
+        shutil.copy2(source, destination)
+
+    def _get_all_sources(
+        self, source_filter: SourceFilter = None
+    ) -> typing.Generator[Source, None, None]:
         # Parse the manifest to get the CWEs
 
         self._current_id = 1
-        tree = ET.parse(DATASET_MANIFEST)
-        root = tree.getroot()
-        cwes = {}
-        sources = []
-        for testcase in root.findall("./testcase"):
+        manifest_reader = ManifestReader(DATASET_MANIFEST, MANIFEST_CACHE)
+        sources_index = FilenameIndex(DATASET_SOURCES_FOLDER, SOURCES_INDEX)
+        for testcase in manifest_reader.get_testcases():
             try:
                 filePaths = []
                 identifier = self._current_id
+                cwes = []
 
-                if identifier not in cwes:
-                    cwes[identifier] = []
-
-                for file in testcase.findall("./file"):
-                    if re.search(W32_REGEX, file.attrib["path"]):
+                for file in testcase:
+                    if re.search(W32_REGEX, file.path):
                         # Means it is a W32 exe, skip
-                        # print("Skipped " + file.attrib["path"])
+                        # print("Skipped " + file.path)
                         raise Exception("W32 source file")
-                    filePath = glob.iglob(
-                        DATASET_SOURCES_FOLDER + "**/" + file.attrib["path"],
-                        recursive=True,
-                    )
-                    filePaths.append(next(filePath))
+                    filePath = sources_index.resolve(file.path)
+                    if filePath is None:
+                        raise Exception("Missing source file")
+                    filePaths.append(filePath)
 
-                    for child in file:
-                        groups = re.search(CWE_REGEX, child.attrib["name"])
-                        cwes[identifier].append(int(groups.group(1)))
+                    cwes.extend(file.cwes)
 
                 self._current_id += 1
-                source = Source(identifier, "", cwes[identifier], filePaths)
+                if source_filter and not source_filter.matches(
+                    self._get_full_identifier(identifier), cwes
+                ):
+                    continue
+
+                source = Source(identifier, "", cwes, filePaths)
 
                 yield source
             except Exception as e:
                 pass
 
+    def _generate_single_pass_gcc_command(
+        self,
+        task: PreprocessingTask,
+        folder: str,
+        additonal_compile_flags: typing.List[str] = None,
+        additional_link_flags: typing.List[str] = None,
+    ) -> str:
+        sources = [
+            os.path.relpath(filename, folder)
+            for filename in task.source.additional_files
+            if os.path.splitext(filename)[1] != ".h"
+        ]
+        binary_type = os.path.splitext(sources[-1])[1]
+
+        # The support objects are the ones compiled with the compile flags
+        # only, without the preprocessing ones.
+        compile_flags = " ".join(
+            self.compile_flags
+            + (additonal_compile_flags if additonal_compile_flags else [])
+        )
+        link_flags = " ".join(
+            self.link_flags
+            + (additional_link_flags if additional_link_flags else [])
+        )
+        preprocessing_flags = SINGLE_PASS_PREPROCESSING_FLAGS.format(
+            os.path.relpath(MAIN_DATASET_HEADERS, folder)
+        )
+        destination_file = os.path.relpath(
+            self._get_executable_path(task.identifier), folder
+        )
+
+        if binary_type == ".c":
+            support_objects = self.__get_support_objects(compile_flags, ".c")
+            build_command = GCC_BUILD_COMMAND
+        else:
+            support_objects = self.__get_support_objects(compile_flags, ".cpp")
+            build_command = GPP_BUILD_COMMAND
+
+        return build_command.format(
+            compile_flags + " " + preprocessing_flags,
+            " ".join(sources),
+            " ".join(
+                os.path.relpath(support_object, folder)
+                for support_object in support_objects.values()
+            ),
+            link_flags,
+            destination_file,
+        )
+
     def _generate_gcc_command(
         self,
         identifier,
         additonal_compile_flags: typing.List[str] = [],
         additional_link_flags: typing.List[str] = [],
+        variant: BuildVariant = None,
     ) -> str:
         """Get the gcc_command string needed to preprocess the cuurrent source
 
@@ -194,6 +266,8 @@ class CNistJulietParser(BaseParser):
                 compile flags. Defaults to [].
             additional_link_flag (typing.List[str], optional): User-provided
                 link flags. Defaults to [].
+            variant (BuildVariant, optional): Variant in which the executable
+                is built. Defaults to None.
 
         Raises:
             NotImplementedError: Method to be implemented in the child classes
@@ -208,10 +282,7 @@ class CNistJulietParser(BaseParser):
         source_path = os.path.join(
             Configuration.Assets.MAIN_DATASET_SOURCES, identifier
         )
-        destination_file = os.path.join(
-            Configuration.Assets.MAIN_DATASET_EXECUTABLES,
-            identifier + Configuration.Assets.ELF_EXTENSION,
-        )
+        destination_file = self._get_executable_path(identifier, variant)
         sources = " ".join(glob.iglob(source_path + "/**"))
 
         binary_type = os.path.splitext(sources.split(" ")[-1])[1]
@@ -227,19 +298,101 @@ class CNistJulietParser(BaseParser):
         gcc_command = ""
 
         if binary_type == ".c":
+            support_objects = self.__get_support_objects(compile_flags, ".c")
             gcc_command = GCC_BUILD_COMMAND.format(
                 compile_flags,
-                sources + ADITIOAL_GCC_SOURCES,
+                sources,
+                " ".join(support_objects.values()),
                 link_flags,
                 destination_file,
             )
         else:
+            support_objects = self.__get_support_objects(compile_flags, ".cpp")
             gcc_command = GPP_BUILD_COMMAND.format(
                 compile_flags,
-                sources + ADITIOAL_GPP_SOURCES,
+                sources,
+                " ".join(support_objects.values()),
                 link_flags,
                 destination_file,
             )
 
         return gcc_command
-        return gcc_command
+
+    def _prepare_build(
+        self,
+        additonal_compile_flags: typing.List[str] = None,
+        additional_link_flags: typing.List[str] = None,
+    ) -> None:
+        """Compiles the support library with the given compile flags.
+
+        Args:
+            additonal_compile_flags (typing.List[str], optional): User-provided
+                compile flags. Defaults to None.
+            additional_link_flags (typing.List[str], optional): User-provided
+                link flags. Defaults to None.
+        """
+        compile_flags = " ".join(
+            self.compile_flags
+            + (additonal_compile_flags if additonal_compile_flags else [])
+        )
+
+        gcc_commands = []
+        for extension, command in [
+            (".c", GCC_SUPPORT_OBJECT_COMMAND),
+            (".cpp", GPP_SUPPORT_OBJECT_COMMAND),
+        ]:
+            support_objects = self.__get_support_objects(
+                compile_flags, extension
+            )
+            os.makedirs(
+                os.path.dirname(next(iter(support_objects.values()))),
+                exist_ok=True,
+            )
+
+            for support_source, support_object in support_objects.items():
+                if self.__is_support_object_up_to_date(
+                    support_source, support_object
+                ):
+                    continue
+
+                gcc_commands.append(
+                    command.format(
+                        compile_flags, support_source, support_object
+                    )
+                )
+
+        exit_codes = self._execute_commands(gcc_commands, "support_objects")
+        for gcc_command, exit_code in zip(gcc_commands, exit_codes):
+            if exit_code != 0:
+                logging.log(
+                    logging.ERROR,
+                    f'The support library command "{gcc_command}" failed.',
+                )
+
+    def __get_support_objects(
+        self, compile_flags: str, extension: str
+    ) -> typing.Dict[str, str]:
+        flags_digest = hashlib.sha1(
+            (self.compiler.image_digest + ":" + compile_flags).encode("utf-8")
+        ).hexdigest()
+        objects_folder = os.path.join(SUPPORT_OBJECTS_FOLDER, flags_digest)
+
+        support_objects = {}
+        for support_source in SUPPORT_SOURCES:
+            support_filename = support_source + extension
+            support_objects[
+                MAIN_DATASET_HEADERS + support_filename
+            ] = os.path.join(
+                objects_folder, support_filename + SUPPORT_OBJECT_EXTENSION
+            )
+
+        return support_objects
+
+    def __is_support_object_up_to_date(
+        self, support_source: str, support_object: str
+    ) -> bool:
+        return (
+            os.path.isfile(support_object)
+            and os.stat(support_object).st_mtime_ns
+            >= os.stat(support_source).st_mtime_ns
+        )
@@ -2,9 +2,12 @@ import glob
 import os
 import typing
 
+from dataset.build_variant import BuildVariant
 from dataset.configuration import Configuration
 from dataset.parsers.base import BaseParser
+from dataset.preprocessing_task import PreprocessingTask
 from dataset.source import Source
+from dataset.source_filter import SourceFilter
 
 DATASET_NAME = "toy_test_suite"
 COMPILE_FLAGS = ["-no-pie", "-O0", "-std=gnu99", "-m32"]
@@ -19,21 +22,31 @@ GCC_BUILD_COMMAND = (
 
 
 class ToyTestSuiteParser(BaseParser):
-    def __init__(self) -> str:
-        super().__init__(DATASET_NAME, COMPILE_FLAGS)
+    test_case_name = DATASET_NAME
+
+    def __init__(
+        self, jobs: int = Configuration.DatasetCreation.DEFAULT_JOBS
+    ) -> str:
+        super().__init__(DATASET_NAME, COMPILE_FLAGS, jobs=jobs)
+
+    def _get_all_sources(
+        self, source_filter: SourceFilter = None
+    ) -> typing.Generator[Source, None, None]:
+        for identifier, directory in enumerate(os.listdir(DATASET_FOLDER)):
+            if source_filter and not source_filter.matches_identifier(
+                self._get_full_identifier(identifier)
+            ):
+                continue
 
-    def _get_all_sources(self) -> typing.Generator[Source, None, None]:
-        identifier = 0
-        for directory in os.listdir(DATASET_FOLDER):
             full_path_dir = os.path.join(DATASET_FOLDER, directory)
             source_filename = os.path.join(full_path_dir, "source.c")
             cwe = self.__get_cwe_from_source_folder(full_path_dir)
+            if source_filter and not source_filter.matches_cwes([cwe]):
+                continue
 
             source = Source(str(identifier), source_filename, [cwe])
             yield source
 
-            identifier += 1
-
     def __get_cwe_from_source_folder(self, source_folder: str) -> int:
         cwe_filename = os.path.join(source_folder, "cwe.txt")
 
@@ -46,33 +59,30 @@ class ToyTestSuiteParser(BaseParser):
             else:
                 return -1
 
-    def preprocess(self) -> None:
-        sources = self._get_all_sources()
-        for source in sources:
-            full_identifier = self.__get_source_full_id(source.identifier)
-            destination_folder = (
-                self.__get_destination_location_for_preprocessed_source(source)
-            )
-            if not os.path.isdir(destination_folder):
-                os.mkdir(destination_folder)
-
-                self.dataset_worker.add_new_source(
-                    full_identifier, source.cwes, self.test_case_name
-                )
-
-            source_filename = os.path.basename(source.full_filename)
-            source_folder = os.path.dirname(source.full_filename)
-            destination_file = os.path.join(
-                destination_folder, source_filename
-            )
-            gcc_command = GCC_PREPROCESS_COMMAND.format(
-                source_file=source.full_filename,
-                include_dir=source_folder,
-                output_file=destination_file,
-            )
-            self._execute_command(gcc_command)
-
-        self.dataset_worker.dump_to_file()
+    def _create_preprocessing_task(self, source: Source) -> PreprocessingTask:
+        full_identifier = self.__get_source_full_id(source.identifier)
+        destination_folder = (
+            self.__get_destination_location_for_preprocessed_source(source)
+        )
+        is_new = not os.path.isdir(destination_folder)
+        if is_new:
+            os.mkdir(destination_folder)
+
+        source_filename = os.path.basename(source.full_filename)
+        source_folder = os.path.dirname(source.full_filename)
+        destination_file = os.path.join(destination_folder, source_filename)
+        gcc_command = GCC_PREPROCESS_COMMAND.format(
+            source_file=source.full_filename,
+            include_dir=source_folder,
+            output_file=destination_file,
+        )
+
+        return PreprocessingTask(
+            full_identifier,
+            source,
+            is_new,
+            [(destination_file, gcc_command)],
+        )
 
     def __get_destination_location_for_preprocessed_source(
         self, source: Source
@@ -86,20 +96,45 @@ class ToyTestSuiteParser(BaseParser):
     def __get_source_full_id(self, identifier: int) -> None:
         return self.test_case_name + "_" + str(identifier)
 
+    def _generate_single_pass_gcc_command(
+        self,
+        task: PreprocessingTask,
+        folder: str,
+        additonal_compile_flags: typing.List[str] = None,
+        additional_link_flags: typing.List[str] = None,
+    ) -> str:
+        source_file = task.source.full_filename
+        compile_flags = self.compile_flags + (
+            additonal_compile_flags if additonal_compile_flags else []
+        )
+        compile_flags.extend(
+            ["-I", os.path.relpath(os.path.dirname(source_file), folder)]
+        )
+        link_flags = self.link_flags + (
+            additional_link_flags if additional_link_flags else []
+        )
+
+        return GCC_BUILD_COMMAND.format(
+            compile_flags=" ".join(compile_flags),
+            source_file=os.path.relpath(source_file, folder),
+            link_flags=" ".join(link_flags),
+            output_file=os.path.relpath(
+                self._get_executable_path(task.identifier), folder
+            ),
+        )
+
     def _generate_gcc_command(
         self,
         identifier: str,
         additonal_compile_flags: typing.List[str] = None,
         additional_link_flags: typing.List[str] = None,
+        variant: BuildVariant = None,
     ) -> str:
         source_path = os.path.join(
             Configuration.Assets.MAIN_DATASET_SOURCES, identifier
         )
-        destination_file = os.path.join(
-            Configuration.Assets.MAIN_DATASET_EXECUTABLES,
-            identifier + Configuration.Assets.ELF_EXTENSION,
-        )
-        sources = " ".join(glob.iglob(source_path + "**/*.c"))
+        destination_file = self._get_executable_path(identifier, variant)
+        sources = " ".join(glob.iglob(os.path.join(source_path, "*.c")))
         compile_flags = self.compile_flags + (
             additonal_compile_flags if additonal_compile_flags else []
         )
@@ -1,18 +1,53 @@
 import typing
 
+from dataset.build_variant import BuildVariant
+from dataset.compilers import BaseCompiler
+from dataset.configuration import Configuration
 from dataset.parsers import AvailableTestSuites, BaseParser
+from dataset.sharding import IndexFragment, Shard
+from dataset.vulnerable_executables_index import VulnerableExecutablesIndex
 
 
 class ParsersManager:
     _parsers: typing.List[BaseParser]
+    _jobs: int
+    _compiler: typing.Optional[BaseCompiler]
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        jobs: int = Configuration.DatasetCreation.DEFAULT_JOBS,
+        compiler: BaseCompiler = None,
+    ) -> None:
+        """Initializes a ParsersManager instance.
+
+        Args:
+            jobs (int, optional): Number of compiler commands executed in
+                parallel. Defaults to DEFAULT_JOBS.
+            compiler (BaseCompiler, optional): Compiler used by all
+                the parsers, instead of the one they create. Defaults to None.
+        """
         self._parsers = []
+        self._jobs = jobs
+        self._compiler = compiler
 
     def add_testsuite(self, testsuite: AvailableTestSuites) -> None:
-        parser = testsuite.value()
+        parser = testsuite.value(self._jobs)
+        if self._compiler is not None:
+            parser.compiler = self._compiler
+
         self._parsers.append(parser)
 
+    def get_build_cache_statistics(self) -> typing.Tuple[int, int]:
+        """Gets the build cache hits and misses of all the parsers.
+
+        Returns:
+            typing.Tuple[int, int]: Number of hits and number of misses
+        """
+        hits = sum(parser.build_cache.hits for parser in self._parsers)
+        misses = sum(parser.build_cache.misses for parser in self._parsers)
+
+        return hits, misses
+
     def preprocess_all(self) -> None:
         for parser in self._parsers:
             parser.preprocess()
@@ -21,12 +56,20 @@ class ParsersManager:
         self,
         additonal_compile_flags: typing.List[str] = None,
         additional_link_flag: typing.List[str] = None,
+        rebuild: bool = False,
         cwes: typing.List[int] = None,
+        shard: Shard = None,
+        identifiers: typing.List[str] = None,
     ) -> int:
         sources_count = 0
         for parser in self._parsers:
             sources_count += parser.build(
-                additonal_compile_flags, additional_link_flag, cwes
+                additonal_compile_flags,
+                additional_link_flag,
+                rebuild,
+                cwes,
+                shard,
+                identifiers,
             )
 
         return sources_count
@@ -37,11 +80,40 @@ class ParsersManager:
         additional_link_flag: typing.List[str] = None,
         rebuild: bool = False,
         cwes: typing.List[int] = None,
+        shard: Shard = None,
+        single_pass: bool = False,
+        identifiers: typing.List[str] = None,
+        variants: typing.List[BuildVariant] = None,
     ) -> int:
         sources_count = 0
         for parser in self._parsers:
             sources_count += parser.preprocess_and_build(
-                additonal_compile_flags, additional_link_flag, rebuild, cwes
+                additonal_compile_flags,
+                additional_link_flag,
+                rebuild,
+                cwes,
+                shard,
+                single_pass,
+                identifiers,
+                variants,
             )
 
         return sources_count
+
+    def export_fragment(self, shard: Shard, fragment: IndexFragment) -> int:
+        """Exports the entries of a shard, built by all the parsers.
+
+        Args:
+            shard (Shard): Built shard
+            fragment (IndexFragment): Fragment in which the entries are
+                exported
+
+        Returns:
+            int: Number of exported executables
+        """
+        index = VulnerableExecutablesIndex(
+            Configuration.DatasetCreation.DATASET_NAME, read_only=True
+        )
+        datasets = [parser.test_case_name for parser in self._parsers]
+
+        return fragment.export(shard, datasets, index)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import typing
+
+from dataset.configuration import Configuration
+
+DEPENDENCIES_EXTENSION = ".d"
+DEPENDENCIES_SEPARATOR_REGEX = r"(?<!\\)\s+"
+
+
+class PreprocessingManifest:
+    """Manifest of the inputs from which each preprocessed file was created.
+
+    For each preprocessed file, the manifest stores the command that created
+    it and the modification time and size of its inputs, namely the source
+    and the headers it includes, as listed by the dependencies file written
+    by gcc. A file needs to be preprocessed again only if one of them changed.
+    """
+
+    _filename: str
+    _entries: typing.Dict[str, dict]
+
+    def __init__(self, test_suite_name: str, image_digest: str) -> None:
+        self._filename = os.path.join(
+            Configuration.PreprocessingManifest.FOLDER,
+            test_suite_name + ".json",
+        )
+        self._image_digest = image_digest
+
+        try:
+            with open(self._filename, "r", encoding="utf-8") as manifest:
+                self._entries = json.load(manifest)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def get_dependencies_filename(self, output_file: str) -> str:
+        """Gets the file in which gcc writes the dependencies of an output.
+
+        Args:
+            output_file (str): Preprocessed file
+
+        Returns:
+            str: Path to the dependencies file
+        """
+        digest = hashlib.sha1(output_file.encode("utf-8")).hexdigest()
+
+        return os.path.join(
+            Configuration.PreprocessingManifest.DEPENDENCIES_FOLDER,
+            digest + DEPENDENCIES_EXTENSION,
+        )
+
+    def is_up_to_date(self, output_file: str, command: str) -> bool:
+        """Checks if a preprocessed file needs to be created again.
+
+        Args:
+            output_file (str): Preprocessed file
+            command (str): Command creating the preprocessed file
+
+        Returns:
+            bool: Boolean indicating if the inputs are unchanged
+        """
+        entry = self._entries.get(output_file)
+        if not entry or not os.path.isfile(output_file):
+            return False
+
+        if entry["command"] != self.__get_command_fingerprint(command):
+            return False
+
+        for input_file, state in entry["inputs"].items():
+            if self.__get_file_state(input_file) != state:
+                return False
+
+        return True
+
+    def record(self, output_file: str, command: str) -> None:
+        """Records the inputs of a newly preprocessed file.
+
+        Args:
+            output_file (str): Preprocessed file
+            command (str): Command that created the preprocessed file
+        """
+        dependencies = self.__read_dependencies(output_file)
+        if not dependencies:
+            self._entries.pop(output_file, None)
+
+            return
+
+        inputs = {}
+        for input_file in dependencies:
+            # The system headers, having absolute paths, belong to the
+            # compiler image, which is already part of the command's
+            # fingerprint.
+            if os.path.isabs(input_file):
+                continue
+
+            if state := self.__get_file_state(input_file):
+                inputs[input_file] = state
+
+        self._entries[output_file] = {
+            "command": self.__get_command_fingerprint(command),
+            "inputs": inputs,
+        }
+
+    def dump_to_file(self) -> None:
+        os.makedirs(os.path.dirname(self._filename), exist_ok=True)
+
+        # Each process writes its own temporary file, which is then moved in
+        # place atomically, so concurrent builds don't clash.
+        file_descriptor, temporary_filename = tempfile.mkstemp(
+            dir=os.path.dirname(self._filename)
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as manifest:
+                json.dump(self._entries, manifest)
+            os.replace(temporary_filename, self._filename)
+        except BaseException:
+            os.remove(temporary_filename)
+
+            raise
+
+    def __get_command_fingerprint(self, command: str) -> str:
+        return self._image_digest + ":" + command
+
+    def __get_file_state(self, filename: str) -> typing.Optional[list]:
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def __read_dependencies(self, output_file: str) -> typing.List[str]:
+        try:
+            with open(
+                self.get_dependencies_filename(output_file),
+                "r",
+                encoding="utf-8",
+            ) as dependencies_file:
+                content = dependencies_file.read()
+        except FileNotFoundError:
+            return []
+
+        # The first element is the target of the Makefile rule.
+        content = content.replace("\\\n", " ")
+        _, _, dependencies = content.partition(": ")
+        dependencies = re.split(DEPENDENCIES_SEPARATOR_REGEX, dependencies)
+
+        return [
+            dependency.replace("\\ ", " ")
+            for dependency in dependencies
+            if dependency
+        ]
@@ -0,0 +1,35 @@
+import typing
+
+from dataset.source import Source
+
+
+class PreprocessingTask:
+    """Preprocessing of a single testcase of a test suite.
+
+    Attributes:
+        identifier: Full ID of the testcase, as stored in the index
+        source: Discovered source of the testcase
+        is_new: Boolean indicating if the testcase was not preprocessed
+            before, case in which it still needs to be added to the index
+        commands: Pairs of output files and commands creating them
+        is_preprocessed: Boolean indicating if all the commands succeeded
+    """
+
+    identifier: str
+    source: Source
+    is_new: bool
+    commands: typing.List[typing.Tuple[str, str]]
+    is_preprocessed: bool
+
+    def __init__(
+        self,
+        identifier: str,
+        source: Source,
+        is_new: bool,
+        commands: typing.List[typing.Tuple[str, str]] = None,
+    ) -> None:
+        self.identifier = identifier
+        self.source = source
+        self.is_new = is_new
+        self.commands = commands if commands else []
+        self.is_preprocessed = False
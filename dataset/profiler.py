@@ -0,0 +1,234 @@
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+import typing
+
+COMMAND_PHASES = ["gcc_preprocess", "support_objects", "gcc_build"]
+SLOWEST_PHASE = "gcc_build"
+PERCENTILES = [50, 90, 99]
+MICROSECONDS_IN_SECOND = 1_000_000
+
+Span = typing.Tuple[str, float, float, int, typing.Optional[str]]
+
+
+class Profiler:
+    """Collector of the durations of the build phases.
+
+    Each span has the name of its phase, its start and duration, the thread
+    running it and optionally the testcase or file it belongs to. The
+    profiler is shared by the whole process and it is disabled by default,
+    case in which the spans are not recorded at all.
+    """
+
+    _shared_profiler: "Profiler" = None
+    _shared_profiler_lock = threading.Lock()
+
+    is_enabled: bool
+    _spans: typing.List[Span]
+    _start: float
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.is_enabled = False
+        self._spans = []
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_shared(cls) -> "Profiler":
+        """Gets the profiler of the current process.
+
+        Returns:
+            Profiler: Shared profiler
+        """
+        with cls._shared_profiler_lock:
+            if cls._shared_profiler is None:
+                cls._shared_profiler = cls()
+
+        return cls._shared_profiler
+
+    def enable(self) -> None:
+        with self._lock:
+            self.is_enabled = True
+            self._spans = []
+            self._start = time.monotonic()
+
+    @contextlib.contextmanager
+    def phase(
+        self, name: str, identifier: str = None
+    ) -> typing.Generator[None, None, None]:
+        """Measures the code executed inside the context as a span.
+
+        Args:
+            name (str): Name of the phase
+            identifier (str, optional): Testcase or file to which the span
+                belongs. Defaults to None.
+        """
+        if not self.is_enabled:
+            yield
+
+            return
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.monotonic() - start, identifier)
+
+    def record(
+        self,
+        name: str,
+        start: float,
+        duration: float,
+        identifier: str = None,
+    ) -> None:
+        """Adds a span measured by the caller.
+
+        Args:
+            name (str): Name of the phase
+            start (float): Start of the span, as returned by time.monotonic()
+            duration (float): Duration of the span, in seconds
+            identifier (str, optional): Testcase or file to which the span
+                belongs. Defaults to None.
+        """
+        if not self.is_enabled:
+            return
+
+        span = (name, start, duration, threading.get_ident(), identifier)
+        with self._lock:
+            self._spans.append(span)
+
+    def profile_iterator(
+        self, name: str, iterable: typing.Iterable
+    ) -> typing.Generator[typing.Any, None, None]:
+        """Measures the time spent producing the elements of an iterable.
+
+        The time spent by the consumer between the elements is excluded, and
+        the whole iteration is recorded as a single span.
+
+        Args:
+            name (str): Name of the phase
+            iterable (typing.Iterable): Iterable whose elements are produced
+                lazily
+
+        Yields:
+            typing.Any: Elements of the iterable
+        """
+        if not self.is_enabled:
+            yield from iterable
+
+            return
+
+        iterator = iter(iterable)
+        first_start = time.monotonic()
+        duration = 0
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    element = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    duration += time.monotonic() - start
+
+                yield element
+        finally:
+            self.record(name, first_start, duration)
+
+    def get_report(self, slowest_count: int = 10) -> dict:
+        """Aggregates the spans recorded since the profiler was enabled.
+
+        Args:
+            slowest_count (int, optional): Number of slowest testcases to
+                report. Defaults to 10.
+
+        Returns:
+            dict: Wall time, commands per second, per-phase statistics and
+                slowest testcases
+        """
+        with self._lock:
+            spans = list(self._spans)
+        wall_time = time.monotonic() - self._start
+
+        durations_by_phase = {}
+        for name, _, duration, _, _ in spans:
+            durations_by_phase.setdefault(name, []).append(duration)
+
+        phases = {}
+        for name, durations in durations_by_phase.items():
+            durations.sort()
+            phases[name] = {
+                "count": len(durations),
+                "total": sum(durations),
+                **{
+                    f"p{percentile}": self.__get_percentile(
+                        durations, percentile
+                    )
+                    for percentile in PERCENTILES
+                },
+                "max": durations[-1],
+            }
+
+        commands_count = sum(
+            phases[name]["count"] for name in COMMAND_PHASES if name in phases
+        )
+        slowest_spans = sorted(
+            (
+                (duration, identifier)
+                for name, _, duration, _, identifier in spans
+                if name == SLOWEST_PHASE
+            ),
+            reverse=True,
+        )[:slowest_count]
+
+        return {
+            "wall_time": wall_time,
+            "commands_per_second": (
+                commands_count / wall_time if wall_time else 0
+            ),
+            "phases": phases,
+            "slowest_testcases": [
+                {"id": identifier, "duration": duration}
+                for duration, identifier in slowest_spans
+            ],
+        }
+
+    def __get_percentile(
+        self, sorted_durations: typing.List[float], percentile: int
+    ) -> float:
+        rank = math.ceil(percentile / 100 * len(sorted_durations))
+
+        return sorted_durations[max(rank, 1) - 1]
+
+    def dump_chrome_trace(self, filename: str) -> None:
+        """Writes the spans in the Trace Event Format of Chrome.
+
+        The trace can be opened in chrome://tracing or in Perfetto.
+
+        Args:
+            filename (str): Name of the trace file
+        """
+        with self._lock:
+            spans = list(self._spans)
+
+        events = []
+        for name, start, duration, thread_id, identifier in spans:
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._start) * MICROSECONDS_IN_SECOND,
+                "dur": duration * MICROSECONDS_IN_SECOND,
+                "pid": os.getpid(),
+                "tid": thread_id,
+            }
+            if identifier is not None:
+                event["args"] = {"id": identifier}
+
+            events.append(event)
+
+        with open(filename, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events}, trace_file)
@@ -0,0 +1,249 @@
+import csv
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import typing
+
+from dataset.configuration import Configuration
+from dataset.vulnerable_executables_index import VulnerableExecutablesIndex
+
+SHARD_REGEX = r"^\s*([0-9]+)\s*/\s*([0-9]+)\s*$"
+FRAGMENT_INDEX_HEADER = ["name", "cwes", "parent_dataset", "is_built"]
+
+
+class Shard:
+    """Stable subset of the executables, built by a single node.
+
+    An executable belongs to the shard selected by the hash of its ID, so
+    all the nodes agree on the partition without communicating.
+    """
+
+    index: int
+    count: int
+
+    def __init__(self, index: int, count: int) -> None:
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(
+                f"The shard {index}/{count} is not between 1 and {count}."
+            )
+
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def from_string(cls, text: str) -> "Shard":
+        """Parses a shard in the format "i/N", with i starting from 1.
+
+        Args:
+            text (str): Shard in the format "i/N"
+
+        Raises:
+            ValueError: The text is not a valid shard
+
+        Returns:
+            Shard: Parsed shard
+        """
+        if not (groups := re.match(SHARD_REGEX, text)):
+            raise ValueError(f'The shard "{text}" is not in the format i/N.')
+
+        return cls(int(groups.group(1)), int(groups.group(2)))
+
+    @property
+    def name(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+    def contains(self, identifier: str) -> bool:
+        digest = hashlib.sha256(identifier.encode("utf-8")).digest()
+
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+
+class IndexFragment:
+    """Part of the dataset built by a shard, stored in its own folder.
+
+    The folder contains the index entries of the shard, in CSV format, and
+    their executables, so it can be copied as it is from a build node to the
+    node merging all the fragments.
+    """
+
+    folder: str
+    index_filename: str
+    executables_folder: str
+
+    def __init__(self, folder: str) -> None:
+        self.folder = folder
+        self.index_filename = os.path.join(
+            folder, Configuration.DatasetCreation.DATASET_NAME
+        )
+        self.executables_folder = os.path.join(
+            folder, Configuration.Assets.MAIN_DATASET_EXECUTABLES
+        )
+
+    @classmethod
+    def get_default_folder(cls, shard: Shard) -> str:
+        return os.path.join(
+            Configuration.Sharding.FRAGMENTS_FOLDER, shard.name
+        )
+
+    def export(
+        self,
+        shard: Shard,
+        datasets: typing.List[str],
+        index: VulnerableExecutablesIndex,
+    ) -> int:
+        """Exports the entries of a shard from an index into the fragment.
+
+        Args:
+            shard (Shard): Shard whose entries are exported
+            datasets (typing.List[str]): Names of the exported datasets
+            index (VulnerableExecutablesIndex): Index containing the entries
+
+        Returns:
+            int: Number of exported executables
+        """
+        os.makedirs(self.executables_folder, exist_ok=True)
+
+        # The index is written into a temporary file of this process, which
+        # is moved in place once complete.
+        file_descriptor, temporary_filename = tempfile.mkstemp(dir=self.folder)
+        try:
+            with os.fdopen(
+                file_descriptor, "w", encoding="utf-8", newline=""
+            ) as fragment_index:
+                executables_count = self.__write_entries(
+                    fragment_index, shard, datasets, index
+                )
+            os.replace(temporary_filename, self.index_filename)
+        except BaseException:
+            os.remove(temporary_filename)
+
+            raise
+
+        return executables_count
+
+    def __write_entries(
+        self,
+        fragment_index: typing.TextIO,
+        shard: Shard,
+        datasets: typing.List[str],
+        index: VulnerableExecutablesIndex,
+    ) -> int:
+        writer = csv.writer(fragment_index)
+        writer.writerow(FRAGMENT_INDEX_HEADER)
+
+        executables_count = 0
+        for dataset in datasets:
+            for name, cwes, parent_dataset, is_built in index.get_entries(
+                dataset
+            ):
+                if not shard.contains(name):
+                    continue
+
+                if is_built:
+                    is_built = self.__transfer(
+                        self.__get_main_executable_path(name),
+                        self.__get_executable_path(name),
+                    )
+                    executables_count += is_built
+
+                writer.writerow(
+                    [
+                        name,
+                        self.__stringifies_cwes(cwes),
+                        parent_dataset,
+                        is_built,
+                    ]
+                )
+
+        return executables_count
+
+    def merge_into(self, index: VulnerableExecutablesIndex) -> int:
+        """Adds the entries and the executables of the fragment to an index.
+
+        Args:
+            index (VulnerableExecutablesIndex): Index in which the fragment is
+                merged
+
+        Returns:
+            int: Number of merged executables
+        """
+        os.makedirs(
+            Configuration.Assets.MAIN_DATASET_EXECUTABLES, exist_ok=True
+        )
+
+        fragment_index = VulnerableExecutablesIndex(
+            self.index_filename, read_only=True
+        )
+        known_names = set(index.get_entries_ids())
+
+        executables_count = 0
+        for (
+            name,
+            cwes,
+            parent_dataset,
+            is_built,
+        ) in fragment_index.get_entries():
+            if name not in known_names:
+                index.add_new_source(name, cwes, parent_dataset)
+                known_names.add(name)
+
+            if is_built and self.__transfer(
+                self.__get_executable_path(name),
+                self.__get_main_executable_path(name),
+            ):
+                index.mark_source_as_built(name)
+                executables_count += 1
+
+        index.dump_to_file()
+
+        return executables_count
+
+    def __get_executable_path(self, name: str) -> str:
+        return os.path.join(
+            self.executables_folder, name + Configuration.Assets.ELF_EXTENSION
+        )
+
+    def __get_main_executable_path(self, name: str) -> str:
+        return os.path.join(
+            Configuration.Assets.MAIN_DATASET_EXECUTABLES,
+            name + Configuration.Assets.ELF_EXTENSION,
+        )
+
+    def __stringifies_cwes(self, cwes: typing.List[int]) -> str:
+        return Configuration.DatasetCreation.CWES_SEPARATOR.join(
+            str(cwe) for cwe in cwes
+        )
+
+    def __transfer(self, source: str, destination: str) -> bool:
+        if not os.path.isfile(source):
+            return False
+
+        if os.path.isfile(destination) and os.path.samefile(
+            source, destination
+        ):
+            return True
+
+        # The executables are hard linked when the folders are on the same
+        # file system, and copied otherwise. The new file gets a unique name,
+        # reserved by an empty placeholder, so concurrent transfers into the
+        # same folder never clash, and is then moved in place atomically.
+        file_descriptor, temporary_destination = tempfile.mkstemp(
+            dir=os.path.dirname(destination)
+        )
+        os.close(file_descriptor)
+        try:
+            try:
+                os.remove(temporary_destination)
+                os.link(source, temporary_destination)
+            except OSError:
+                shutil.copy2(source, temporary_destination)
+            os.replace(temporary_destination, destination)
+        finally:
+            # The renaming does nothing if a concurrent transfer already moved
+            # a link to the same file in place.
+            if os.path.lexists(temporary_destination):
+                os.remove(temporary_destination)
+
+        return True
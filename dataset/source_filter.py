@@ -0,0 +1,51 @@
+import typing
+
+from dataset.sharding import Shard
+
+
+class SourceFilter:
+    """Filter of the testcases, applied while the sources are discovered.
+
+    The testcases not matching it are never preprocessed nor added to the
+    index. A testcase matches if it has at least one of the wanted CWEs, if
+    its full ID is one of the wanted ones and if it belongs to the wanted
+    shard, each criterion being ignored when it is not set.
+    """
+
+    cwes: typing.Optional[typing.Set[int]]
+    identifiers: typing.Optional[typing.Set[str]]
+    shard: typing.Optional[Shard]
+
+    def __init__(
+        self,
+        cwes: typing.List[int] = None,
+        identifiers: typing.List[str] = None,
+        shard: Shard = None,
+    ) -> None:
+        self.cwes = set(cwes) if cwes else None
+        self.identifiers = set(identifiers) if identifiers else None
+        self.shard = shard
+
+    def matches_identifier(self, full_identifier: str) -> bool:
+        """Checks if a testcase has a wanted ID, before its CWEs are known.
+
+        Args:
+            full_identifier (str): Full ID of the testcase, as stored in the
+                index
+
+        Returns:
+            bool: Boolean indicating if the testcase may match
+        """
+        if self.identifiers is not None:
+            if full_identifier not in self.identifiers:
+                return False
+
+        return self.shard is None or self.shard.contains(full_identifier)
+
+    def matches_cwes(self, cwes: typing.List[int]) -> bool:
+        return self.cwes is None or not self.cwes.isdisjoint(cwes)
+
+    def matches(self, full_identifier: str, cwes: typing.List[int]) -> bool:
+        return self.matches_identifier(full_identifier) and self.matches_cwes(
+            cwes
+        )
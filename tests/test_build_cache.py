@@ -0,0 +1,84 @@
+import hashlib
+import os
+
+import pytest
+
+from dataset.build_cache import BuildCache
+
+IMAGE_DIGEST = "sha256:" + "0" * 64
+COMMAND = "gcc -O0 source.i -o executable.elf"
+ENTRY_SIZE = 100
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "source.i").write_text("int main() { return 0; }\n")
+
+    return BuildCache(str(tmp_path / "cache"), max_size=3 * ENTRY_SIZE)
+
+
+def get_key(name):
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()
+
+
+def store_executable(cache, tmp_path, name):
+    executable = tmp_path / f"{name}.elf"
+    executable.write_text(name[0] * ENTRY_SIZE)
+    cache.store(get_key(name), str(executable))
+
+
+def test_key_depends_on_the_image_the_command_and_the_inputs(cache, tmp_path):
+    key = cache.compute_key(COMMAND, IMAGE_DIGEST)
+
+    assert cache.compute_key(COMMAND, IMAGE_DIGEST) == key
+    assert cache.compute_key(COMMAND, "sha256:" + "1" * 64) != key
+    assert cache.compute_key(COMMAND.replace("-O0", "-O2"), IMAGE_DIGEST) != (
+        key
+    )
+
+    # The output isn't an input of the command.
+    (tmp_path / "executable.elf").write_text("previous build")
+    assert cache.compute_key(COMMAND, IMAGE_DIGEST) == key
+
+    (tmp_path / "source.i").write_text("int main() { return 1; }\n")
+    assert cache.compute_key(COMMAND, IMAGE_DIGEST) != key
+
+
+def test_stored_executables_are_restored(cache, tmp_path):
+    destination = str(tmp_path / "restored.elf")
+    assert not cache.restore(get_key("a"), destination)
+
+    store_executable(cache, tmp_path, "a")
+    assert cache.restore(get_key("a"), destination)
+
+    with open(destination, "r", encoding="utf-8") as executable:
+        assert executable.read() == "a" * ENTRY_SIZE
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_missing_executables_are_not_stored(cache, tmp_path):
+    cache.store(get_key("a"), str(tmp_path / "missing.elf"))
+
+    assert not cache.restore(get_key("a"), str(tmp_path / "restored.elf"))
+
+
+def test_least_recently_used_entries_are_evicted(cache, tmp_path):
+    for index, name in enumerate(["a", "b", "c"]):
+        store_executable(cache, tmp_path, name)
+        entry = os.path.join(
+            tmp_path, "cache", get_key(name)[:2], get_key(name) + ".elf"
+        )
+        os.utime(entry, (index, index))
+    assert cache.restore(get_key("a"), str(tmp_path / "restored.elf"))
+
+    # The cap is exceeded, so the cache shrinks below it by evicting the
+    # least recently used entries, b and c.
+    store_executable(cache, tmp_path, "d")
+
+    restored = [
+        name
+        for name in ["a", "b", "c", "d"]
+        if cache.restore(get_key(name), str(tmp_path / "restored.elf"))
+    ]
+    assert restored == ["a", "d"]
@@ -0,0 +1,65 @@
+import os
+import shlex
+import threading
+import typing
+
+import pytest
+
+from dataset.compilers import BaseCompiler, CommandResult
+from dataset.configuration import Configuration
+from dataset.parsers.toy_test_suite import DATASET_FOLDER, ToyTestSuiteParser
+
+TESTCASES_COUNT = 32
+
+
+class FailingBuildCompiler(BaseCompiler):
+    """Compiler preprocessing the sources, but failing to compile them."""
+
+    image_digest = "sha256:" + "0" * 64
+
+    def run_compiler_command(self, command: str) -> CommandResult:
+        raise RuntimeError("The compiler stopped.")
+
+    def exec_compiler_commands(
+        self, commands: typing.List[str], capture_output: bool = False
+    ) -> typing.List[CommandResult]:
+        for command in commands:
+            tokens = shlex.split(command)
+            with open(tokens[tokens.index("-o") + 1], "w", encoding="utf-8"):
+                pass
+
+        return [CommandResult(command, 0, "", 0, 0) for command in commands]
+
+
+@pytest.fixture
+def toy_suite(tmp_path, monkeypatch):
+    for index in range(TESTCASES_COUNT):
+        folder = tmp_path / DATASET_FOLDER / f"case_{index}"
+        os.makedirs(folder)
+        (folder / "source.c").write_text("int main() { return 0; }\n")
+        (folder / "cwe.txt").write_text("121\n")
+
+    for folder in ["sources", "executables", "cache"]:
+        os.makedirs(tmp_path / folder)
+    (tmp_path / "vulnerables.csv").write_text(
+        "name,cwes,parent_dataset,is_built\n"
+    )
+
+    monkeypatch.chdir(tmp_path)
+    # The stages fill the queues before the first testcase is compiled.
+    monkeypatch.setattr(Configuration.BuildPipeline, "QUEUE_SIZE", 1)
+    monkeypatch.setattr(
+        Configuration.BuildPipeline, "PREPROCESSING_BATCH_SIZE", 1
+    )
+
+
+@pytest.mark.parametrize("single_pass", [False, True])
+def test_stages_are_stopped_when_the_compilation_fails(toy_suite, single_pass):
+    parser = ToyTestSuiteParser(1)
+    parser.compiler = FailingBuildCompiler()
+    initial_threads = set(threading.enumerate())
+
+    with pytest.raises(RuntimeError):
+        parser.preprocess_and_build(single_pass=single_pass)
+
+    assert set(threading.enumerate()) <= initial_threads
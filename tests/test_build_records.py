@@ -0,0 +1,57 @@
+import sqlite3
+
+from dataset.build_records import BuildRecordsStore
+from dataset.configuration import Configuration
+
+LEGACY_SCHEMA = """
+CREATE TABLE build_records (
+    name TEXT PRIMARY KEY,
+    parent_dataset TEXT NOT NULL,
+    exit_code INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    command_hash TEXT NOT NULL,
+    stderr TEXT NOT NULL,
+    built_at REAL NOT NULL
+);
+INSERT INTO build_records VALUES ('a', 'suite', 1, 0.5, 'hash', 'error', 0);
+"""
+
+
+def add_record(store, name, exit_code=0, output=""):
+    store.add_record(name, "suite", "gcc " + name, exit_code, 0.1, output)
+
+
+def test_records_are_written_when_the_buffer_is_full(tmp_path):
+    filename = str(tmp_path / "build_records.db")
+    store = BuildRecordsStore(filename)
+
+    for index in range(Configuration.BuildRecords.MAX_PENDING_RECORDS):
+        add_record(store, f"executable_{index}")
+
+    # The records are read by another store, as after an interrupted build.
+    records = BuildRecordsStore(filename).get_records()
+    assert len(records) == Configuration.BuildRecords.MAX_PENDING_RECORDS
+
+
+def test_output_is_truncated(tmp_path):
+    store = BuildRecordsStore(str(tmp_path / "build_records.db"))
+    add_record(
+        store, "a", 1, "x" * 2 * Configuration.BuildRecords.MAX_OUTPUT_SIZE
+    )
+
+    (record,) = store.get_records(failed_only=True)
+    assert len(record.output) == Configuration.BuildRecords.MAX_OUTPUT_SIZE
+
+
+def test_legacy_stores_are_migrated(tmp_path):
+    filename = str(tmp_path / "build_records.db")
+    connection = sqlite3.connect(filename)
+    connection.executescript(LEGACY_SCHEMA)
+    connection.close()
+
+    store = BuildRecordsStore(filename)
+    add_record(store, "b", 0, "warning")
+
+    records = {record.name: record for record in store.get_records()}
+    assert records["a"].output == "error"
+    assert records["b"].output == "warning"
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from dataset.build_variant import BuildVariant
+from dataset.configuration import Configuration
+
+
+def test_variant_is_parsed_with_its_flags():
+    variant = BuildVariant.from_string("pie=-fPIE  -pie")
+
+    assert variant.name == "pie"
+    assert variant.compile_flags == ["-fPIE", "-pie"]
+    assert variant.executables_folder == os.path.join(
+        Configuration.Assets.MAIN_DATASET_EXECUTABLES, "pie"
+    )
+
+
+def test_variant_may_have_no_flags():
+    variant = BuildVariant.from_string("O0=")
+
+    assert variant.name == "O0"
+    assert variant.compile_flags == []
+
+
+def test_variant_flags_are_added_to_the_compile_ones():
+    variant = BuildVariant("O2", ["-O2"])
+
+    assert variant.extend_compile_flags(["-g"]) == ["-g", "-O2"]
+    assert variant.extend_compile_flags(None) == ["-O2"]
+
+
+@pytest.mark.parametrize(
+    "text", [".=-O2", "..=-O2", "...=-O2", ".hidden=-O2", "-O2=-O2"]
+)
+def test_variant_names_are_not_relative_paths(text):
+    with pytest.raises(ValueError):
+        BuildVariant.from_string(text)
+
+
+@pytest.mark.parametrize("text", ["-O2", "=-O2", "a b=-O2", "a/b=-O2"])
+def test_malformed_variants_are_rejected(text):
+    with pytest.raises(ValueError):
+        BuildVariant.from_string(text)
@@ -0,0 +1,158 @@
+import contextlib
+import os
+import stat
+import subprocess
+import types
+
+import pytest
+from docker.utils import split_command
+
+from dataset.compilers.containerized_compiler import ContainerizedCompiler
+from dataset.container_pool import ContainerPool
+from dataset.parsers.toy_test_suite import DATASET_FOLDER, ToyTestSuiteParser
+
+TESTCASES_COUNT = 3
+COMMAND_NOT_FOUND_EXIT_CODE = 127
+# The fake gcc writes the temporary files kept by -save-temps=cwd and the
+# executable.
+FAKE_GCC = """#!/bin/sh
+previous=""
+for argument in "$@"; do
+    case "$argument" in
+        *.c)
+            stem=$(basename "$argument" .c)
+            echo "preprocessed $argument" > "$stem.i"
+            touch "$stem.s" "$stem.o";;
+    esac
+    if [ "$previous" = "-o" ]; then
+        output="$argument"
+    fi
+    previous="$argument"
+done
+echo "ELF" > "$output"
+"""
+
+
+class FakeApi:
+    """Docker API running the commands on the host, as the Docker daemon.
+
+    As in docker-py, the commands given as strings are split into arguments
+    and run without a shell.
+    """
+
+    _commands: dict
+    _exit_codes: dict
+
+    def __init__(self) -> None:
+        self._commands = {}
+        self._exit_codes = {}
+
+    def exec_create(self, container_id, command, workdir=None):
+        if isinstance(command, str):
+            command = split_command(command)
+
+        exec_id = str(len(self._commands))
+        self._commands[exec_id] = command
+
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream=False):
+        try:
+            process = subprocess.run(
+                self._commands[exec_id],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                check=False,
+            )
+        except OSError as error:
+            self._exit_codes[exec_id] = COMMAND_NOT_FOUND_EXIT_CODE
+
+            yield str(error).encode("utf-8")
+        else:
+            self._exit_codes[exec_id] = process.returncode
+
+            yield process.stdout
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": self._exit_codes[exec_id]}
+
+
+class FakePool:
+    image_id = "sha256:" + "0" * 64
+
+    def __init__(self) -> None:
+        self._container = types.SimpleNamespace(
+            id="container", client=types.SimpleNamespace(api=FakeApi())
+        )
+
+    @contextlib.contextmanager
+    def container(self):
+        yield self._container
+
+    def replace(self, container) -> None:
+        pass
+
+
+@pytest.fixture
+def compiler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ContainerPool, "get_shared", lambda jobs: FakePool())
+
+    return ContainerizedCompiler(1)
+
+
+@pytest.fixture
+def toy_suite(tmp_path, monkeypatch):
+    for index in range(TESTCASES_COUNT):
+        folder = tmp_path / DATASET_FOLDER / f"case_{index}"
+        os.makedirs(folder)
+        (folder / "source.c").write_text("int main() { return 0; }\n")
+        (folder / "cwe.txt").write_text("121\n")
+
+    for folder in ["sources", "executables", "cache", "bin"]:
+        os.makedirs(tmp_path / folder)
+    (tmp_path / "vulnerables.csv").write_text(
+        "name,cwes,parent_dataset,is_built\n"
+    )
+
+    fake_gcc = tmp_path / "bin" / "gcc"
+    fake_gcc.write_text(FAKE_GCC)
+    fake_gcc.chmod(fake_gcc.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv(
+        "PATH", str(tmp_path / "bin") + os.pathsep + os.environ["PATH"]
+    )
+
+
+def test_compound_commands_are_run_by_a_shell(compiler, tmp_path):
+    os.makedirs(tmp_path / "folder")
+
+    result = compiler.run_compiler_command(
+        "(cd folder && echo built > output) && cat folder/output"
+    )
+
+    assert (result.exit_code, result.output) == (0, "built\n")
+
+
+def test_batched_commands_are_run_by_a_shell(compiler, tmp_path):
+    results = compiler.exec_compiler_commands(
+        ["echo first | cat", "false || echo second"], capture_output=True
+    )
+
+    assert [(result.exit_code, result.output) for result in results] == [
+        (0, "first"),
+        (0, "second"),
+    ]
+
+
+def test_single_pass_builds_run_in_the_container(compiler, toy_suite):
+    parser = ToyTestSuiteParser(1)
+    parser.compiler = compiler
+
+    assert parser.preprocess_and_build(single_pass=True) == TESTCASES_COUNT
+
+    for index in range(TESTCASES_COUNT):
+        identifier = f"toy_test_suite_{index}"
+        assert sorted(os.listdir(os.path.join("sources", identifier))) == [
+            "source.c"
+        ]
+        assert os.path.isfile(os.path.join("executables", identifier + ".elf"))
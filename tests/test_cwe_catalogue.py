@@ -0,0 +1,81 @@
+import sys
+import types
+
+import pytest
+
+from dataset import cli
+from dataset.configuration import Configuration
+from dataset.cwe_catalogue import CweCatalogue
+
+# Parent of each CWE in the hierarchy view, with a cycle between 10 and 11
+HIERARCHY = {1: [], 2: [1], 3: [2], 4: [1], 10: [11], 11: [10]}
+OTHER_VIEW_PARENTS = {4: [3]}
+RELATED_WEAKNESS = "::NATURE:ChildOf:CWE ID:{cwe}:VIEW ID:{view}:ORDINAL:1"
+
+
+class FakeWeakness:
+    cwe_id: str
+    name: str
+    related_weaknesses: str
+
+    def __init__(self, cwe: int) -> None:
+        self.cwe_id = str(cwe)
+        self.name = f"Weakness {cwe}"
+        self.related_weaknesses = "".join(
+            RELATED_WEAKNESS.format(cwe=parent, view=view)
+            for view, parents in [
+                (Configuration.CweCatalogue.HIERARCHY_VIEW, HIERARCHY),
+                (699, OTHER_VIEW_PARENTS),
+            ]
+            for parent in parents.get(cwe, [])
+        )
+
+
+class FakeDatabase:
+    def get_all(self):
+        return [FakeWeakness(cwe) for cwe in HIERARCHY]
+
+
+@pytest.fixture
+def catalogue(tmp_path, monkeypatch):
+    monkeypatch.setitem(
+        sys.modules, "cwe", types.SimpleNamespace(Database=FakeDatabase)
+    )
+
+    return CweCatalogue(str(tmp_path / "cache" / "cwe_catalogue.json"))
+
+
+def test_descendants_are_transitive(catalogue):
+    assert catalogue.expand([1]) == [1, 2, 3, 4]
+    assert catalogue.expand([2, 4]) == [2, 3, 4]
+    assert catalogue.get_ancestors(3) == [1, 2, 3]
+    assert catalogue.get_name(3) == "Weakness 3"
+
+
+def test_cycles_end_the_closures(catalogue):
+    assert catalogue.expand([10]) == [10, 11]
+    assert catalogue.get_ancestors(11) == [10, 11]
+
+
+def test_unknown_cwes_are_kept(catalogue):
+    assert catalogue.expand([999, 3]) == [3, 999]
+    assert catalogue.get_ancestors(999) == [999]
+    assert catalogue.get_name(999) is None
+
+
+def test_catalogue_is_loaded_from_its_file(catalogue, tmp_path, monkeypatch):
+    # The CWE database can't be imported anymore.
+    monkeypatch.setitem(sys.modules, "cwe", None)
+    loaded_catalogue = CweCatalogue(
+        str(tmp_path / "cache" / "cwe_catalogue.json")
+    )
+
+    assert loaded_catalogue.expand([1, 10]) == [1, 2, 3, 4, 10, 11]
+
+
+def test_exact_cwes_are_not_expanded(catalogue, monkeypatch):
+    monkeypatch.setattr(CweCatalogue, "_shared_catalogue", catalogue)
+
+    assert cli.expand_cwes([2], False) == [2, 3]
+    assert cli.expand_cwes([2], True) == [2]
+    assert cli.expand_cwes([], False) == []
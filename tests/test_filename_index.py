@@ -0,0 +1,50 @@
+import os
+import shutil
+
+import pytest
+
+from dataset.filename_index import FilenameIndex
+
+
+@pytest.fixture
+def sources_folder(tmp_path):
+    folder = tmp_path / "testcases"
+    for path in ["CWE121/s01/a.c", "CWE121/s02/a.c", "CWE122/b.c"]:
+        os.makedirs(os.path.dirname(folder / path), exist_ok=True)
+        (folder / path).write_text(path)
+
+    return folder
+
+
+@pytest.fixture
+def cache_filename(tmp_path):
+    return str(tmp_path / "cache" / "sources.json")
+
+
+def test_files_are_found_by_their_basenames(sources_folder, cache_filename):
+    index = FilenameIndex(str(sources_folder), cache_filename)
+
+    assert index.resolve("b.c") == str(sources_folder / "CWE122" / "b.c")
+    assert index.resolve("missing.c") is None
+
+
+def test_duplicate_basenames_are_told_apart_by_their_folders(
+    sources_folder, cache_filename
+):
+    index = FilenameIndex(str(sources_folder), cache_filename)
+
+    assert index.resolve("s02/a.c") == str(sources_folder / "CWE121/s02/a.c")
+    # Without folders, the first path in the sorted walk is used.
+    assert index.resolve("a.c") == str(sources_folder / "CWE121/s01/a.c")
+
+
+def test_persisted_index_is_rebuilt_when_stale(sources_folder, cache_filename):
+    FilenameIndex(str(sources_folder), cache_filename)
+    assert os.path.isfile(cache_filename)
+
+    shutil.move(sources_folder / "CWE122", sources_folder / "CWE123")
+    (sources_folder / "CWE123" / "c.c").write_text("c.c")
+    index = FilenameIndex(str(sources_folder), cache_filename)
+
+    assert index.resolve("b.c") == str(sources_folder / "CWE123" / "b.c")
+    assert index.resolve("c.c") == str(sources_folder / "CWE123" / "c.c")
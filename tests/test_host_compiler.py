@@ -0,0 +1,102 @@
+import os
+import stat
+import threading
+
+import pytest
+
+from dataset.compilation_scheduler import CompilationScheduler
+from dataset.compilers.host_compiler import HostCompiler
+from dataset.configuration import Configuration
+
+JOBS = 2
+COMMANDS_COUNT = 6
+# The fake compiler prints its name and arguments. It also logs how many
+# instances are running, each one holding a file while it runs.
+FAKE_COMPILER = """#!/bin/sh
+touch "{running_folder}/$$"
+ls "{running_folder}" | wc -l >> "{log_filename}"
+sleep {duration}
+rm "{running_folder}/$$"
+echo "$(basename "$0") $*"
+"""
+
+
+@pytest.fixture
+def compiler(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "running")
+    for name in ["fake-gcc", "fake-g++"]:
+        executable = tmp_path / name
+        executable.write_text(
+            FAKE_COMPILER.format(
+                running_folder=tmp_path / "running",
+                log_filename=tmp_path / "running.log",
+                duration=0.2,
+            )
+        )
+        executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+
+    monkeypatch.setattr(
+        Configuration.HostCompiler, "GCC", str(tmp_path / "fake-gcc")
+    )
+    monkeypatch.setattr(
+        Configuration.HostCompiler, "GPP", str(tmp_path / "fake-g++")
+    )
+    # The fake toolchain can't build executables, so it isn't checked.
+    monkeypatch.setattr(
+        HostCompiler,
+        "_HostCompiler__check_toolchain",
+        lambda _: "sha256:" + "0" * 64,
+    )
+
+    return HostCompiler(JOBS)
+
+
+def get_output_lines(compiler, command):
+    result = compiler.run_compiler_command(command)
+    assert result.exit_code == 0
+
+    return result.output.splitlines()
+
+
+@pytest.mark.parametrize(
+    "command, output",
+    [
+        ("gcc -O0 a.c -o a.elf", "fake-gcc -m32 -O0 a.c -o a.elf"),
+        ("g++ -O0 a.cpp -o a.elf", "fake-g++ -m32 -O0 a.cpp -o a.elf"),
+        # The flags of the command come last, so they take precedence.
+        ("gcc -m32 a.c -o a.elf", "fake-gcc -m32 -m32 a.c -o a.elf"),
+        ("gcc -m64 a.c -o a.elf", "fake-gcc -m32 -m64 a.c -o a.elf"),
+    ],
+)
+def test_architecture_flags_are_added(compiler, command, output):
+    assert get_output_lines(compiler, command) == [output]
+
+
+def test_each_invocation_of_compound_commands_is_adapted(compiler, tmp_path):
+    command = (
+        f"(cd {tmp_path} && gcc -c a.c -o a.o) && g++ a.o -o a.elf"
+        "; echo gcc-ar gcc"
+    )
+
+    assert get_output_lines(compiler, command) == [
+        "fake-gcc -m32 -c a.c -o a.o",
+        "fake-g++ -m32 a.o -o a.elf",
+        "gcc-ar gcc",
+    ]
+
+
+def test_single_commands_and_batches_share_the_jobs(compiler, tmp_path):
+    commands = [f"gcc -c {index}.c" for index in range(COMMANDS_COUNT)]
+    batch = threading.Thread(
+        target=compiler.exec_compiler_commands, args=(commands,)
+    )
+    batch.start()
+    scheduler = CompilationScheduler(compiler.run_compiler_command, JOBS)
+    results = [result for _, result in scheduler.run(enumerate(commands))]
+    batch.join()
+
+    assert all(result.exit_code == 0 for result in results)
+    with open(tmp_path / "running.log", "r", encoding="utf-8") as log:
+        running_counts = [int(line) for line in log]
+    assert len(running_counts) == 2 * COMMANDS_COUNT
+    assert max(running_counts) <= JOBS
@@ -0,0 +1,123 @@
+import multiprocessing
+
+import pytest
+
+from dataset.index_storages import create_storage
+
+INDEX_HEADER = "name,cwes,parent_dataset,is_built\n"
+WRITERS_COUNT = 2
+ROUNDS_COUNT = 5
+ENTRIES_PER_ROUND = 50
+
+
+@pytest.fixture(params=["vulnerables.csv", "vulnerables.db"])
+def index_filename(request, tmp_path):
+    filename = str(tmp_path / request.param)
+    if filename.endswith(".csv"):
+        with open(filename, "w", encoding="utf-8") as index:
+            index.write(INDEX_HEADER)
+
+    return filename
+
+
+def get_names(storage, **filters):
+    return [name for name, _, _, _ in storage.query(**filters)]
+
+
+def write_entries(index_filename, writer):
+    storage = create_storage(index_filename)
+    storage.mark_as_built("shared", f"writer_{writer}")
+
+    for round_index in range(ROUNDS_COUNT):
+        for index in range(ENTRIES_PER_ROUND):
+            name = f"writer_{writer}_{round_index}_{index}"
+            storage.add_entry(name, [121 + writer], "suite")
+            if index % 2 == 0:
+                storage.mark_as_built(name)
+
+        storage.flush()
+
+
+def test_variants_have_their_own_build_status(index_filename):
+    storage = create_storage(index_filename)
+    storage.add_entry("a", [121], "suite")
+    storage.add_entry("b", [122], "suite")
+    storage.mark_as_built("a")
+    storage.mark_as_built("b", "O2")
+
+    assert get_names(storage, is_built=True) == ["a"]
+    assert get_names(storage, is_built=True, variant="O2") == ["b"]
+    assert get_names(storage, is_built=False, variant="O2") == ["a"]
+    assert get_names(storage, is_built=True, variant="pie") == []
+
+
+def test_variants_built_after_a_query_are_found(index_filename):
+    storage = create_storage(index_filename)
+    storage.add_entry("a", [121], "suite")
+    storage.add_entry("b", [122], "suite")
+    assert get_names(storage, is_built=True, variant="O2") == []
+
+    storage.mark_as_built("a", "O2")
+    storage.mark_as_built("a", "O2")
+    storage.add_entry("c", [121], "suite")
+    storage.mark_as_built("c", "O2")
+
+    assert get_names(storage, is_built=True, variant="O2") == ["a", "c"]
+    assert get_names(
+        storage, cwes=[121], is_built=True, variant="O2", offset=1
+    ) == ["c"]
+
+
+def test_variants_are_persisted(index_filename):
+    storage = create_storage(index_filename)
+    storage.add_entry("a", [121], "suite")
+    storage.mark_as_built("a", "O2")
+    storage.mark_as_built("a", "pie")
+    storage.flush()
+
+    for read_only in [False, True]:
+        storage = create_storage(index_filename, read_only)
+
+        assert get_names(storage, is_built=True, variant="O2") == ["a"]
+        assert get_names(storage, is_built=True, variant="pie") == ["a"]
+        assert get_names(storage, is_built=True) == []
+
+
+def test_indexes_without_variants_are_read(tmp_path):
+    filename = str(tmp_path / "vulnerables.csv")
+    with open(filename, "w", encoding="utf-8") as index:
+        index.write(INDEX_HEADER + "a,121,suite,True\n")
+
+    for read_only in [False, True]:
+        storage = create_storage(filename, read_only)
+
+        assert get_names(storage, is_built=True) == ["a"]
+        assert get_names(storage, is_built=False, variant="O2") == ["a"]
+
+
+def test_concurrent_writes_are_merged(index_filename):
+    storage = create_storage(index_filename)
+    storage.add_entry("shared", [121], "suite")
+    storage.flush()
+
+    writers = [
+        multiprocessing.Process(
+            target=write_entries, args=(index_filename, writer)
+        )
+        for writer in range(WRITERS_COUNT)
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    storage = create_storage(index_filename, True)
+    names = get_names(storage)
+    entries_count = WRITERS_COUNT * ROUNDS_COUNT * ENTRIES_PER_ROUND
+    assert len(names) == len(set(names)) == entries_count + 1
+    assert len(get_names(storage, is_built=True)) == entries_count // 2
+    for writer in range(WRITERS_COUNT):
+        assert get_names(
+            storage, is_built=True, variant=f"writer_{writer}"
+        ) == ["shared"]
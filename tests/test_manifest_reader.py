@@ -0,0 +1,103 @@
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from dataset.manifest_reader import ManifestReader
+
+CWE_REGEX = r"CWE-([0-9]+)"
+MANIFEST = """<?xml version="1.0" encoding="utf-8"?>
+<container>
+  <testcase id="1">
+    <file path="CWE121_a.c" language="C">
+      <flaw line="10" name="CWE-121: Stack-based Buffer Overflow"/>
+    </file>
+    <file path="CWE121_a.h"/>
+  </testcase>
+  <testcase id="2">
+    <file path="CWE122_b.cpp" language="C++">
+      <flaw line="12" name="CWE-122: Heap-based Buffer Overflow"/>
+      <mixed line="14" name="CWE-{second_cwe}: Integer Overflow"/>
+    </file>
+  </testcase>
+  <testcase id="3">
+    <file path="CWE476_c.c" language="C">
+      <fix line="3" name="CWE-476: NULL Pointer Dereference"/>
+    </file>
+  </testcase>
+</container>
+"""
+
+
+def parse_manifest_tree(manifest_filename):
+    """Parses the manifest as the parsers did before the streaming reader."""
+    testcases = []
+    for testcase in (
+        ET.parse(manifest_filename).getroot().findall("./testcase")
+    ):
+        files = []
+        for file in testcase.findall("./file"):
+            cwes = [
+                int(re.search(CWE_REGEX, child.attrib["name"]).group(1))
+                for child in file
+            ]
+            files.append(
+                (file.attrib["path"], file.attrib.get("language"), cwes)
+            )
+        testcases.append(files)
+
+    return testcases
+
+
+def read_testcases(reader):
+    return [
+        [(file.path, file.language, file.cwes) for file in testcase]
+        for testcase in reader.get_testcases()
+    ]
+
+
+@pytest.fixture
+def manifest_filename(tmp_path):
+    filename = tmp_path / "manifest.xml"
+    filename.write_text(MANIFEST.format(second_cwe=190))
+
+    return str(filename)
+
+
+@pytest.fixture
+def cache_filename(tmp_path):
+    return str(tmp_path / "cache" / "manifest.jsonl")
+
+
+def test_testcases_match_the_parsed_tree(manifest_filename, cache_filename):
+    reader = ManifestReader(manifest_filename, cache_filename)
+    expected_testcases = parse_manifest_tree(manifest_filename)
+
+    # The first read parses the manifest and the second one uses the cache.
+    assert read_testcases(reader) == expected_testcases
+    assert read_testcases(reader) == expected_testcases
+
+
+def test_cache_is_invalidated_when_the_manifest_changes(
+    manifest_filename, cache_filename
+):
+    reader = ManifestReader(manifest_filename, cache_filename)
+    read_testcases(reader)
+
+    # Both the same size and a different one are detected.
+    for second_cwe in [191, 1335]:
+        with open(manifest_filename, "w", encoding="utf-8") as manifest:
+            manifest.write(MANIFEST.format(second_cwe=second_cwe))
+
+        assert read_testcases(reader)[1][0][2] == [122, second_cwe]
+
+
+def test_cache_is_not_kept_when_the_reading_stops_early(
+    manifest_filename, cache_filename
+):
+    reader = ManifestReader(manifest_filename, cache_filename)
+    testcases = reader.get_testcases()
+    next(testcases)
+    testcases.close()
+
+    assert read_testcases(reader) == parse_manifest_tree(manifest_filename)
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from dataset.preprocessing_manifest import PreprocessingManifest
+
+IMAGE_DIGEST = "sha256:" + "0" * 64
+COMMAND = "gcc -E {source} -I include -o {output}"
+
+
+@pytest.fixture
+def suite(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for filename in ["a.c", "b.c", "include/common.h", "include/my header.h"]:
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as source:
+            source.write(f"// {filename}\n")
+
+
+def preprocess(manifest, source, output, dependencies):
+    """Records a source as gcc -E -MD does, with a dependencies file."""
+    with open(output, "w", encoding="utf-8") as preprocessed_file:
+        preprocessed_file.write("preprocessed\n")
+
+    dependencies_filename = manifest.get_dependencies_filename(output)
+    os.makedirs(os.path.dirname(dependencies_filename), exist_ok=True)
+    with open(dependencies_filename, "w", encoding="utf-8") as rule:
+        rule.write(output + ": " + dependencies)
+
+    manifest.record(output, COMMAND.format(source=source, output=output))
+
+
+def is_up_to_date(manifest, source, output):
+    return manifest.is_up_to_date(
+        output, COMMAND.format(source=source, output=output)
+    )
+
+
+def change(filename):
+    with open(filename, "a", encoding="utf-8") as changed_file:
+        changed_file.write("// changed\n")
+
+
+def test_dependencies_are_parsed(suite):
+    manifest = PreprocessingManifest("suite", IMAGE_DIGEST)
+    preprocess(
+        manifest,
+        "a.c",
+        "a.i",
+        "a.c include/common.h \\\n include/my\\ header.h \\\n"
+        " /usr/include/stdio.h\n",
+    )
+    assert is_up_to_date(manifest, "a.c", "a.i")
+
+    # The escaped path and the ones on the continuation lines are inputs.
+    change("include/my header.h")
+    assert not is_up_to_date(manifest, "a.c", "a.i")
+
+
+def test_changed_header_invalidates_only_its_includers(suite):
+    manifest = PreprocessingManifest("suite", IMAGE_DIGEST)
+    preprocess(manifest, "a.c", "a.i", "a.c include/common.h\n")
+    preprocess(manifest, "b.c", "b.i", "b.c\n")
+
+    change("include/common.h")
+
+    assert not is_up_to_date(manifest, "a.c", "a.i")
+    assert is_up_to_date(manifest, "b.c", "b.i")
+
+
+def test_command_and_image_changes_invalidate_the_entries(suite):
+    manifest = PreprocessingManifest("suite", IMAGE_DIGEST)
+    preprocess(manifest, "a.c", "a.i", "a.c\n")
+    manifest.dump_to_file()
+
+    assert not manifest.is_up_to_date("a.i", "gcc -E a.c -o a.i")
+    assert is_up_to_date(
+        PreprocessingManifest("suite", IMAGE_DIGEST), "a.c", "a.i"
+    )
+    assert not is_up_to_date(
+        PreprocessingManifest("suite", "sha256:" + "1" * 64), "a.c", "a.i"
+    )
+
+
+def test_missing_outputs_are_not_up_to_date(suite):
+    manifest = PreprocessingManifest("suite", IMAGE_DIGEST)
+    preprocess(manifest, "a.c", "a.i", "a.c\n")
+    os.remove("a.i")
+
+    assert not is_up_to_date(manifest, "a.c", "a.i")
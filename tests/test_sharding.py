@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from dataset.sharding import IndexFragment, Shard
+from dataset.vulnerable_executables_index import VulnerableExecutablesIndex
+
+INDEX_HEADER = "name,cwes,parent_dataset,is_built\n"
+SHARDS_COUNT = 3
+ENTRIES_COUNT = 30
+
+
+def create_index(folder):
+    os.makedirs(folder / "executables")
+    (folder / "vulnerables.csv").write_text(INDEX_HEADER)
+
+    return VulnerableExecutablesIndex(str(folder / "vulnerables.csv"))
+
+
+def get_entries(index):
+    return sorted(
+        (name, tuple(cwes), parent_dataset, is_built)
+        for name, cwes, parent_dataset, is_built in index.get_entries()
+    )
+
+
+@pytest.mark.parametrize("count", [1, SHARDS_COUNT])
+def test_each_executable_belongs_to_a_single_shard(count):
+    shards = [Shard(index, count) for index in range(1, count + 1)]
+
+    for identifier in range(100):
+        name = f"suite_{identifier}"
+        assert sum(shard.contains(name) for shard in shards) == 1
+
+
+def test_shards_are_parsed():
+    shard = Shard.from_string(" 2 / 3 ")
+
+    assert (shard.index, shard.count) == (2, 3)
+    assert shard.name == "shard-2-of-3"
+
+
+@pytest.mark.parametrize("text", ["", "2", "2-3", "a/3", "0/3", "4/3", "1/0"])
+def test_invalid_shards_are_rejected(text):
+    with pytest.raises(ValueError):
+        Shard.from_string(text)
+
+
+def test_fragments_are_merged_into_the_dataset(tmp_path, monkeypatch):
+    build_folder = tmp_path / "build"
+    index = create_index(build_folder)
+    monkeypatch.chdir(build_folder)
+    for identifier in range(ENTRIES_COUNT):
+        dataset = "first" if identifier % 2 else "second"
+        name = f"{dataset}_{identifier}"
+        index.add_new_source(name, [121, 122 + identifier % 3], dataset)
+        if identifier % 3:
+            (build_folder / "executables" / f"{name}.elf").write_text(name)
+            index.mark_source_as_built(name)
+    index.dump_to_file()
+
+    fragments = []
+    exported_count = 0
+    for shard_index in range(1, SHARDS_COUNT + 1):
+        shard = Shard(shard_index, SHARDS_COUNT)
+        fragment = IndexFragment(str(tmp_path / shard.name))
+        exported_count += fragment.export(shard, ["first", "second"], index)
+        fragments.append(fragment)
+
+    merge_folder = tmp_path / "merge"
+    merged_index = create_index(merge_folder)
+    monkeypatch.chdir(merge_folder)
+    merged_count = sum(
+        fragment.merge_into(merged_index) for fragment in fragments
+    )
+
+    built_names = list(index.get_entries_ids(is_built=True))
+    assert exported_count == merged_count == len(built_names)
+    assert get_entries(merged_index) == get_entries(index)
+    for name in built_names:
+        executable = merge_folder / "executables" / f"{name}.elf"
+        assert executable.read_text() == name
+
+    # Merging a fragment again doesn't duplicate its entries.
+    fragments[0].merge_into(merged_index)
+    assert get_entries(merged_index) == get_entries(index)
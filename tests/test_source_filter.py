@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from dataset.parsers.toy_test_suite import DATASET_FOLDER, ToyTestSuiteParser
+from dataset.sharding import Shard
+from dataset.source_filter import SourceFilter
+
+TESTCASES_CWES = [121, 122, 121, 476, 122, 121]
+
+
+@pytest.fixture
+def toy_suite(tmp_path, monkeypatch):
+    for index, cwe in enumerate(TESTCASES_CWES):
+        folder = tmp_path / DATASET_FOLDER / f"case_{index}"
+        os.makedirs(folder)
+        (folder / "source.c").write_text("int main() { return 0; }\n")
+        (folder / "cwe.txt").write_text(f"{cwe}\n")
+
+    (tmp_path / "vulnerables.csv").write_text(
+        "name,cwes,parent_dataset,is_built\n"
+    )
+    monkeypatch.chdir(tmp_path)
+
+
+def discover(source_filter):
+    parser = ToyTestSuiteParser(1)
+
+    return {
+        parser._get_full_identifier(source.identifier): source.cwes
+        for source in parser._discover_sources(source_filter)
+    }
+
+
+def test_unset_criteria_match_everything():
+    assert SourceFilter().matches("suite_1", [121])
+    assert SourceFilter([], []).matches("suite_1", [])
+
+
+def test_cwes_match_if_any_is_wanted():
+    source_filter = SourceFilter(cwes=[121, 190])
+
+    assert source_filter.matches_cwes([122, 190])
+    assert not source_filter.matches_cwes([122])
+    assert not source_filter.matches_cwes([])
+
+
+def test_identifiers_and_shards_are_combined():
+    shard = Shard(1, 2)
+    identifiers = [f"suite_{index}" for index in range(20)]
+    source_filter = SourceFilter(identifiers=identifiers[:10], shard=shard)
+
+    assert [
+        identifier
+        for identifier in identifiers
+        if source_filter.matches_identifier(identifier)
+    ] == [
+        identifier
+        for identifier in identifiers[:10]
+        if shard.contains(identifier)
+    ]
+
+
+def test_testcases_are_discovered_with_their_cwes(toy_suite):
+    assert sorted(cwes for cwes in discover(None).values()) == sorted(
+        [cwe] for cwe in TESTCASES_CWES
+    )
+
+
+def test_testcases_without_wanted_cwes_are_not_discovered(toy_suite):
+    discovered_cwes = list(discover(SourceFilter(cwes=[121])).values())
+
+    assert discovered_cwes == [[121]] * TESTCASES_CWES.count(121)
+
+
+def test_testcases_without_wanted_ids_are_not_discovered(toy_suite):
+    identifiers = ["toy_test_suite_1", "toy_test_suite_4"]
+
+    assert set(discover(SourceFilter(identifiers=identifiers))) == set(
+        identifiers
+    )
+
+
+def test_each_testcase_is_discovered_by_a_single_shard(toy_suite):
+    first_shard, second_shard = [
+        set(discover(SourceFilter(shard=Shard(index, 2)))) for index in [1, 2]
+    ]
+
+    assert first_shard.isdisjoint(second_shard)
+    assert first_shard | second_shard == set(discover(None))